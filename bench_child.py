@@ -0,0 +1,116 @@
+"""
+n8n Tray - Ölçüm Alt Süreci
+Bu betik ölçüm paketinde n8n ve cloudflared yerine çalışan, ayarlanabilir hız ve boyutta log üreten alt süreçtir.
+
+Her satır gönderim zamanını (sent=) ve sıra numarasını (seq=) taşır; ölçüm
+tarafı uçtan uca gecikmeyi buradan hesaplar. Satırlar burst satırlık
+gruplar halinde, ortalama rate satır/sn olacak şekilde yazılır. Üretim
+bitince süreç kapanma sinyali gelene kadar bekler; sinyalden sonra
+stop_delay kadar "boşaltma" yapıp çıkar.
+
+Durdurma testleri için --ignore-term kapanma sinyalini yok sayar (zorla
+sonlandırma gerekir), --grandchild aynı ayarlarla bir alt süreç daha
+başlatır ve pid'ini "bench grandchild pid=N" satırıyla bildirir.
+
+    python bench_child.py --format n8n --rate 5000 --size 120 --burst 50 --duration 3
+"""
+
+import argparse
+import os
+import random
+import signal
+import string
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+FORMATS = ("n8n", "cf", "plain")
+
+stopping = False
+
+
+def on_signal(signum, frame):
+    global stopping
+    stopping = True
+
+
+def line_prefix(fmt, now):
+    stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    if fmt == "n8n":
+        return f"{stamp}.{int(now * 1000) % 1000:03d}Z | info | "
+    if fmt == "cf":
+        return f"{stamp}Z INF "
+    return ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ölçüm için log üreten alt süreç")
+    parser.add_argument("--format", choices=FORMATS, default="n8n")
+    parser.add_argument("--rate", type=float, default=1000.0, help="ortalama satır/sn")
+    parser.add_argument("--size", type=int, default=120, help="yaklaşık satır uzunluğu (bayt)")
+    parser.add_argument("--burst", type=int, default=1, help="tek seferde yazılan satır sayısı")
+    parser.add_argument("--duration", type=float, default=3.0, help="üretim süresi (sn)")
+    parser.add_argument("--startup-delay", type=float, default=0.0, help="ilk satırdan önce bekleme (sn)")
+    parser.add_argument("--stop-delay", type=float, default=0.0, help="kapanma sinyalinden sonra bekleme (sn)")
+    parser.add_argument("--ignore-term", action="store_true", help="kapanma sinyallerini yok say")
+    parser.add_argument("--grandchild", action="store_true", help="aynı ayarlarla bir alt süreç daha başlat")
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+
+    handler = signal.SIG_IGN if args.ignore_term else on_signal
+    signal.signal(signal.SIGTERM, handler)
+    signal.signal(signal.SIGINT, handler)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, handler)
+
+    out = sys.stdout.buffer
+    child = None
+    if args.grandchild:
+        child_argv = [arg for arg in argv if arg != "--grandchild"]
+        child = subprocess.Popen([sys.executable, os.path.abspath(__file__), *child_argv],
+                                 stdout=subprocess.DEVNULL)
+        out.write(f"bench grandchild pid={child.pid}\n".encode())
+        out.flush()
+    time.sleep(args.startup_delay)
+    out.write(f"{line_prefix(args.format, time.time())}bench ready\n".encode())
+    out.flush()
+
+    # Satırlar harf dolgusuyla farklılaşır: yalnızca sayıları değişen satırlar tekrar sayılırdı
+    pool = "".join(random.choices(string.ascii_letters, k=args.size + 4096))
+    burst = max(1, args.burst)
+    interval = burst / args.rate if args.rate > 0 else 0.0
+    started = time.perf_counter()
+    deadline = started + args.duration
+    seq = 0
+    next_write = started
+    while not stopping and time.perf_counter() < deadline:
+        now = time.time()
+        prefix = line_prefix(args.format, now)
+        lines = []
+        for _ in range(burst):
+            head = f"{prefix}bench seq={seq} sent={now:.6f} "
+            offset = seq * 7 % 4096  # Ardışık satırların dolgusu hiçbir zaman aynı olmaz
+            lines.append(head + pool[offset:offset + max(0, args.size - len(head))])
+            seq += 1
+        out.write(("\n".join(lines) + "\n").encode())
+        out.flush()
+        next_write += interval
+        delay = next_write - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    out.write(f"{line_prefix(args.format, time.time())}bench done lines={seq}\n".encode())
+    out.flush()
+    while not stopping:
+        time.sleep(0.02)
+    time.sleep(args.stop_delay)
+    if child is not None:
+        # Alt süreç de aynı süreç grubundan sinyali aldı; kapanmasını bekle
+        child.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+n8n Tray - Ölçüm Paketi
+Bu modül log ve denetim sıcak yollarını Qt'nin ekransız (offscreen) platformunda uçtan uca ölçer.
+
+n8n ve cloudflared yerine bench_child.py alt süreçleri başlatılır; gerçek
+ProcessManager, G/Ç motoru, log hattı ve ana pencere kullanılır. Her
+senaryo ayrı bir Python sürecinde çalışır (tepe RSS senaryoya özgü olsun
+diye). Ölçülenler: uçtan uca satır gecikmesi (alt süreçte yazma -> GUI'de
+görünüme ekleme), GUI olay döngüsü takılmaları, sürdürülen satır/sn, tepe
+RSS, başlatma/durdurma gecikmesi ve mikro ölçümler (_append_to_log,
+update_status, log_parser.benchmark).
+
+    python benchmark.py                                # tüm senaryolar
+    python benchmark.py --scenario steady --scenario burst
+    python benchmark.py --output yeni.json --compare onceki.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+
+CHILD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_child.py")
+
+# Olay döngüsü kalp atışı: beklenen aralıktan geç gelen her tetikleme takılma sayılır
+HEARTBEAT_MS = 5
+# Alt süreçlerin bitiş satırını bekleme payı (senaryo süresine eklenir)
+SCENARIO_TIMEOUT_S = 30.0
+STOP_DRAIN_TIMEOUT_S = 5.0
+
+SENT_RE = re.compile(r" sent=(\d+\.\d+)")
+DONE_RE = re.compile(r"bench done lines=(\d+)")
+
+# Senaryo: servis etiketi -> bench_child.py ayarları; süreler duration_scale ile ölçeklenir
+SCENARIOS = {
+    "steady": {
+        "services": {"n8n": {"format": "n8n", "rate": 5000, "size": 120, "burst": 50}},
+        "duration": 3.0,
+    },
+    "burst": {
+        "services": {"n8n": {"format": "n8n", "rate": 20000, "size": 200, "burst": 5000}},
+        "duration": 3.0,
+    },
+    "mixed": {
+        "services": {
+            "n8n": {"format": "n8n", "rate": 4000, "size": 160, "burst": 40},
+            "CF": {"format": "cf", "rate": 1000, "size": 140, "burst": 10},
+        },
+        "duration": 3.0,
+    },
+    "start-stop": {
+        "services": {"n8n": {"format": "n8n", "rate": 0, "stop_delay": 0.05}},
+        "duration": 0.0,
+        "cycles": 5,
+    },
+    "micro": {},
+}
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Sıralı örneklerden yüzdelikler ve en büyük değer (boşsa None)"""
+    if not values:
+        return dict({f"p{p}": None for p in points}, max=None)
+    values = sorted(values)
+    result = {f"p{p}": values[min(len(values) - 1, int(len(values) * p / 100))] for p in points}
+    result["max"] = values[-1]
+    return result
+
+
+def peak_rss():
+    """Bu sürecin tepe RSS değeri (bayt); ölçülemiyorsa None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux kB, macOS bayt döndürür
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def child_command(settings, duration):
+    command = [sys.executable, CHILD_SCRIPT, "--duration", str(duration)]
+    for key, value in settings.items():
+        command += [f"--{key.replace('_', '-')}", str(value)]
+    return command
+
+
+class Harness:
+    """Ekransız uygulama, süreç yöneticisi ve ana pencereyi kurup ölçüm kancalarını bağlayan sınıf
+
+    Kancalar GUI thread'inde çalışır: log partileri görünüme eklendikten
+    sonra gecikme hesaplanır, kalp atışı zamanlayıcısı olay döngüsünün
+    ne kadar geç kaldığını kaydeder.
+    """
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5 import QtCore, QtGui, QtWidgets
+        import config
+
+        self.QtCore = QtCore
+        # Ölçüm gerçek günlük dizinine yazmaz ve çıkan süreçleri yeniden başlatmaz
+        self.journal_dir = tempfile.TemporaryDirectory(prefix="n8n-tray-bench-")
+        config.JOURNAL_DIR = self.journal_dir.name
+        config.SUPERVISOR_AUTO_RESTART = False
+
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([sys.argv[0]])
+        from gui import MainWindow
+        from process_manager import ProcessManager
+
+        self.pm = ProcessManager()
+        self.window = MainWindow(QtGui.QIcon(), self.pm)
+        self.pm.set_gui_references(self.window.log_model, None)
+        self.window.show()
+        self.app.processEvents()
+
+        self.latencies = []
+        self.received = {}  # servis -> veri satırı
+        self.first_seen = None
+        self.last_seen = None
+        self.ready_at = {}  # servis -> "bench ready" satırının görünüme geldiği an
+        self.done = {}  # servis -> alt sürecin yazdığı satır sayısı
+        self.stopped_at = {}
+        self.stalls = []
+        # Bağlantı sırası: görünüme ekleme (set_gui_references) bu kancadan önce çalışır
+        self.pm.log_batcher.batch_ready.connect(self.on_batch)
+        self.pm.state_bus.state_changed.connect(self.on_state_changed)
+
+        self.heartbeat = QtCore.QTimer()
+        self.heartbeat.setTimerType(QtCore.Qt.PreciseTimer)
+        self.heartbeat.timeout.connect(self.on_heartbeat)
+        self.last_beat = None
+
+    def on_batch(self, lines):
+        now = time.time()
+        for line in lines:
+            service = getattr(line, "service", None)
+            match = SENT_RE.search(line)
+            if match is not None:
+                self.latencies.append(now - float(match.group(1)))
+                self.received[service] = self.received.get(service, 0) + 1
+                if self.first_seen is None:
+                    self.first_seen = now
+                self.last_seen = now
+            elif line.endswith("bench ready"):
+                self.ready_at[service] = time.perf_counter()
+            else:
+                done = DONE_RE.search(line)
+                if done is not None:
+                    self.done[service] = int(done.group(1))
+
+    def on_state_changed(self, name, old_state, new_state):
+        from service import ServiceState
+        if new_state in (ServiceState.STOPPED, ServiceState.CRASHED):
+            self.stopped_at[name] = time.perf_counter()
+
+    def on_heartbeat(self):
+        now = time.perf_counter()
+        if self.last_beat is not None:
+            late = now - self.last_beat - HEARTBEAT_MS / 1000
+            if late > 0:
+                self.stalls.append(late)
+        self.last_beat = now
+
+    def start_heartbeat(self):
+        self.stalls = []
+        self.last_beat = None
+        self.heartbeat.start(HEARTBEAT_MS)
+
+    def stop_heartbeat(self):
+        self.heartbeat.stop()
+        return {
+            "heartbeat_ms": HEARTBEAT_MS,
+            "samples": len(self.stalls),
+            "total_ms": sum(self.stalls) * 1000,
+            **{key: None if value is None else value * 1000 for key, value in percentiles(self.stalls).items()},
+        }
+
+    def wait_until(self, predicate, timeout):
+        """Olay döngüsünü döndürerek koşulu bekle; zaman aşımında False"""
+        QtCore = self.QtCore
+        deadline = time.monotonic() + timeout
+        loop = QtCore.QEventLoop()
+        poll = QtCore.QTimer()
+        poll.timeout.connect(lambda: (predicate() or time.monotonic() > deadline) and loop.quit())
+        poll.start(5)
+        if not predicate():
+            loop.exec_()
+        poll.stop()
+        return predicate()
+
+    def start(self, name, settings, duration):
+        """Alt süreci başlat; (başlatma süresi, ilk satıra kadar süre) saniye"""
+        self.ready_at.pop(name, None)
+        self.stopped_at.pop(name, None)
+        started = time.perf_counter()
+        self.pm._start_service(name, child_command(settings, duration))
+        spawned = time.perf_counter() - started
+        self.wait_until(lambda: name in self.ready_at, SCENARIO_TIMEOUT_S)
+        first_line = self.ready_at[name] - started if name in self.ready_at else None
+        return spawned, first_line
+
+    def stop(self, name):
+        """Servisi durdur; STOPPED olayı GUI'ye ulaşana kadar geçen süre (saniye)"""
+        pm = self.pm
+        started = time.perf_counter()
+        pm._stop_service(name, lambda process: pm._stop_worker(name, process, STOP_DRAIN_TIMEOUT_S))
+        self.wait_until(lambda: name in self.stopped_at, STOP_DRAIN_TIMEOUT_S * 3)
+        return self.stopped_at[name] - started if name in self.stopped_at else None
+
+    def close(self):
+        self.pm.shutdown()
+        self.window.close()
+        self.journal_dir.cleanup()
+
+
+def run_traffic(harness, spec, scale):
+    """Hız/boyut/patlama senaryosu: tüm servisleri birlikte çalıştır ve ölç"""
+    duration = spec["duration"] * scale
+    services = spec["services"]
+    harness.start_heartbeat()
+    start_latency = {}
+    for name, settings in services.items():
+        spawned, first_line = harness.start(name, settings, duration)
+        start_latency[name] = {
+            "spawn_ms": spawned * 1000,
+            "first_line_ms": None if first_line is None else first_line * 1000,
+        }
+
+    pm = harness.pm
+    harness.wait_until(
+        lambda: all(name in harness.done for name in services) and pm.log_batcher.pending == 0,
+        duration + SCENARIO_TIMEOUT_S,
+    )
+    stall = harness.stop_heartbeat()
+    stop_latency = {name: harness.stop(name) for name in services}
+
+    sent = sum(harness.done.values())
+    received = sum(harness.received.values())
+    window = (harness.last_seen - harness.first_seen) if received > 1 else None
+    return {
+        "duration_s": duration,
+        "services": services,
+        "lines_sent": sent,
+        "lines_received": received,
+        "lines_per_sec": received / window if window else None,
+        "latency_ms": {key: None if value is None else value * 1000
+                       for key, value in percentiles(harness.latencies).items()},
+        "loop_stall_ms": stall,
+        "dropped": pm.log_dropped.totals(),
+        "collapsed": sum(pm.log_collapsed.totals().values()),
+        "start": start_latency,
+        "stop_ms": {name: None if value is None else value * 1000 for name, value in stop_latency.items()},
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def run_start_stop(harness, spec, scale):
+    """Boşta servisin tekrarlanan başlatma/durdurma gecikmeleri"""
+    spawn, first_line, stop = [], [], []
+    for _ in range(spec["cycles"]):
+        for name, settings in spec["services"].items():
+            spawned, ready = harness.start(name, settings, spec["duration"] * scale)
+            spawn.append(spawned)
+            if ready is not None:
+                first_line.append(ready)
+            stopped = harness.stop(name)
+            if stopped is not None:
+                stop.append(stopped)
+
+    def ms(values):
+        return {key: None if value is None else value * 1000 for key, value in percentiles(values).items()}
+
+    return {
+        "cycles": spec["cycles"],
+        "spawn_ms": ms(spawn),
+        "first_line_ms": ms(first_line),
+        "stop_ms": ms(stop),
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def run_micro(harness, spec, scale):
+    """Sıcak yol mikro ölçümleri: ayrıştırma, görünüme ekleme ve durum göstergeleri"""
+    import config
+    import log_parser
+    from service import ServiceState
+
+    app, pm, window = harness.app, harness.pm, harness.window
+    results = {}
+
+    lines = max(1000, int(100000 * scale))
+    results["log_parser"] = {
+        service: {"ns_per_line": ns, "lines_per_sec": rate}
+        for service, (ns, rate) in log_parser.benchmark(lines).items()
+    }
+
+    # _append_to_log: GUI thread'inde parti başına görünüme ekleme
+    now = time.time()
+    samples = log_parser.SAMPLE_LINES["n8n"]
+    batch_size = config.LOG_MAX_BATCH
+    batches = max(10, int(200 * scale))
+    batch = [pm.log_parser.parse("n8n", samples[i % len(samples)], now) for i in range(batch_size)]
+    started = time.perf_counter()
+    for _ in range(batches):
+        pm._append_to_log(batch)
+        app.processEvents()
+    elapsed = time.perf_counter() - started
+    results["append_to_log"] = {
+        "batch": batch_size,
+        "us_per_batch": elapsed / batches * 1e6,
+        "us_per_line": elapsed / (batches * batch_size) * 1e6,
+    }
+
+    # update_status: değişiklik yokken ve durum her çağrıda değişirken
+    service = pm.services["n8n"]
+    original = service.state
+    count = max(100, int(2000 * scale))
+    status = {}
+    for label, states in (("unchanged_us", [original]), ("state_flip_us", [ServiceState.RUNNING, ServiceState.STOPPED])):
+        started = time.perf_counter()
+        for i in range(count):
+            service.state = states[i % len(states)]
+            window.update_status()
+            app.processEvents()
+        status[label] = (time.perf_counter() - started) / count * 1e6
+    service.state = original
+    window.update_status()
+    results["update_status"] = status
+    results["peak_rss_bytes"] = peak_rss()
+    return results
+
+
+def run_scenario(name, scale):
+    """Tek senaryoyu bu süreçte çalıştır ve sonuç sözlüğünü döndür"""
+    spec = SCENARIOS[name]
+    harness = Harness()
+    try:
+        if name == "micro":
+            return run_micro(harness, spec, scale)
+        if "cycles" in spec:
+            return run_start_stop(harness, spec, scale)
+        return run_traffic(harness, spec, scale)
+    finally:
+        harness.close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata():
+    import config
+    from PyQt5 import QtCore
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "qt": QtCore.QT_VERSION_STR,
+        "platform": platform.platform(),
+        "config": {
+            "log_flush_interval_ms": config.LOG_FLUSH_INTERVAL_MS,
+            "log_max_batch": config.LOG_MAX_BATCH,
+            "log_queue_max_lines": config.LOG_QUEUE_MAX_LINES,
+            "log_overflow_policy": config.LOG_OVERFLOW_POLICY,
+            "log_dedup_enabled": config.LOG_DEDUP_ENABLED,
+        },
+    }
+
+
+def run_isolated(name, scale):
+    """Senaryoyu ayrı süreçte çalıştır (tepe RSS ve Qt durumu senaryolar arasında karışmaz)"""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run", name, "--duration-scale", str(scale)],
+        capture_output=True, text=True, env=env,
+    )
+    if completed.returncode != 0:
+        return {"error": (completed.stderr.strip().splitlines() or ["bilinmeyen hata"])[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def flatten(data, prefix=""):
+    """İç içe sonuçları "a.b.c" -> sayı biçiminde düzleştir"""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(old, new):
+    """İki sonuç dosyasının ortak sayısal değerlerini yan yana yazdır"""
+    old_flat = flatten(old.get("results", {}))
+    new_flat = flatten(new.get("results", {}))
+    print(f"Karşılaştırma: {old.get('meta', {}).get('commit')} -> {new.get('meta', {}).get('commit')}")
+    for key in sorted(old_flat.keys() & new_flat.keys()):
+        before, after = old_flat[key], new_flat[key]
+        change = f"{(after - before) / before * 100:+7.1f}%" if before else "      -"
+        print(f"  {key:<48} {before:14.2f} {after:14.2f} {change}")
+
+
+def summary(name, result):
+    if "error" in result:
+        return f"{name:<11} HATA: {result['error']}"
+    if name == "micro":
+        status = result["update_status"]
+        append = result["append_to_log"]
+        parse = result["log_parser"].get("n8n", {})
+        return (
+            f"{name:<11} ayrıştırma {parse.get('ns_per_line', 0):.0f} ns/satır · "
+            f"_append_to_log {append['us_per_line']:.2f} us/satır · "
+            f"update_status {status['unchanged_us']:.1f}/{status['state_flip_us']:.1f} us"
+        )
+    if "cycles" in result:
+        return (
+            f"{name:<11} başlatma p50 {result['spawn_ms']['p50']:.1f} ms · "
+            f"ilk satır p50 {result['first_line_ms']['p50']:.1f} ms · "
+            f"durdurma p50 {result['stop_ms']['p50']:.1f} ms"
+        )
+    latency = result["latency_ms"]
+    stall = result["loop_stall_ms"]
+    rate = result["lines_per_sec"] or 0
+    rss = (result["peak_rss_bytes"] or 0) / (1024 * 1024)
+    return (
+        f"{name:<11} {result['lines_received']}/{result['lines_sent']} satır · {rate:,.0f} satır/sn · "
+        f"gecikme p50 {latency['p50'] or 0:.1f} / p99 {latency['p99'] or 0:.1f} ms · "
+        f"takılma en çok {stall['max'] or 0:.1f} ms · tepe RSS {rss:.0f} MB"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="n8n Tray ekransız ölçüm paketi")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="çalıştırılacak senaryo (tekrarlanabilir; varsayılan: tümü)")
+    parser.add_argument("--duration-scale", type=float, default=1.0,
+                        help="senaryo sürelerini ve mikro ölçüm tekrarlarını ölçekle")
+    parser.add_argument("--output", help="sonuçları JSON olarak bu dosyaya yaz")
+    parser.add_argument("--compare", help="önceki JSON sonucuyla karşılaştır")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run:
+        # Alt süreç: tek senaryo, sonuç son satırda JSON
+        print(json.dumps(run_scenario(args.run, args.duration_scale)))
+        return 0
+
+    results = {}
+    for name in args.scenario or list(SCENARIOS):
+        results[name] = run_isolated(name, args.duration_scale)
+        print(summary(name, results[name]), flush=True)
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 1 if any("error" in result for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
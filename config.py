@@ -0,0 +1,119 @@
+"""
+n8n Tray - Ayarlar
+Bu modül uygulamanın ayarlanabilir değerlerini içerir.
+"""
+
+import os
+
+# Log Teslimatı - Okuyucu thread'lerden GUI'ye toplu aktarım
+LOG_FLUSH_INTERVAL_MS = 40  # GUI'nin tamponu boşaltma aralığı (ms)
+LOG_MAX_BATCH = 500  # Tek seferde görünüme eklenecek en fazla satır
+# Alım kuyruğu - GUI takılırsa bellekte bekleyen satırların sınırı ve taşma politikası
+LOG_QUEUE_MAX_LINES = 50000
+LOG_OVERFLOW_POLICY = os.environ.get("N8N_TRAY_LOG_OVERFLOW", "drop_oldest")  # drop_oldest, sample veya spill
+LOG_OVERFLOW_SAMPLE_EVERY = 10  # sample: kuyruk doluyken her N satırdan biri tutulur
+LOG_SPILL_MAX_BYTES = 256 * 1024 * 1024  # spill: geçici taşma dosyasının üst sınırı
+# Art arda tekrarlanan (yalnızca sayıları değişen) satırları görünümde birleştir (kapatmak için N8N_TRAY_LOG_DEDUP=0)
+# Kimlik alanları farklı satırlar birleştirilmez; günlük dosyaları her zaman ham satırları tutar
+LOG_DEDUP_ENABLED = os.environ.get("N8N_TRAY_LOG_DEDUP", "1") == "1"
+LOG_DEDUP_SUMMARY_INTERVAL_S = 1.0  # Süren tekrar dizisi için özet satırı aralığı
+
+# Log Görünümü - Bellekte tutulan son satırlar
+LOG_MAX_LINES = 20000  # Halka tampondaki en fazla satır
+LOG_MAX_BYTES = 16 * 1024 * 1024  # Halka tamponun bellek bütçesi (kayıt nesneleri dahil)
+
+# Günlük Dosyaları - Servis başına diske yazılan tam geçmiş
+JOURNAL_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/.local/share"),
+    "n8n-tray",
+    "logs",
+)
+JOURNAL_MAX_BYTES = 10 * 1024 * 1024  # Döndürmeden önce dosya başına en fazla boyut
+JOURNAL_MAX_FILES = 5  # Saklanacak eski dosya sayısı
+JOURNAL_FLUSH_INTERVAL_S = 0.5  # Arka plan yazıcının diske yazma aralığı
+JOURNAL_INDEX_EVERY_BYTES = 64 * 1024  # Seyrek zaman dizini adımı
+JOURNAL_LOAD_LIMIT = 100000  # Geçmiş penceresine tek seferde yüklenecek en fazla satır
+JOURNAL_MAX_PENDING_LINES = LOG_QUEUE_MAX_LINES  # Diske yazılamazken servis başına bekletilecek en fazla satır
+JOURNAL_RETRY_MAX_S = 60.0  # Yazma hatalarından sonra yeniden deneme aralığının üst sınırı
+
+# Dışa Aktarma - Görünümdeki satırların arka planda dosyaya yazılması
+EXPORT_CHUNK_LINES = 5000  # Kilit altında tek seferde okunan satır
+EXPORT_GZIP_LEVEL = 6  # .gz çıktının sıkıştırma düzeyi (1 hızlı - 9 küçük)
+
+# G/Ç Motoru - Alt süreç çıktılarının okunması
+IO_READ_SIZE = 64 * 1024  # Tek okumada alınacak en fazla bayt
+IO_PARTIAL_LINE_TIMEOUT_S = 0.2  # Satır sonu gelmeyen yarım satırın teslim gecikmesi
+IO_EXIT_POLL_S = 0.1  # Çıktı borusu açıkken sürecin çıkıp çıkmadığının yoklanma aralığı
+IO_EXIT_DRAIN_S = 0.2  # Süreç çıktıktan sonra açık kalan borudan kalan çıktının okunma süresi
+
+# n8n Hazırlık Kontrolü - Editör ve webhook dinleyicisinin trafik kabul etmesi
+N8N_HOST = "127.0.0.1"
+N8N_PORT = int(os.environ.get("N8N_PORT", "5678"))
+N8N_HEALTH_PATH = "/healthz"
+READY_PROBE_INITIAL_DELAY_S = 0.1  # İlk denemeler arası bekleme
+READY_PROBE_MAX_DELAY_S = 2.0  # Geri çekilmenin üst sınırı
+READY_PROBE_TIMEOUT_S = 180.0  # Bu sürede hazır olmazsa vazgeç
+READY_PROBE_REQUEST_TIMEOUT_S = 1.0  # Tek bağlantı/istek zaman aşımı
+
+# n8n Kuyruk Modu - Ana süreç, webhook süreçleri ve worker'lar
+# Kuyruk modu Redis gerektirir; kapalıyken yalnızca ana n8n süreci çalışır
+N8N_QUEUE_MODE = os.environ.get("N8N_TRAY_QUEUE_MODE", "0") == "1"
+N8N_WEBHOOK_REPLICAS = int(os.environ.get("N8N_TRAY_WEBHOOKS", "1"))
+N8N_WORKER_REPLICAS = int(os.environ.get("N8N_TRAY_WORKERS", "0"))  # 0 = kullanılabilir çekirdek sayısı
+N8N_MAX_REPLICAS = 16  # Rol başına en fazla kopya
+# Her kopya iki port kullanır: HTTP/sağlık portu ve bir sonraki port (görev çalıştırıcı aracısı)
+N8N_WEBHOOK_BASE_PORT = N8N_PORT + 100
+N8N_WORKER_BASE_PORT = N8N_PORT + 200
+
+# Denetçi - Çöken servislerin otomatik yeniden başlatılması
+SUPERVISOR_AUTO_RESTART = True
+RESTART_BASE_DELAY_S = 1.0  # İlk yeniden başlatmadan önceki bekleme
+RESTART_MAX_DELAY_S = 60.0  # Geri çekilmenin üst sınırı
+RESTART_BACKOFF_FACTOR = 2.0  # Her ardışık hatada bekleme çarpanı
+RESTART_JITTER = 0.2  # Beklemeye eklenen rastgele oran (±)
+RESTART_MAX_PER_WINDOW = 5  # Pencere içinde izin verilen en fazla yeniden başlatma
+RESTART_WINDOW_S = 300.0  # Çökme döngüsü penceresi
+RESTART_STABLE_AFTER_S = 60.0  # Bu kadar ayakta kalan servisin hata sayacı sıfırlanır
+
+# Toplu Başlatma - Bağımlılık sırasına göre paralel başlatma
+# Servis adı veya n8n rol adı -> önce hazır olması gereken servisler
+STARTUP_DEPENDENCIES = {
+    "CF": ("n8n",),  # Tünel, n8n trafik kabul etmeden açılmaz
+    "webhook": ("n8n",),  # Webhook süreçleri ve worker'lar ana süreci (veritabanı göçleri) bekler
+    "worker": ("n8n",),
+}
+STARTUP_TIMEOUT_S = 300.0  # Bu sürede tamamlanmazsa bekleyen servisler başarısız sayılır
+
+# Durdurma - Önce nazik sinyal, süre aşılırsa süreç ağacını zorla sonlandır
+N8N_STOP_DRAIN_TIMEOUT_S = 30.0  # n8n'in devam eden yürütmeleri bitirmesi için süre
+CF_STOP_DRAIN_TIMEOUT_S = 10.0  # cloudflared'in bağlantıları kapatması için süre
+STOP_DRAIN_TIMEOUT_S = 10.0  # Diğer süreçler için varsayılan
+STOP_KILL_TIMEOUT_S = 5.0  # Zorla sonlandırmadan sonra çıkışı bekleme süresi
+
+# Kaynak Örnekleyici - Servis ağaçlarının CPU/RSS ölçümü
+SAMPLER_INTERVAL_S = 2.0  # Ölçüm aralığı
+SAMPLER_HISTORY = 120  # Servis başına saklanan örnek sayısı (sparkline uzunluğu)
+
+# Metrikler - Prometheus metin biçiminde yerel HTTP uç noktası (isteğe bağlı)
+METRICS_ENABLED = os.environ.get("N8N_TRAY_METRICS", "0") == "1"
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = int(os.environ.get("N8N_TRAY_METRICS_PORT", "9464"))
+METRICS_RATE_INTERVAL_S = 1.0  # Saniyelik log hızının hesaplanma aralığı
+
+# Daemon Modu - Arayüz ve sistem tepsisi olmadan çalıştırma (--headless)
+DAEMON_AUTOSTART = os.environ.get("N8N_TRAY_AUTOSTART", "0") == "1"  # Açılışta tüm yığını başlat
+DAEMON_SIGNAL_POLL_MS = 250  # Qt döngüsündeyken Python sinyal işleyicilerinin çalışma aralığı
+
+# İzleme - İşlem aralıklarının halka tamponda kaydı (tepsi menüsünden Chrome trace JSON olarak dışa aktarılır)
+TRACE_ENABLED = os.environ.get("N8N_TRAY_TRACE", "0") == "1"  # Tepsi menüsünden de açılıp kapatılabilir
+TRACE_BUFFER_EVENTS = 100000  # Tamponda tutulan en fazla aralık (dolunca en eskiler düşer)
+TRACE_DIR = os.path.join(os.path.dirname(JOURNAL_DIR), "traces")
+
+# Olay Döngüsü Bekçisi - GUI takılmalarının ölçümü ve ana thread yığınının kaydı
+# İsteğe bağlı: boştaki tepsi uygulamasını düzenli uyandırmamak için varsayılan olarak kapalı
+WATCHDOG_ENABLED = os.environ.get("N8N_TRAY_WATCHDOG", "0") == "1"
+WATCHDOG_HEARTBEAT_MS = 1000  # GUI thread'indeki kalp atışı aralığı
+WATCHDOG_STALL_THRESHOLD_MS = 500  # Bu kadar yanıt vermeyen döngü için yığın kaydedilir
+WATCHDOG_LAG_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)  # Gecikme histogramı sınırları
+WATCHDOG_MAX_STALLS = 50  # Bellekte tutulan son takılma sayısı
+WATCHDOG_STACK_DEPTH = 40  # Takılma başına kaydedilen en fazla çerçeve
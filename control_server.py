@@ -0,0 +1,298 @@
+"""
+n8n Tray - Kontrol Sunucusu
+Bu modül tek örnek yerel soketini uzunluk önekli JSON komut kanalına dönüştürür.
+"""
+
+import json
+import struct
+import time
+from PyQt5 import QtCore, QtNetwork
+
+from log_search import classify_line
+from service import ServiceState
+
+
+# Çerçeve: 4 bayt büyük sonlu uzunluk + UTF-8 JSON nesnesi
+HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 1024 * 1024
+# Yazma tamponu bu boyutu aşan izleyiciye log gönderilmez (yavaş istemci GUI'yi bekletmez)
+MAX_PENDING_WRITE_BYTES = 4 * 1024 * 1024
+TAIL_DEFAULT_LINES = 100
+# Aynı anda bağlanan betikler için bekleyen bağlantı kuyruğu (listen backlog)
+MAX_PENDING_CONNECTIONS = 128
+
+
+def create_local_server(name):
+    """Tek örnek sunucusunu geniş bağlantı kuyruğuyla dinlemeye başlat"""
+    local_server = QtNetwork.QLocalServer()
+    local_server.setMaxPendingConnections(MAX_PENDING_CONNECTIONS)
+    local_server.removeServer(name)  # Varsa eski sunucuyu temizle
+    local_server.listen(name)
+    return local_server
+
+
+def encode_frame(message):
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return HEADER.pack(len(payload)) + payload
+
+
+class ControlConnection(QtCore.QObject):
+    """Tek istemci bağlantısı: gelen baytları çerçevelere böler, yanıtları kuyruğa yazar
+
+    Tüm okuma ve yazmalar readyRead sinyaliyle ve Qt'nin yazma tamponu
+    üzerinden yapılır; hiçbir çağrı olay döngüsünü bloklamaz.
+    """
+
+    def __init__(self, server, socket):
+        super().__init__(server)
+        self.server = server
+        self.socket = socket
+        self.buffer = bytearray()
+        self.follow = None  # tail-logs izleme filtresi (servis adı, tümü için "")
+        self.follow_level = None
+        self.records = False  # Satırlar yerine ayrıştırılmış kayıtlar gönderilir
+        self.dropped = 0
+        socket.setParent(self)
+        socket.readyRead.connect(self.on_ready_read)
+        socket.disconnected.connect(self.close)
+
+    def on_ready_read(self):
+        self.buffer += self.socket.readAll().data()
+
+        # Eski istemciler çerçevesiz "show" gönderir
+        if self.buffer == b"show":
+            self.buffer.clear()
+            self.server.show_requested.emit()
+            return
+
+        while len(self.buffer) >= HEADER.size:
+            (length,) = HEADER.unpack_from(self.buffer)
+            if length > MAX_FRAME_BYTES:
+                self.send({"ok": False, "error": "çerçeve çok büyük"})
+                self.socket.disconnectFromServer()
+                return
+            if len(self.buffer) < HEADER.size + length:
+                return
+            payload = bytes(self.buffer[HEADER.size:HEADER.size + length])
+            del self.buffer[:HEADER.size + length]
+            try:
+                request = json.loads(payload.decode("utf-8"))
+                if not isinstance(request, dict):
+                    raise ValueError("istek bir JSON nesnesi olmalı")
+            except ValueError as e:
+                self.send({"ok": False, "error": f"geçersiz istek: {e}"})
+                continue
+            self.server.dispatch(self, request)
+
+    def send(self, message):
+        if self.socket.state() == QtNetwork.QLocalSocket.ConnectedState:
+            self.socket.write(encode_frame(message))
+
+    def send_lines(self, lines):
+        """İzleyen istemciye log satırlarını gönder; tampon doluysa düşür ve say"""
+        if self.socket.bytesToWrite() > MAX_PENDING_WRITE_BYTES:
+            self.dropped += len(lines)
+            return
+        if self.dropped:
+            self.send({"event": "dropped", "count": self.dropped})
+            self.dropped = 0
+        self.send({"event": "log", "lines": lines})
+
+    def close(self):
+        # Gönderip hemen kapanan istemcilerin son verisi de işlenir
+        if self.socket.bytesAvailable():
+            self.on_ready_read()
+        self.server.connections.discard(self)
+        self.deleteLater()
+
+
+class ControlServer(QtCore.QObject):
+    """Yerel soket üzerinden start/stop/restart/status/tail-logs/stalls komutlarını işleyen sunucu
+
+    İstek: {"cmd": ..., "service": ..., "id": ...}. Yanıtlar aynı "id" ile
+    döner; tail-logs "follow" ile istenirse sonraki satırlar {"event": "log"}
+    çerçeveleri olarak akar. tail-logs "level" ile seviyeye göre süzer,
+    "records" ile metin yerine ayrıştırılmış kayıtları (zaman, servis,
+    seviye, mesaj, alanlar) döndürür. Hedef servis "all", "n8n" (tüm n8n
+    kopyaları), "CF" veya tek bir servis adı olabilir.
+    """
+    show_requested = QtCore.pyqtSignal()
+
+    def __init__(self, local_server, process_manager, parent=None):
+        super().__init__(parent)
+        self.local_server = local_server
+        self.process_manager = process_manager
+        self.connections = set()
+        self._restarts = {}  # servis -> yeniden başlatmayı bekleyen hedef
+        local_server.newConnection.connect(self.on_new_connection)
+        process_manager.log_batcher.batch_ready.connect(self.on_log_batch)
+        process_manager.state_bus.state_changed.connect(self.on_state_changed)
+        # Sunucu bu nesneden önce dinlemeye başlamış olabilir
+        self.on_new_connection()
+
+    def on_new_connection(self):
+        while self.local_server.hasPendingConnections():
+            socket = self.local_server.nextPendingConnection()
+            connection = ControlConnection(self, socket)
+            self.connections.add(connection)
+            # Bağlantı kurulmadan gelmiş veri readyRead üretmez
+            if socket.bytesAvailable():
+                QtCore.QTimer.singleShot(0, connection.on_ready_read)
+
+    def dispatch(self, connection, request):
+        cmd = request.get("cmd")
+        handler = {
+            "show": self.cmd_show,
+            "status": self.cmd_status,
+            "start": self.cmd_start,
+            "stop": self.cmd_stop,
+            "restart": self.cmd_restart,
+            "tail-logs": self.cmd_tail_logs,
+            "unfollow": self.cmd_unfollow,
+            "stalls": self.cmd_stalls,
+        }.get(cmd)
+        try:
+            if handler is None:
+                raise ValueError(f"bilinmeyen komut: {cmd}")
+            response = handler(connection, request)
+            response["ok"] = True
+        except ValueError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            response = {"ok": False, "error": f"komut hatası: {e}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        connection.send(response)
+
+    def _target(self, request):
+        target = request.get("service", "all")
+        if target in ("all", "n8n") or target in self.process_manager.services:
+            return target
+        raise ValueError(f"bilinmeyen servis: {target}")
+
+    def cmd_show(self, connection, request):
+        self.show_requested.emit()
+        return {}
+
+    def cmd_status(self, connection, request):
+        pm = self.process_manager
+        now = time.monotonic()
+        services = {}
+        for name, service in pm.services.items():
+            process = service.process
+            stats = pm.supervisor.stats(name)
+            running = service.state in (ServiceState.RUNNING, ServiceState.READY)
+            info = {
+                "display_name": service.display_name,
+                "state": service.state,
+                "label": service.label(),
+                "pid": process.pid if process is not None else None,
+                "time_to_ready": service.time_to_ready,
+                "uptime": now - service.started_at if running and service.started_at else None,
+                "restarts": stats["restarts"],
+                "crash_loop": stats["crash_loop"],
+            }
+            instance = pm.n8n_instances.get(name)
+            if instance is not None:
+                info["role"] = instance.role.name
+                info["port"] = instance.port
+            services[name] = info
+        return {"services": services}
+
+    def cmd_start(self, connection, request):
+        target = self._target(request)
+        self.process_manager.start_target(target)
+        return {"service": target}
+
+    def cmd_stop(self, connection, request):
+        target = self._target(request)
+        self.process_manager.stop_target(target)
+        return {"service": target}
+
+    def cmd_restart(self, connection, request):
+        """Hedefi durdur; durdurulan servislerin hepsi durunca yeniden başlat
+
+        Yalnızca gerçekten STOPPING durumuna alınan servisler beklenir.
+        Durdurulamayanlar (ör. süreci henüz oluşmamış STARTING servisler)
+        için bekleme kaydı tutulmaz; aksi halde yeniden başlatma hiç
+        gerçekleşmez ve kalan kayıt sonraki ilgisiz bir durmada hedefi
+        beklenmedik şekilde başlatırdı. Hiçbiri durdurulamadıysa hedef
+        hemen başlatılır; aksi halde durdurulmayan servisler (zaten
+        başlıyorlar ya da durmuşlar) bağımlılık sırası korunsun diye
+        hedefin başlatılmasıyla birlikte ele alınır.
+        """
+        target = self._target(request)
+        pm = self.process_manager
+        active = any(pm.services[name].is_active() for name in pm.target_services(target))
+        stopping = pm.stop_target(target) if active else []
+        if not stopping:
+            pm.start_target(target)
+            return {"service": target}
+        for name in stopping:
+            self._restarts[name] = target
+        return {"service": target, "stopping": stopping}
+
+    def on_state_changed(self, name, old_state, new_state):
+        if name not in self._restarts or new_state not in (ServiceState.STOPPED, ServiceState.CRASHED):
+            return
+        target = self._restarts.pop(name)
+        if target not in self._restarts.values():
+            self.process_manager.start_target(target)
+
+    @staticmethod
+    def _select(lines, service, level):
+        """Servis ve seviyeye uyan satırlar (alımda ayrıştırılan bilgiyle)"""
+        if not service and not level:
+            return lines
+        selected = []
+        for line in lines:
+            tag, line_level = classify_line(line)
+            if (not service or tag == service) and (not level or line_level == level):
+                selected.append(line)
+        return selected
+
+    @staticmethod
+    def _payload(lines, records):
+        if not records:
+            return lines
+        return [line.to_dict() if hasattr(line, "to_dict") else {"message": line} for line in lines]
+
+    def cmd_tail_logs(self, connection, request):
+        """Son satırları döndür; follow ile sonraki satırları akıt"""
+        count = int(request.get("lines", TAIL_DEFAULT_LINES))
+        service = request.get("service") or ""
+        level = (request.get("level") or "").upper() or None
+        filtered = bool(service or level)
+        lines = self.process_manager.recent_log_lines(None if filtered else count)
+        if filtered:
+            lines = self._select(lines, service, level)[-count:] if count else []
+        records = bool(request.get("records"))
+        if request.get("follow"):
+            connection.follow = service
+            connection.follow_level = level
+            connection.records = records
+        return {"lines": self._payload(lines, records), "follow": connection.follow is not None}
+
+    def cmd_unfollow(self, connection, request):
+        connection.follow = None
+        return {}
+
+    def cmd_stalls(self, connection, request):
+        """Olay döngüsü gecikme histogramı ve son takılmaların yığınları"""
+        watchdog = self.process_manager.loop_watchdog
+        if watchdog is None:
+            raise ValueError("olay döngüsü bekçisi kapalı")
+        snapshot = watchdog.snapshot()
+        snapshot["histogram"]["buckets"] = [
+            ["+Inf" if bound == float("inf") else bound, count] for bound, count in snapshot["histogram"]["buckets"]
+        ]
+        return snapshot
+
+    def on_log_batch(self, lines):
+        followers = [c for c in self.connections if c.follow is not None]
+        if not followers:
+            return
+        for connection in followers:
+            selected = self._select(lines, connection.follow, connection.follow_level)
+            if selected:
+                connection.send_lines(self._payload(selected, connection.records))
@@ -0,0 +1,94 @@
+"""
+n8n Tray - Daemon Modu
+Bu modül süreç yöneticisini QtWidgets, pencere ve sistem tepsisi olmadan çekirdek Qt döngüsünde çalıştırır.
+
+Sunucularda kullanım:
+    python main.py --headless --start
+    python instance_client.py status
+"""
+
+import signal
+import sys
+
+from PyQt5 import QtCore
+
+import config
+from control_server import ControlServer, create_local_server
+from instance_client import SERVER_NAME
+from process_manager import ProcessManager
+
+
+class Daemon(QtCore.QObject):
+    """Arayüzsüz çalışma: denetim, günlükler ve yeniden başlatma aynı, kontrol yerel soketten
+
+    Log satırları bellekteki halka tampona (tail-logs için), günlük
+    dosyalarına ve isteğe bağlı olarak standart çıktıya (systemd/journald)
+    yazılır. SIGINT/SIGTERM önce servisleri nazikçe durdurur, hepsi
+    durunca (veya süre dolunca) çıkar; ikinci sinyal beklemeden çıkar.
+    """
+
+    def __init__(self, app, echo=True, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.local_server = create_local_server(SERVER_NAME)
+        self.process_manager = ProcessManager()
+        self.process_manager.attach_log_buffer()
+        if echo:
+            self.process_manager.log_batcher.batch_ready.connect(self.echo_lines)
+        # Kapanırken tamponda kalan satırlar da yazdırılsın
+        app.aboutToQuit.connect(self.process_manager.log_batcher.flush)
+        app.aboutToQuit.connect(self.process_manager.shutdown)
+        self.control_server = ControlServer(self.local_server, self.process_manager)
+        self._stopping = False
+
+        # Qt döngüsü çalışırken Python sinyal işleyicilerine sıra gelmesi için
+        self._signal_timer = QtCore.QTimer(self)
+        self._signal_timer.timeout.connect(lambda: None)
+        self._signal_timer.start(config.DAEMON_SIGNAL_POLL_MS)
+        signal.signal(signal.SIGINT, self.on_signal)
+        signal.signal(signal.SIGTERM, self.on_signal)
+
+    def echo_lines(self, lines):
+        try:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+
+    def on_signal(self, signum, frame):
+        pm = self.process_manager
+        if self._stopping:
+            self.app.quit()
+            return
+        self._stopping = True
+        pm.log_append(f"Sinyal alındı ({signum}), servisler durduruluyor")
+        pm.state_bus.state_changed.connect(self._quit_when_stopped)
+        pm.stop_all()
+        timeout = max(config.CF_STOP_DRAIN_TIMEOUT_S, config.N8N_STOP_DRAIN_TIMEOUT_S) + config.STOP_KILL_TIMEOUT_S
+        QtCore.QTimer.singleShot(int((timeout + 1) * 1000), self.app.quit)
+        self._quit_when_stopped()
+
+    def _quit_when_stopped(self, *args):
+        if not any(service.is_active() for service in self.process_manager.services.values()):
+            self.app.quit()
+
+
+def run(argv, autostart=False, echo=True, timer=None):
+    """Daemon'u başlat ve olay döngüsü bitince çıkış kodunu döndür"""
+    app = QtCore.QCoreApplication(argv)
+    app.setApplicationName("n8n-tray")
+    daemon = Daemon(app, echo)
+    if timer is not None:
+        timer.mark("daemon")
+
+    local_server = daemon.local_server
+    if not local_server.isListening():
+        print(f"Kontrol soketi açılamadı: {local_server.errorString()}", file=sys.stderr)
+        return 1
+    daemon.process_manager.log_append(f"Daemon modu başlatıldı (kontrol soketi: {local_server.fullServerName()})")
+
+    if autostart or config.DAEMON_AUTOSTART:
+        QtCore.QTimer.singleShot(0, daemon.process_manager.start_all)
+    if timer is not None:
+        timer.report()
+    return app.exec_()
@@ -4,9 +4,353 @@ Bu modül ana pencereyi ve tüm GUI bileşenlerini oluşturur.
 """
 
 from PyQt5 import QtWidgets, QtGui, QtCore
+from log_export import ExportSelection, LogExporter
+from log_journal import display_timestamp, split_line
+from log_model import LogListModel
+from log_parser import LogParser
+from log_search import LogQuery, LogSearchWorker, LEVELS
+from service import ServiceState
 import styles
-import ctypes
+import config
 import sys
+import threading
+
+
+def set_role(widget, role):
+    """Bileşeni uygulama stil sayfasındaki [role=...] kurallarına bağla"""
+    widget.setProperty("role", role)
+    return widget
+
+
+def set_state(widget, value, name="state"):
+    """Dinamik stil özelliğini değiştir; değer aynıysa hiçbir şey yapma
+    
+    Yalnızca bu bileşen yeniden cilalanır (unpolish/polish); stil sayfası
+    yeniden ayrıştırılmaz ve diğer bileşenler etkilenmez.
+    """
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
+
+
+def state_class(state):
+    """Servis durumunun stil sayfasındaki karşılığı"""
+    if state in (ServiceState.RUNNING, ServiceState.READY):
+        return "running"
+    if state in (ServiceState.STARTING, ServiceState.STOPPING):
+        return "pending"
+    return "stopped"
+
+
+class HistoryLoadEmitter(QtCore.QObject):
+    """Arka planda okunan geçmiş satırlarını GUI'ye taşıyan sinyaller"""
+    loaded = QtCore.pyqtSignal(int, list)  # nesil, satırlar
+    failed = QtCore.pyqtSignal(int, str)  # nesil, hata
+
+
+class LogHistoryDialog(QtWidgets.QDialog):
+    """Günlük dosyalarından seçilen zaman aralığını yükleyen pencere"""
+    
+    def __init__(self, parent, journal_writer, names=()):
+        super().__init__(parent)
+        self.journal_writer = journal_writer
+        # Ebeveynsiz: pencere (WA_DeleteOnClose) okuma sürerken silinse de thread'in
+        # tuttuğu referansla yaşar; silinen pencerenin yuvalarıyla bağı Qt tarafından kopar
+        self.emitter = HistoryLoadEmitter()
+        self.generation = 0
+        self.emitter.loaded.connect(self.on_loaded)
+        self.emitter.failed.connect(self.on_failed)
+        
+        self.setWindowTitle("Günlük Geçmişi")
+        self.resize(720, 480)
+        
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(14, 14, 14, 14)
+        layout.setSpacing(8)
+        
+        controls = QtWidgets.QHBoxLayout()
+        self.service_combo = QtWidgets.QComboBox()
+        # Servis kopyaları kendi günlük dosyalarına yazar
+        self.service_combo.addItems(list(dict.fromkeys([*names, "tray", *sorted(journal_writer.journals)])))
+        now = QtCore.QDateTime.currentDateTime()
+        self.start_edit = QtWidgets.QDateTimeEdit(now.addSecs(-3600))
+        self.end_edit = QtWidgets.QDateTimeEdit(now)
+        for edit in (self.start_edit, self.end_edit):
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+            edit.setCalendarPopup(True)
+        self.load_button = QtWidgets.QPushButton("Yükle")
+        set_role(self.load_button, "utility")
+        self.load_button.clicked.connect(self.load)
+        self.export_button = QtWidgets.QPushButton("Dışa Aktar")
+        set_role(self.export_button, "utility")
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export)
+        self.loaded_service = None
+        
+        controls.addWidget(self.service_combo)
+        controls.addWidget(self.start_edit)
+        controls.addWidget(QtWidgets.QLabel("-"))
+        controls.addWidget(self.end_edit)
+        controls.addWidget(self.load_button)
+        controls.addWidget(self.export_button)
+        layout.addLayout(controls)
+        
+        self.model = LogListModel(config.JOURNAL_LOAD_LIMIT, config.LOG_MAX_BYTES * 4, self)
+        view = QtWidgets.QListView()
+        view.setModel(self.model)
+        view.setUniformItemSizes(True)
+        set_role(view, "log")
+        layout.addWidget(view, 1)
+        
+        self.info_label = QtWidgets.QLabel("")
+        set_role(self.info_label, "log-header")
+        layout.addWidget(self.info_label)
+    
+    def load(self):
+        """Seçili aralığı arka plan thread'inde oku"""
+        self.loaded_service = self.service_combo.currentText()
+        journal = self.journal_writer.journal(self.loaded_service)
+        start = self.start_edit.dateTime().toMSecsSinceEpoch() / 1000.0
+        end = self.end_edit.dateTime().toMSecsSinceEpoch() / 1000.0
+        self.load_button.setEnabled(False)
+        self.info_label.setText("Yükleniyor...")
+        
+        service = self.loaded_service
+        emitter = self.emitter
+        self.generation += 1
+        generation = self.generation
+        
+        # Thread pencereye (self) dokunmaz; yalnızca emitter ve yerel değerleri kullanır
+        def worker():
+            try:
+                # Günlükte UTC saklanır; satırlar yerel saatle, ayrıştırılmış kayıt olarak gösterilir
+                parser = LogParser()
+                records = []
+                for line in journal.read_range(start, end, config.JOURNAL_LOAD_LIMIT):
+                    ts, text = split_line(line)
+                    records.append(parser.journal_record(service, text, ts, display_timestamp(ts)))
+                emitter.loaded.emit(generation, records)
+            except Exception as e:
+                emitter.failed.emit(generation, str(e))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def on_loaded(self, generation, lines):
+        if generation != self.generation:
+            return
+        self.model.clear()
+        self.model.append_lines(lines)
+        self.load_button.setEnabled(True)
+        self.export_button.setEnabled(bool(lines))
+        suffix = " (sınıra ulaşıldı)" if len(lines) >= config.JOURNAL_LOAD_LIMIT else ""
+        self.info_label.setText(f"{len(lines)} satır yüklendi{suffix}")
+    
+    def on_failed(self, generation, error):
+        if generation != self.generation:
+            return
+        self.load_button.setEnabled(True)
+        self.info_label.setText(f"Hata: {error}")
+    
+    def closeEvent(self, event):
+        # Süren okumanın sonucu yok sayılır
+        self.generation += 1
+        super().closeEvent(event)
+    
+    def export(self):
+        """Yüklenen geçmişi dışa aktar (satırlar seçili servisin ayrıştırıcısıyla çözülür)"""
+        dialog = LogExportDialog(
+            self, self.model, [self.loaded_service], default_service=self.loaded_service
+        )
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+
+
+class LogExportDialog(QtWidgets.QDialog):
+    """Log satırlarını biçim, servis ve zaman aralığı seçerek arka planda dışa aktaran pencere"""
+    
+    FORMATS = (
+        ("Düz metin", "text", "txt"),
+        ("JSON Lines (ayrıştırılmış alanlar)", "jsonl", "jsonl"),
+    )
+    
+    def __init__(self, parent, model, names=(), default_service=None, log=None):
+        super().__init__(parent)
+        self.default_service = default_service
+        self.log = log
+        # Ebeveynsiz: pencere (WA_DeleteOnClose) silinse de thread bitene kadar
+        # nesneyi kendi referansıyla canlı tutar; sinyaller silinen pencereye bağlı
+        # yuvalardan Qt tarafından koparılır
+        self.exporter = LogExporter(model)
+        self.exporter.progress.connect(self.on_progress)
+        self.exporter.finished.connect(self.on_finished)
+        self.exporter.failed.connect(self.on_failed)
+        
+        self.setWindowTitle("Günlüğü Dışa Aktar")
+        self.resize(520, 220)
+        
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(14, 14, 14, 14)
+        layout.setSpacing(8)
+        form = QtWidgets.QFormLayout()
+        
+        self.service_combo = QtWidgets.QComboBox()
+        self.service_combo.addItem("Tüm Kaynaklar", None)
+        for name in names:
+            self.service_combo.addItem(f"[{name}]", name)
+        if default_service is None:
+            self.service_combo.addItem("Uygulama", "tray")
+        form.addRow("Kaynak", self.service_combo)
+        
+        range_row = QtWidgets.QHBoxLayout()
+        self.range_check = QtWidgets.QCheckBox()
+        now = QtCore.QDateTime.currentDateTime()
+        self.start_edit = QtWidgets.QDateTimeEdit(now.addSecs(-3600))
+        self.end_edit = QtWidgets.QDateTimeEdit(now)
+        for edit in (self.start_edit, self.end_edit):
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+            edit.setCalendarPopup(True)
+            edit.setEnabled(False)
+            self.range_check.toggled.connect(edit.setEnabled)
+        range_row.addWidget(self.range_check)
+        range_row.addWidget(self.start_edit, 1)
+        range_row.addWidget(QtWidgets.QLabel("-"))
+        range_row.addWidget(self.end_edit, 1)
+        form.addRow("Zaman aralığı", range_row)
+        
+        self.format_combo = QtWidgets.QComboBox()
+        for label, fmt, _ in self.FORMATS:
+            self.format_combo.addItem(label, fmt)
+        form.addRow("Biçim", self.format_combo)
+        self.gzip_check = QtWidgets.QCheckBox("gzip ile sıkıştır (.gz)")
+        form.addRow("", self.gzip_check)
+        layout.addLayout(form)
+        
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+        
+        buttons = QtWidgets.QHBoxLayout()
+        self.info_label = set_role(QtWidgets.QLabel(""), "log-header")
+        buttons.addWidget(self.info_label, 1)
+        self.export_button = set_role(QtWidgets.QPushButton("Dışa Aktar"), "utility")
+        self.export_button.clicked.connect(self.start_export)
+        self.cancel_button = set_role(QtWidgets.QPushButton("Kapat"), "utility")
+        self.cancel_button.clicked.connect(self.on_cancel)
+        buttons.addWidget(self.export_button)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+    
+    def selection(self):
+        if not self.range_check.isChecked():
+            return ExportSelection(self.service_combo.currentData())
+        return ExportSelection(
+            self.service_combo.currentData(),
+            self.start_edit.dateTime().toMSecsSinceEpoch() / 1000.0,
+            self.end_edit.dateTime().toMSecsSinceEpoch() / 1000.0,
+        )
+    
+    def start_export(self):
+        """Dosya adını sor ve dışa aktarmayı arka planda başlat"""
+        from datetime import datetime
+        
+        label, fmt, extension = self.FORMATS[self.format_combo.currentIndex()]
+        if self.gzip_check.isChecked():
+            extension += ".gz"
+        default_name = f"n8n_gunluk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            "Günlük Dosyasını Kaydet",
+            default_name,
+            f"{label} (*.{extension});;Tüm Dosyalar (*.*)"
+        )
+        if not filename:
+            return
+        
+        self.exporter.start(
+            filename, fmt, self.gzip_check.isChecked(), self.selection()
+        )
+        self.export_button.setEnabled(False)
+        self.cancel_button.setText("İptal")
+        self.progress_bar.setValue(0)
+        self.info_label.setText("Yazılıyor...")
+    
+    def on_progress(self, generation, done, total):
+        if generation == self.exporter.generation:
+            self.progress_bar.setValue(int(done * 100 / total) if total else 100)
+    
+    def on_finished(self, generation, path, written, missed):
+        if generation != self.exporter.generation:
+            return
+        self.reset_buttons()
+        self.progress_bar.setValue(100)
+        suffix = f", {missed} satır yazılmadan tampondan düştü" if missed else ""
+        self.info_label.setText(f"{written} satır yazıldı{suffix}")
+        if self.log is not None:
+            self.log(f"Günlük kaydedildi: {path} ({written} satır{suffix})")
+    
+    def on_failed(self, generation, error):
+        if generation != self.exporter.generation:
+            return
+        self.reset_buttons()
+        self.info_label.setText(f"Hata: {error}")
+        if self.log is not None:
+            self.log(f"Hata: {error}")
+    
+    def reset_buttons(self):
+        self.export_button.setEnabled(True)
+        self.cancel_button.setText("Kapat")
+    
+    def on_cancel(self):
+        """Süren dışa aktarmayı iptal et (yarım dosya silinir); yoksa pencereyi kapat"""
+        if not self.exporter.running:
+            self.close()
+            return
+        self.exporter.cancel()
+        self.reset_buttons()
+        self.progress_bar.setValue(0)
+        self.info_label.setText("İptal edildi")
+    
+    def closeEvent(self, event):
+        self.exporter.cancel()
+        super().closeEvent(event)
+
+
+class Sparkline(QtWidgets.QWidget):
+    """Son ölçümleri küçük bir çizgi grafik olarak çizen bileşen"""
+    
+    def __init__(self, color, parent=None):
+        super().__init__(parent)
+        self.color = QtGui.QColor(color)
+        self.values = []
+        self.setFixedHeight(18)
+        self.setMinimumWidth(60)
+    
+    def set_values(self, values):
+        self.values = values
+        self.update()
+    
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtGui.QPen(self.color, 1.2))
+        
+        width = self.width() - 1
+        height = self.height() - 2
+        top = max(max(self.values), 1e-9)
+        step = width / (len(self.values) - 1)
+        points = [
+            QtCore.QPointF(i * step, 1 + height - (value / top) * height)
+            for i, value in enumerate(self.values)
+        ]
+        painter.drawPolyline(QtGui.QPolygonF(points))
+        painter.end()
 
 
 class MainWindow(QtWidgets.QWidget):
@@ -21,15 +365,15 @@ class MainWindow(QtWidgets.QWidget):
         """Arayüzü başlat"""
         self.setWindowTitle("n8n Kontrol Paneli")
         self.setWindowIcon(icon)
-        self.setFixedSize(600, 520)
+        # Kuyruk modunda kopya satırı için yer açılır
+        self.setFixedSize(600, 640 if config.N8N_QUEUE_MODE else 600)
         
-        # Global stil ayarları (tüm diyaloglar için)
+        # Uygulama genelinde tek stil sayfası (tüm pencere ve diyaloglar için);
+        # bileşenler role özelliğiyle, durumlar state özelliğiyle seçilir
         app = QtWidgets.QApplication.instance()
         if app:
-            app.setStyleSheet(styles.WINDOW_STYLE + styles.MESSAGEBOX_STYLE + 
-                            styles.MENU_STYLE + styles.FILEDIALOG_STYLE)
-        
-        self.setStyleSheet(styles.WINDOW_STYLE)
+            app.setStyleSheet(styles.APP_STYLESHEET)
+        self.status_cache = {}
         
         # Ana düzen
         layout = QtWidgets.QVBoxLayout()
@@ -44,6 +388,11 @@ class MainWindow(QtWidgets.QWidget):
         self.create_status_indicators(layout)
         layout.addSpacing(12)
         
+        # n8n webhook/worker kopyaları (yalnızca kuyruk modunda)
+        if config.N8N_QUEUE_MODE:
+            self.create_replica_controls(layout)
+            layout.addSpacing(8)
+        
         # Butonlar
         self.create_buttons(layout)
         layout.addSpacing(8)
@@ -62,6 +411,7 @@ class MainWindow(QtWidgets.QWidget):
         """Windows 11 başlık çubuğunu karanlık yap"""
         if sys.platform == "win32":
             try:
+                import ctypes
                 hwnd = int(self.winId())
                 # DWMWA_USE_IMMERSIVE_DARK_MODE = 20 (Windows 11)
                 # DWMWA_USE_IMMERSIVE_DARK_MODE = 19 (Windows 10 build 19041+)
@@ -95,25 +445,164 @@ class MainWindow(QtWidgets.QWidget):
     
     def create_header(self, layout):
         """Başlık oluştur"""
+        header_container = QtWidgets.QWidget()
+        header_layout = QtWidgets.QHBoxLayout(header_container)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        
         header = QtWidgets.QLabel("n8n Kontrol Paneli")
-        header.setStyleSheet(styles.HEADER_STYLE)
+        set_role(header, "header")
         header.setAlignment(QtCore.Qt.AlignLeft)
-        layout.addWidget(header)
+        header_layout.addWidget(header)
+        header_layout.addStretch()
+        
+        # Bağımlılık sırasıyla toplu başlatma
+        btn_start_all = QtWidgets.QPushButton("Tümünü Başlat")
+        set_role(btn_start_all, "utility")
+        btn_start_all.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        btn_start_all.clicked.connect(self.process_manager.start_all)
+        header_layout.addWidget(btn_start_all)
+        
+        layout.addWidget(header_container)
     
     def create_status_indicators(self, layout):
-        """Durum göstergelerini oluştur"""
+        """Durum göstergelerini ve kaynak kullanım satırlarını oluştur"""
         status_container = QtWidgets.QWidget()
         status_layout = QtWidgets.QHBoxLayout(status_container)
         status_layout.setSpacing(12)
         status_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.n8n_status = QtWidgets.QLabel()
-        self.cf_status = QtWidgets.QLabel()
+        self.n8n_status = set_role(QtWidgets.QLabel(), "status")
+        self.cf_status = set_role(QtWidgets.QLabel(), "status")
+        self.status_labels = {"n8n": self.n8n_status, "CF": self.cf_status}
+        self.usage_labels = {}
+        self.cpu_sparklines = {}
+        self.rss_sparklines = {}
+        
+        for name, label in self.status_labels.items():
+            column = QtWidgets.QVBoxLayout()
+            column.setSpacing(4)
+            column.addWidget(label)
+            
+            # CPU/RSS canlı değerleri ve son ölçümlerin çizgi grafikleri
+            usage_row = QtWidgets.QHBoxLayout()
+            usage_row.setSpacing(6)
+            usage_label = QtWidgets.QLabel("-")
+            set_role(usage_label, "usage")
+            cpu_sparkline = Sparkline(styles.COLORS['accent_green'])
+            cpu_sparkline.setToolTip("CPU")
+            rss_sparkline = Sparkline(styles.COLORS['text_secondary'])
+            rss_sparkline.setToolTip("RSS")
+            usage_row.addWidget(usage_label, 1)
+            usage_row.addWidget(cpu_sparkline, 1)
+            usage_row.addWidget(rss_sparkline, 1)
+            column.addLayout(usage_row)
+            
+            self.usage_labels[name] = usage_label
+            self.cpu_sparklines[name] = cpu_sparkline
+            self.rss_sparklines[name] = rss_sparkline
+            status_layout.addLayout(column, 1)
+        
+        # Durum makinesi değişikliklerine abone ol
+        self.process_manager.state_bus.state_changed.connect(self.on_service_state_changed)
+        
+        # Arka plan örnekleyicisinin ölçümlerine abone ol
+        self.process_manager.resource_sampler.sampled.connect(self.on_resource_sampled)
         
-        status_layout.addWidget(self.n8n_status)
-        status_layout.addWidget(self.cf_status)
         layout.addWidget(status_container)
     
+    def on_resource_sampled(self, samples):
+        """Kaynak ölçümlerini göstergelere yansıt"""
+        sampler = self.process_manager.resource_sampler
+        for name, sample in samples.items():
+            if name not in self.usage_labels:
+                continue
+            if sample is None:
+                self.usage_labels[name].setText("-")
+                continue
+            self.usage_labels[name].setText(
+                f"CPU %{sample.cpu_percent:.0f} · {sample.rss / (1024 * 1024):.0f} MB"
+            )
+            self.usage_labels[name].setToolTip(f"{sample.processes} süreç")
+            series = sampler.series(name)
+            self.cpu_sparklines[name].set_values([s.cpu_percent for s in series])
+            self.rss_sparklines[name].set_values([s.rss for s in series])
+    
+    def create_replica_controls(self, layout):
+        """Ölçeklenebilir n8n rolleri için kopya sayısı ve kopya başına durum noktaları"""
+        replica_container = QtWidgets.QWidget()
+        replica_layout = QtWidgets.QHBoxLayout(replica_container)
+        replica_layout.setContentsMargins(0, 0, 0, 0)
+        replica_layout.setSpacing(8)
+        
+        self.replica_spins = {}
+        self.replica_dot_layouts = {}
+        self.replica_dots = {}
+        
+        for role in self.process_manager.n8n_roles.values():
+            if not role.scalable:
+                continue
+            role_label = QtWidgets.QLabel(role.display_name)
+            set_role(role_label, "replica-role")
+            
+            spin = QtWidgets.QSpinBox()
+            spin.setRange(0, role.max_replicas)
+            spin.setValue(role.replicas)
+            spin.setKeyboardTracking(False)
+            set_role(spin, "replica-count")
+            spin.valueChanged.connect(
+                lambda value, name=role.name: self.process_manager.scale_role(name, value)
+            )
+            
+            dots = QtWidgets.QHBoxLayout()
+            dots.setSpacing(2)
+            
+            replica_layout.addWidget(role_label)
+            replica_layout.addWidget(spin)
+            replica_layout.addLayout(dots)
+            replica_layout.addSpacing(12)
+            self.replica_spins[role.name] = spin
+            self.replica_dot_layouts[role.name] = dots
+        
+        replica_layout.addStretch()
+        layout.addWidget(replica_container)
+        
+        self.process_manager.state_bus.services_changed.connect(self.on_services_changed)
+        self.rebuild_replica_dots()
+    
+    def rebuild_replica_dots(self):
+        """Kopya listesi değişince durum noktalarını yeniden oluştur"""
+        for dot in self.replica_dots.values():
+            dot.deleteLater()
+        self.replica_dots = {}
+        
+        for role_name, dots in self.replica_dot_layouts.items():
+            spin = self.replica_spins[role_name]
+            spin.blockSignals(True)
+            spin.setValue(self.process_manager.n8n_roles[role_name].replicas)
+            spin.blockSignals(False)
+            for instance in self.process_manager.role_instances(role_name):
+                dot = set_role(QtWidgets.QLabel("●"), "replica-dot")
+                dots.addWidget(dot)
+                self.replica_dots[instance.name] = dot
+                self.update_replica_dot(instance.name)
+    
+    def update_replica_dot(self, name):
+        """Tek kopyanın durum noktasını güncelle"""
+        service = self.process_manager.services.get(name)
+        instance = self.process_manager.n8n_instances.get(name)
+        dot = self.replica_dots.get(name)
+        if service is None or instance is None or dot is None:
+            return
+        tooltip = f"{service.display_name}: {service.label()} (port {instance.port})"
+        if dot.toolTip() != tooltip:
+            dot.setToolTip(tooltip)
+        set_state(dot, state_class(service.state))
+    
+    def on_services_changed(self):
+        """Ölçekleme sonrası kopya göstergelerini ve kaynak filtresini yenile"""
+        self.rebuild_replica_dots()
+        self.refresh_tag_combo()
+    
     def create_buttons(self, layout):
         """Butonları oluştur"""
         button_container = QtWidgets.QWidget()
@@ -123,23 +612,23 @@ class MainWindow(QtWidgets.QWidget):
         
         # n8n butonları
         btn_start_n8n = QtWidgets.QPushButton("n8n Başlat")
-        btn_start_n8n.setStyleSheet(styles.BUTTON_STYLE_START)
+        set_role(btn_start_n8n, "action")
         btn_start_n8n.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_start_n8n.clicked.connect(self.on_start_n8n)
         
         btn_stop_n8n = QtWidgets.QPushButton("n8n Durdur")
-        btn_stop_n8n.setStyleSheet(styles.BUTTON_STYLE_STOP)
+        set_role(btn_stop_n8n, "action")
         btn_stop_n8n.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_stop_n8n.clicked.connect(self.on_stop_n8n)
         
         # Cloudflare butonları
         btn_start_cf = QtWidgets.QPushButton("Cloudflare Başlat")
-        btn_start_cf.setStyleSheet(styles.BUTTON_STYLE_START)
+        set_role(btn_start_cf, "action")
         btn_start_cf.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_start_cf.clicked.connect(self.on_start_cloudflare)
         
         btn_stop_cf = QtWidgets.QPushButton("Cloudflare Durdur")
-        btn_stop_cf.setStyleSheet(styles.BUTTON_STYLE_STOP)
+        set_role(btn_stop_cf, "action")
         btn_stop_cf.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_stop_cf.clicked.connect(self.on_stop_cloudflare)
         
@@ -161,8 +650,8 @@ class MainWindow(QtWidgets.QWidget):
         emergency_layout.addStretch()
         
         # Acil durdurma butonu - basit stil
-        btn_emergency_kill = QtWidgets.QPushButton("Tüm Node.js'leri Durdur")
-        btn_emergency_kill.setStyleSheet(styles.BUTTON_STYLE_EMERGENCY)
+        btn_emergency_kill = QtWidgets.QPushButton("n8n'i Zorla Durdur")
+        set_role(btn_emergency_kill, "emergency")
         btn_emergency_kill.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_emergency_kill.clicked.connect(self.on_emergency_kill)
         emergency_layout.addWidget(btn_emergency_kill)
@@ -176,25 +665,23 @@ class MainWindow(QtWidgets.QWidget):
         # Onay diyaloğunu göster
         msg_box = QtWidgets.QMessageBox(self)
         msg_box.setIcon(QtWidgets.QMessageBox.Warning)
-        msg_box.setWindowTitle("Acil Node.js Durdurma")
+        msg_box.setWindowTitle("Acil n8n Durdurma")
         msg_box.setText(
-            "Tüm Node.js süreçlerini zorla sonlandırmak istiyor musunuz?\n\n"
+            "n8n süreç ağacını zorla sonlandırmak istiyor musunuz?\n\n"
             "Bu işlem:\n"
-            "• Tüm node.exe süreçlerini sonlandıracak\n"
-            "• n8n ve diğer Node.js uygulamalarını kapatacak\n"
+            "• Bu uygulamanın başlattığı n8n sürecini ve tüm alt süreçlerini sonlandıracak\n"
+            "• Devam eden yürütmeler beklenmeden kesilecek\n"
             "• Kaydedilmemiş veriler kaybolabilir\n\n"
-            "NOT: Cloudflare tüneli etkilenmeyecektir.\n\n"
+            "NOT: Diğer Node.js uygulamaları ve Cloudflare tüneli etkilenmeyecektir.\n\n"
             "Devam etmek istiyor musunuz?"
         )
         msg_box.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
         msg_box.setDefaultButton(QtWidgets.QMessageBox.No)
-        msg_box.setStyleSheet(styles.MESSAGEBOX_STYLE)
         
         reply = msg_box.exec_()
         
         if reply == QtWidgets.QMessageBox.Yes:
             self.process_manager.emergency_kill_all()
-            self.update_status()
     
     def create_log_area(self, layout):
         """Log alanı oluştur"""
@@ -205,173 +692,355 @@ class MainWindow(QtWidgets.QWidget):
         log_header_layout.setSpacing(8)
         
         log_header = QtWidgets.QLabel("Aktivite Günlüğü")
-        log_header.setStyleSheet(styles.LOG_HEADER_STYLE)
+        set_role(log_header, "log-header")
         log_header_layout.addWidget(log_header)
         
+        # Kuyruk taşması veya görünüm sınırı nedeniyle atlanan satırlar
+        self.log_drop_label = QtWidgets.QLabel()
+        set_role(self.log_drop_label, "log-drop")
+        self.log_drop_label.hide()
+        log_header_layout.addWidget(self.log_drop_label)
+        self.log_drop_timer = QtCore.QTimer(self)
+        self.log_drop_timer.timeout.connect(self.update_log_drop_label)
+        self.log_drop_timer.start(1000)
+        
         log_header_layout.addStretch()
         
         # Temizle butonu
         btn_clear_log = QtWidgets.QPushButton("Temizle")
-        btn_clear_log.setStyleSheet(styles.BUTTON_STYLE_LOG_UTILITY)
+        set_role(btn_clear_log, "utility")
         btn_clear_log.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_clear_log.clicked.connect(self.clear_log)
         log_header_layout.addWidget(btn_clear_log)
         
         # Kaydet butonu
         btn_save_log = QtWidgets.QPushButton("Kaydet")
-        btn_save_log.setStyleSheet(styles.BUTTON_STYLE_LOG_UTILITY)
+        set_role(btn_save_log, "utility")
         btn_save_log.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         btn_save_log.clicked.connect(self.save_log)
         log_header_layout.addWidget(btn_save_log)
         
         layout.addWidget(log_header_container)
         
-        self.log_text = QtWidgets.QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setStyleSheet(styles.LOG_TEXT_STYLE)
-        self.log_text.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.log_text.customContextMenuRequested.connect(self.show_log_context_menu)
-        layout.addWidget(self.log_text, 1)  # Genişleme faktörü
+        # Arama ve filtre satırı
+        self.create_log_filter_bar(layout)
+        
+        # Sanal liste: yalnızca görünen satırlar çizilir
+        self.log_model = LogListModel(config.LOG_MAX_LINES, config.LOG_MAX_BYTES, self, indexed=True)
+        self.log_model.rowsInserted.connect(self.on_log_rows_inserted)
+        
+        # Filtre sonuçları ayrı modelde tutulur; arama arka planda akıtılır
+        self.filter_model = LogListModel(config.LOG_MAX_LINES, config.LOG_MAX_BYTES, self)
+        self.filter_query = None
+        self.filter_live_from = 0
+        self.filter_pending = []
+        self.search_worker = LogSearchWorker(self.log_model, self)
+        self.search_worker.results.connect(self.on_search_results)
+        self.search_worker.finished.connect(self.on_search_finished)
+        
+        self.log_view = QtWidgets.QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.log_view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.log_view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        set_role(self.log_view, "log")
+        self.log_view.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.log_view.customContextMenuRequested.connect(self.show_log_context_menu)
+        layout.addWidget(self.log_view, 1)  # Genişleme faktörü
+    
+    def update_log_drop_label(self):
+        """Atlanan ve bekleyen log satırlarını başlıkta göster"""
+        pm = self.process_manager
+        dropped = pm.log_dropped.totals()
+        total = sum(dropped.values())
+        pending = pm.log_batcher.pending
+        if not total and pending < pm.log_batcher.max_pending:
+            self.log_drop_label.hide()
+            return
+        stages = {
+            "queue": "kuyruk taşması",
+            "spill": "taşma dosyası dolu",
+            "view": "görünüm sınırı",
+            "journal": "günlük dosyası yazılamadı",
+        }
+        details = [f"{stages.get(stage, stage)}: {count}" for stage, count in sorted(dropped.items()) if count]
+        details.append(f"bekleyen: {pending} ({pm.log_batcher.overflow_policy})")
+        collapsed = sum(pm.log_collapsed.totals().values())
+        if collapsed:
+            details.append(f"tekrar olarak birleştirilen: {collapsed}")
+        self.log_drop_label.setText(f"Atlanan: {total}" if total else f"Bekleyen: {pending}")
+        if not dropped.get("journal"):
+            details.append("(tüm satırlar günlük dosyalarında)")
+        self.log_drop_label.setToolTip("\n".join(details))
+        self.log_drop_label.show()
+    
+    def create_log_filter_bar(self, layout):
+        """Arama kutusu, regex seçeneği ve etiket/seviye filtrelerini oluştur"""
+        filter_container = QtWidgets.QWidget()
+        filter_layout = QtWidgets.QHBoxLayout(filter_container)
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.setSpacing(6)
+        
+        self.search_input = QtWidgets.QLineEdit()
+        self.search_input.setPlaceholderText("Günlükte ara...")
+        self.search_input.setClearButtonEnabled(True)
+        set_role(self.search_input, "filter")
+        filter_layout.addWidget(self.search_input, 1)
+        
+        self.regex_check = QtWidgets.QCheckBox("Regex")
+        set_role(self.regex_check, "filter")
+        filter_layout.addWidget(self.regex_check)
+        
+        self.tag_combo = QtWidgets.QComboBox()
+        set_role(self.tag_combo, "filter")
+        self.refresh_tag_combo()
+        filter_layout.addWidget(self.tag_combo)
+        
+        self.level_combo = QtWidgets.QComboBox()
+        set_role(self.level_combo, "filter")
+        self.level_combo.addItem("Tüm Seviyeler", None)
+        for level in LEVELS:
+            self.level_combo.addItem(level, level)
+        filter_layout.addWidget(self.level_combo)
+        
+        # Yazarken her tuşta aramayı başlatmamak için kısa gecikme
+        self.filter_timer = QtCore.QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(self.apply_log_filter)
+        
+        self.search_input.textChanged.connect(self.filter_timer.start)
+        self.regex_check.toggled.connect(self.filter_timer.start)
+        self.tag_combo.currentIndexChanged.connect(self.filter_timer.start)
+        self.level_combo.currentIndexChanged.connect(self.filter_timer.start)
+        
+        layout.addWidget(filter_container)
+    
+    def refresh_tag_combo(self):
+        """Kaynak filtresini güncel servis listesiyle doldur (seçimi koru)"""
+        current = self.tag_combo.currentData()
+        self.tag_combo.blockSignals(True)
+        self.tag_combo.clear()
+        self.tag_combo.addItem("Tüm Kaynaklar", None)
+        for name in self.process_manager.services:
+            self.tag_combo.addItem(f"[{name}]", name)
+        self.tag_combo.addItem("Uygulama", "tray")
+        index = self.tag_combo.findData(current)
+        self.tag_combo.setCurrentIndex(max(index, 0))
+        self.tag_combo.blockSignals(False)
+        if index < 0 and current is not None:
+            # Filtrelenen kopya kaldırıldı
+            self.filter_timer.start()
+    
+    def apply_log_filter(self):
+        """Geçerli filtreyi uygula; boşsa tam günlüğe dön"""
+        try:
+            query = LogQuery(
+                self.search_input.text(),
+                self.regex_check.isChecked(),
+                self.tag_combo.currentData(),
+                self.level_combo.currentData(),
+            )
+        except Exception:
+            # Geçersiz regex - kullanıcı yazmaya devam ediyor olabilir
+            set_state(self.search_input, True, "invalid")
+            return
+        set_state(self.search_input, False, "invalid")
+        
+        if query.is_empty():
+            self.search_worker.cancel()
+            self.filter_query = None
+            self.filter_pending = []
+            self.log_view.setModel(self.log_model)
+            self.log_view.scrollToBottom()
+            return
+        
+        self.filter_query = query
+        self.filter_pending = []
+        self.filter_model.clear()
+        self.log_view.setModel(self.filter_model)
+        # Bu seq'ten itibaren gelen satırlar canlı olarak filtrelenir
+        self.filter_live_from = self.log_model.buffer.next_seq
+        self.search_worker.start(query, self.filter_live_from)
+    
+    def on_search_results(self, generation, lines):
+        """Arka plan aramasından gelen parçayı görünüme ekle"""
+        if generation == self.search_worker.generation:
+            self.filter_model.append_lines(lines)
+    
+    def on_search_finished(self, generation, total):
+        """Arama bitince bekleyen canlı satırları ekle"""
+        if generation == self.search_worker.generation:
+            self.filter_model.append_lines(self.filter_pending)
+            self.filter_pending = []
+            self.log_view.scrollToBottom()
+    
+    def on_log_rows_inserted(self, parent, first, last):
+        """Yeni satırlar geldiğinde görünümü kaydır ve etkin filtreye uygula"""
+        if self.filter_query is None:
+            self.log_view.scrollToBottom()
+            return
+        
+        buffer = self.log_model.buffer
+        base = buffer.first_seq
+        lines = [
+            buffer[row] for row in range(first, last + 1)
+            if base + row >= self.filter_live_from and self.filter_query.matches(buffer[row])
+        ]
+        if not lines:
+            return
+        if self.search_worker.running:
+            self.filter_pending.extend(lines)
+        else:
+            self.filter_model.append_lines(lines)
+            self.log_view.scrollToBottom()
     
     def show_log_context_menu(self, position):
         """Log için bağlam menüsünü göster"""
         menu = QtWidgets.QMenu()
-        menu.setStyleSheet(styles.MENU_STYLE)
         
+        copy_selected_action = menu.addAction("Seçili Satırları Kopyala")
+        copy_selected_action.setEnabled(self.log_view.selectionModel().hasSelection())
         copy_action = menu.addAction("Tümünü Kopyala")
         clear_action = menu.addAction("Günlüğü Temizle")
         menu.addSeparator()
         save_action = menu.addAction("Dosyaya Kaydet...")
+        history_action = menu.addAction("Geçmişi Yükle...")
         
-        action = menu.exec_(self.log_text.mapToGlobal(position))
+        action = menu.exec_(self.log_view.viewport().mapToGlobal(position))
         
-        if action == copy_action:
+        if action == copy_selected_action:
+            self.copy_selected_log()
+        elif action == copy_action:
             self.copy_log()
         elif action == clear_action:
             self.clear_log()
         elif action == save_action:
             self.save_log()
+        elif action == history_action:
+            self.show_log_history()
+    
+    def show_log_history(self):
+        """Günlük dosyalarından geçmiş yükleme penceresini aç"""
+        dialog = LogHistoryDialog(
+            self, self.process_manager.journal_writer, list(self.process_manager.services)
+        )
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
     
     def clear_log(self):
         """Günlüğü temizle"""
-        self.log_text.clear()
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] Günlük temizlendi")
+        self.log_model.clear()
+        self.process_manager.log_append("Günlük temizlendi")
     
     def copy_log(self):
         """Günlük içeriğini kopyala"""
         from PyQt5.QtWidgets import QApplication
-        QApplication.clipboard().setText(self.log_text.toPlainText())
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] Günlük panoya kopyalandı")
+        QApplication.clipboard().setText(self.log_view.model().to_plain_text())
+        self.process_manager.log_append("Günlük panoya kopyalandı")
+    
+    def copy_selected_log(self):
+        """Seçili satırları kopyala"""
+        from PyQt5.QtWidgets import QApplication
+        rows = sorted(index.row() for index in self.log_view.selectionModel().selectedRows())
+        buffer = self.log_view.model().buffer
+        QApplication.clipboard().setText("\n".join(buffer[row] for row in rows))
     
     def save_log(self):
-        """Günlüğü dosyaya kaydet"""
-        from PyQt5.QtWidgets import QFileDialog
-        from datetime import datetime
-        
-        default_name = f"n8n_gunluk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        filename, _ = QFileDialog.getSaveFileName(
-            self,
-            "Günlük Dosyasını Kaydet",
-            default_name,
-            "Metin Dosyaları (*.txt);;Tüm Dosyalar (*.*)"
+        """Görünümdeki (filtre etkinse süzülmüş) günlüğü arka planda dosyaya aktar"""
+        dialog = LogExportDialog(
+            self, self.log_view.model(), list(self.process_manager.services),
+            log=self.process_manager.log_append,
         )
-        
-        if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.log_text.toPlainText())
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                self.log_text.append(f"[{timestamp}] Günlük kaydedildi: {filename}")
-            except Exception as e:
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                self.log_text.append(f"[{timestamp}] Hata: {str(e)}")
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
     
     def update_status(self):
-        """Durum göstergelerini güncelle"""
-        # n8n durumu
-        if self.process_manager.is_n8n_running():
-            self.n8n_status.setText("n8n: Çalışıyor")
-            self.n8n_status.setStyleSheet(styles.STATUS_RUNNING_STYLE)
-        else:
-            self.n8n_status.setText("n8n: Durduruldu")
-            self.n8n_status.setStyleSheet(styles.STATUS_STOPPED_STYLE)
+        """Tüm durum göstergelerini güncelle"""
+        for name in self.status_labels:
+            self.update_service_status(name)
+    
+    def update_service_status(self, name):
+        """Tek bir servisin durum göstergesini güncelle"""
+        service = self.process_manager.services[name]
+        text = f"{service.display_name}: {service.label()}"
+        if service.state == ServiceState.READY and service.time_to_ready is not None:
+            text += f" ({service.time_to_ready:.1f} sn)"
         
-        # Cloudflare durumu
-        if self.process_manager.is_cloudflare_running():
-            self.cf_status.setText("Cloudflare: Çalışıyor")
-            self.cf_status.setStyleSheet(styles.STATUS_CF_RUNNING_STYLE)
-        else:
-            self.cf_status.setText("Cloudflare: Durduruldu")
-            self.cf_status.setStyleSheet(styles.STATUS_STOPPED_STYLE)
+        stats = self.process_manager.supervisor.stats(name)
+        tooltip = (
+            f"Yeniden başlatma: {stats['restarts']}\n"
+            f"Kesinti: {stats['incidents']} olay, toplam {stats['downtime']:.1f} sn\n"
+            f"Erişilebilirlik: %{stats['availability'] * 100:.2f}"
+        )
+        if stats["crash_loop"]:
+            tooltip += "\nÇökme döngüsü: otomatik yeniden başlatma durduruldu"
+        
+        # Yalnızca değişen kısımlar uygulanır; durum değişimi tek bileşeni yeniden cilalar
+        shown = self.status_cache.get(name, (None, None))
+        label = self.status_labels[name]
+        if text != shown[0]:
+            label.setText(text)
+        if tooltip != shown[1]:
+            label.setToolTip(tooltip)
+        self.status_cache[name] = (text, tooltip)
+        set_state(label, state_class(service.state))
+    
+    def on_service_state_changed(self, name, old_state, new_state):
+        """Durum makinesinden gelen değişikliği yalnızca ilgili göstergeye uygula"""
+        if name in self.status_labels:
+            self.update_service_status(name)
+        elif config.N8N_QUEUE_MODE:
+            self.update_replica_dot(name)
     
     def show_window(self):
         """Pencereyi göster"""
         self.show()
         self.raise_()
         self.activateWindow()
-        self.update_status()
     
     # Buton geri çağırmaları
     def on_start_n8n(self):
         try:
             self.process_manager.start_n8n()
-            self.update_status()
         except Exception as e:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_text.append(f"[{timestamp}] n8n başlatma hatası: {e}")
+            self.process_manager.log_append(f"n8n başlatma hatası: {e}")
             msg = QtWidgets.QMessageBox(self)
             msg.setIcon(QtWidgets.QMessageBox.Critical)
             msg.setWindowTitle("Hata")
             msg.setText(f"n8n başlatılamadı: {e}")
-            msg.setStyleSheet(styles.MESSAGEBOX_STYLE)
             msg.exec_()
     
     def on_stop_n8n(self):
         try:
             self.process_manager.stop_n8n()
-            self.update_status()
         except Exception as e:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_text.append(f"[{timestamp}] n8n durdurma hatası: {e}")
+            self.process_manager.log_append(f"n8n durdurma hatası: {e}")
             msg = QtWidgets.QMessageBox(self)
             msg.setIcon(QtWidgets.QMessageBox.Critical)
             msg.setWindowTitle("Hata")
             msg.setText(f"n8n durdurulamadı: {e}")
-            msg.setStyleSheet(styles.MESSAGEBOX_STYLE)
             msg.exec_()
     
     def on_start_cloudflare(self):
         try:
             self.process_manager.start_cloudflare()
-            self.update_status()
         except Exception as e:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_text.append(f"[{timestamp}] Cloudflare başlatma hatası: {e}")
+            self.process_manager.log_append(f"Cloudflare başlatma hatası: {e}")
             msg = QtWidgets.QMessageBox(self)
             msg.setIcon(QtWidgets.QMessageBox.Critical)
             msg.setWindowTitle("Hata")
             msg.setText(f"Cloudflare başlatılamadı: {e}")
-            msg.setStyleSheet(styles.MESSAGEBOX_STYLE)
             msg.exec_()
     
     def on_stop_cloudflare(self):
         try:
             self.process_manager.stop_cloudflare()
-            self.update_status()
         except Exception as e:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_text.append(f"[{timestamp}] Cloudflare durdurma hatası: {e}")
+            self.process_manager.log_append(f"Cloudflare durdurma hatası: {e}")
             msg = QtWidgets.QMessageBox(self)
             msg.setIcon(QtWidgets.QMessageBox.Critical)
             msg.setWindowTitle("Hata")
             msg.setText(f"Cloudflare durdurulamadı: {e}")
-            msg.setStyleSheet(styles.MESSAGEBOX_STYLE)
             msg.exec_()
@@ -0,0 +1,192 @@
+"""
+n8n Tray - Tek Örnek İstemcisi
+Bu modül Qt yüklemeden çalışan örneğin yerel soketine bağlanır; yalnızca standart kütüphane kullanır.
+
+Komut satırından da kullanılabilir:
+    python instance_client.py status
+    python instance_client.py restart n8n
+    python instance_client.py tail -n 50 -f CF
+    python instance_client.py tail --level ERROR --json n8n
+"""
+
+import os
+import struct
+import sys
+
+
+SERVER_NAME = "n8n_tray_single_instance"
+# Çerçeve: 4 bayt büyük sonlu uzunluk + UTF-8 JSON (control_server.py ile aynı)
+HEADER = struct.Struct(">I")
+
+
+def server_path(name=SERVER_NAME):
+    """QLocalServer'ın kullandığı yol (Windows'ta adlandırılmış boru, diğerlerinde Unix soketi)"""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{name}"
+    # QDir::tempPath() ile aynı: TMPDIR, yoksa /tmp
+    return os.path.join(os.environ.get("TMPDIR") or "/tmp", name)
+
+
+def connect(name=SERVER_NAME, timeout=0.5):
+    """Çalışan örneğe bağlan; dosya benzeri nesne döndür, örnek yoksa None
+
+    Sunucu yoksa bağlantı hemen reddedilir, bu yüzden ikinci örneğin
+    çıkış yolu milisaniyeler sürer.
+    """
+    path = server_path(name)
+    if sys.platform == "win32":
+        import time
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return open(path, "r+b", buffering=0)
+            except OSError as e:
+                # ERROR_PIPE_BUSY: sunucu var ama tüm boru örnekleri meşgul
+                if getattr(e, "winerror", None) != 231 or time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.01)
+
+    import socket
+    import time
+    deadline = time.monotonic() + timeout
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+            return sock.makefile("rwb", buffering=0)
+        except BlockingIOError:
+            # Sunucu var ama bağlantı kuyruğu dolu
+            sock.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+        except OSError:
+            sock.close()
+            return None
+
+
+def encode_frame(message):
+    import json
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return HEADER.pack(len(payload)) + payload
+
+
+def read_frame(stream):
+    """Akıştan tek çerçeve oku; bağlantı kapandıysa None"""
+    import json
+    header = _read_exact(stream, HEADER.size)
+    if header is None:
+        return None
+    payload = _read_exact(stream, HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload.decode("utf-8"))
+
+
+def _read_exact(stream, size):
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+class ControlClient:
+    """Kontrol kanalı istemcisi: istek gönderir, aynı id'li yanıtı bekler"""
+
+    def __init__(self, name=SERVER_NAME, timeout=5.0):
+        self.stream = connect(name, timeout)
+        if self.stream is None:
+            raise ConnectionError("çalışan n8n Tray örneği bulunamadı")
+        self._next_id = 0
+
+    def request(self, cmd, **params):
+        self._next_id += 1
+        message = {"cmd": cmd, "id": self._next_id, **params}
+        self.stream.write(encode_frame(message))
+        self.stream.flush()
+        while True:
+            response = self.read()
+            if response is None:
+                raise ConnectionError("bağlantı kapandı")
+            if response.get("id") == self._next_id:
+                return response
+
+    def read(self):
+        """Sıradaki çerçeve (yanıt veya {"event": ...} olayı)"""
+        return read_frame(self.stream)
+
+    def close(self):
+        self.stream.close()
+
+
+def send_to_running_instance(message, name=SERVER_NAME, timeout=0.5):
+    """Çalışan örneğe mesaj gönder; örnek yoksa False döndür"""
+    stream = connect(name, timeout)
+    if stream is None:
+        return False
+    try:
+        stream.write(encode_frame(message) if isinstance(message, dict) else message)
+        stream.flush()
+    except OSError:
+        return False
+    finally:
+        stream.close()
+    return True
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Çalışan n8n Tray örneğini kontrol et")
+    parser.add_argument("command", choices=["show", "status", "start", "stop", "restart", "tail", "stalls"])
+    parser.add_argument("service", nargs="?", default=None, help='"all", "n8n", "CF" veya servis adı')
+    parser.add_argument("-n", "--lines", type=int, default=100)
+    parser.add_argument("-f", "--follow", action="store_true")
+    parser.add_argument("-l", "--level", choices=["ERROR", "WARN", "INFO", "DEBUG"], help="tail: seviyeye göre süz")
+    parser.add_argument("--json", action="store_true", help="tail: ayrıştırılmış kayıtları JSON satırları olarak yaz")
+    args = parser.parse_intermixed_args(argv)
+
+    try:
+        client = ControlClient()
+    except ConnectionError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    try:
+        if args.command == "tail":
+            params = {"lines": args.lines, "follow": args.follow, "records": args.json}
+            if args.service:
+                params["service"] = args.service
+            if args.level:
+                params["level"] = args.level
+            response = client.request("tail-logs", **params)
+            show = (lambda item: json.dumps(item, ensure_ascii=False)) if args.json else str
+            for line in response.get("lines", []):
+                print(show(line))
+            while response.get("ok") and args.follow:
+                event = client.read()
+                if event is None:
+                    break
+                if event.get("event") == "log":
+                    for line in event["lines"]:
+                        print(show(line), flush=True)
+                elif event.get("event") == "dropped":
+                    print(f"... {event['count']} satır atlandı", file=sys.stderr)
+        else:
+            params = {"service": args.service} if args.service else {}
+            response = client.request(args.command, **params)
+            print(json.dumps(response, ensure_ascii=False, indent=2))
+        return 0 if response.get("ok") else 1
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
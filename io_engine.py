@@ -0,0 +1,211 @@
+"""
+n8n Tray - G/Ç Motoru
+Bu modül tüm alt süreçlerin çıktılarını tek bir asyncio thread'inden okur.
+"""
+
+import asyncio
+import codecs
+import subprocess
+import sys
+import threading
+
+import config
+
+
+# Windows'ta konsol penceresi açılmasın; diğer platformlarda 0 olmalı
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+# Windows'ta CTRL_BREAK yalnızca ayrı süreç grubuna gönderilebilir
+CREATE_NEW_PROCESS_GROUP = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+
+
+class ManagedProcess:
+    """IOEngine tarafından başlatılan sürecin thread güvenli tutamacı"""
+
+    def __init__(self, engine, tag, proc):
+        self.engine = engine
+        self.tag = tag
+        self._proc = proc
+        self.pid = proc.pid
+        self.returncode = None
+        self._exited = threading.Event()
+
+    def poll(self):
+        """Popen.poll() ile aynı: çalışıyorsa None, bittiyse çıkış kodu"""
+        return self.returncode
+
+    def wait(self, timeout=None):
+        """Süreç bitene kadar bekle; zaman aşımında None döndür"""
+        if self._exited.wait(timeout):
+            return self.returncode
+        return None
+
+    def send_signal(self, sig):
+        """Sinyali G/Ç thread'i üzerinden gönder"""
+        self.engine.call_soon(self._send_signal, sig)
+
+    def _send_signal(self, sig):
+        if self.returncode is None:
+            try:
+                self._proc.send_signal(sig)
+            except ProcessLookupError:
+                pass
+
+    def _mark_exited(self, returncode):
+        self.returncode = returncode
+        self._exited.set()
+
+
+class IOEngine:
+    """Tek thread'de çalışan asyncio döngüsü ile çok süreçli çıktı okuyucu
+
+    Süreçler asyncio subprocess ile başlatılır (Windows'ta IOCP/Proactor,
+    Linux'ta selector + pidfd). Çıktılar ikili ve bloklamadan okunur, UTF-8
+    artımlı çözülür, satırlara bölünür ve on_lines geri çağrısına verilir.
+    Yeni satır gelmeden bekleyen yarım satır partial_line_timeout sonunda
+    tek başına teslim edilir. Süreç sayısı ne olursa olsun thread sayısı sabittir.
+    """
+
+    def __init__(self, read_size=None, partial_line_timeout=None):
+        self.read_size = read_size or config.IO_READ_SIZE
+        self.partial_line_timeout = partial_line_timeout or config.IO_PARTIAL_LINE_TIMEOUT_S
+        self.loop = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="io-engine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._install_child_watcher()
+        self._ready.set()
+        self.loop.run_forever()
+
+    def _install_child_watcher(self):
+        """Linux'ta süreç başına bekleme thread'i açan varsayılan izleyici yerine pidfd kullan"""
+        if sys.platform == "win32" or sys.version_info >= (3, 12):
+            return
+        try:
+            import os
+            os.close(os.pidfd_open(os.getpid()))
+            watcher = asyncio.PidfdChildWatcher()
+            watcher.attach_loop(self.loop)
+            asyncio.set_child_watcher(watcher)
+        except (AttributeError, OSError):
+            # Eski çekirdek: varsayılan ThreadedChildWatcher ile devam
+            pass
+
+    def in_loop_thread(self):
+        """Çağıran G/Ç thread'i mi?"""
+        return threading.current_thread() is self._thread
+
+    def call_soon(self, callback, *args):
+        """Geri çağrıyı G/Ç thread'inde çalıştır"""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def submit(self, coro):
+        """Korutini G/Ç döngüsünde çalıştır; concurrent.futures.Future döndür"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def spawn(self, tag, command, on_lines, on_exit, shell=False, env=None, timeout=10):
+        """Süreci başlat ve çıktısını izlemeye al; ManagedProcess döndür
+
+        on_lines(tag, satırlar) ve on_exit(tutamaç) G/Ç thread'inde çağrılır,
+        bu yüzden hızlı ve bloklamayan olmalıdır.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._spawn(tag, command, on_lines, on_exit, shell, env), self.loop
+        )
+        return future.result(timeout)
+
+    async def _spawn(self, tag, command, on_lines, on_exit, shell, env):
+        kwargs = dict(
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            creationflags=CREATE_NO_WINDOW | CREATE_NEW_PROCESS_GROUP,
+        )
+        if sys.platform != "win32":
+            # Kendi oturumunda başlat: durdurma sinyali tüm süreç grubuna gider
+            kwargs["start_new_session"] = True
+        if shell:
+            proc = await asyncio.create_subprocess_shell(command, **kwargs)
+        else:
+            proc = await asyncio.create_subprocess_exec(*command, **kwargs)
+
+        handle = ManagedProcess(self, tag, proc)
+        reader = self.loop.create_task(self._pump(handle, proc.stdout, on_lines))
+        self.loop.create_task(self._watch(handle, proc, reader, on_exit))
+        return handle
+
+    async def _pump(self, handle, stream, on_lines):
+        """Süreç çıktısını EOF'a kadar (veya iptal edilene kadar) oku"""
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        partial = ""
+        try:
+            while True:
+                try:
+                    if partial:
+                        data = await asyncio.wait_for(
+                            stream.read(self.read_size), self.partial_line_timeout
+                        )
+                    else:
+                        data = await stream.read(self.read_size)
+                except asyncio.TimeoutError:
+                    # Yeni satır sonu gelmedi, yarım satırı bekletmeden teslim et
+                    on_lines(handle.tag, [partial.rstrip("\r")])
+                    partial = ""
+                    continue
+
+                if not data:
+                    break
+
+                text = partial + decoder.decode(data)
+                lines = text.split("\n")
+                partial = lines.pop()
+                if lines:
+                    on_lines(handle.tag, [line.rstrip("\r") for line in lines])
+        except Exception as e:
+            on_lines(handle.tag, [f"Çıktı okuma hatası: {e}"])
+        finally:
+            # İptalde de (boru alt süreçte açık kaldıysa) yarım satır kaybolmasın
+            partial += decoder.decode(b"", final=True)
+            if partial:
+                on_lines(handle.tag, [partial.rstrip("\r")])
+
+    async def _watch(self, handle, proc, reader, on_exit):
+        """Süreç çıkınca boru EOF'unu beklemeden çıkışı bildir
+
+        Sürecin bıraktığı alt süreçler (npx/cmd ile başlatılan n8n,
+        cloudflared) çıktı borusunu açık tutabilir. asyncio'nun wait()'i
+        borular kapanana kadar dönmediği için okuyucu sürerken çıkış kodu
+        kısa aralıklarla yoklanır. Süreç çıktıysa okuyucuya kalan çıktıyı
+        boşaltması için kısa bir süre tanınır, sonra iptal edilir ve boru
+        kapatılır.
+        """
+        while proc.returncode is None:
+            done, _ = await asyncio.wait({reader}, timeout=config.IO_EXIT_POLL_S)
+            if done:
+                # Normal durum: boru kapandı, çıkışı bekle
+                break
+        if proc.returncode is None:
+            returncode = await proc.wait()
+        else:
+            returncode = proc.returncode
+            done, _ = await asyncio.wait({reader}, timeout=config.IO_EXIT_DRAIN_S)
+            if not done:
+                reader.cancel()
+                await asyncio.wait({reader})
+                # Açık kalan boruyu bırak; aksi halde okunmayan çıktı tamponda birikir
+                transport = getattr(proc, "_transport", None)
+                if transport is not None:
+                    transport.close()
+        handle._mark_exited(returncode)
+        on_exit(handle)
+
+    def stop(self):
+        """Döngüyü durdur"""
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
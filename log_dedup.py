@@ -0,0 +1,120 @@
+"""
+n8n Tray - Tekrar Birleştirme
+Bu modül art arda gelen aynı (veya yalnızca sayıları değişen) log satırlarını tek özet kayda indirger.
+"""
+
+import re
+from datetime import datetime
+
+import config
+from log_parser import LogRecord
+
+
+# Kimlik benzeri parçalar ("id: 42", "#42", UUID) şablonda aynen kalır; yalnızca diğer sayılar "#" olur
+TEMPLATE_RE = re.compile(
+    r"(?P<id>(?:\bid\b|#)[\s:=\"']{0,3}\w+|\b[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}\b)|\d+",
+    re.IGNORECASE,
+)
+
+
+def _template_part(match):
+    return match.group(0) if match.group("id") else "#"
+
+
+def template_of(message):
+    """Kimlik olmayan sayıları "#" ile değiştirilmiş mesaj şablonu"""
+    return TEMPLATE_RE.sub(_template_part, message)
+
+
+class _Run:
+    """Bir servisin süren tekrar dizisi"""
+
+    __slots__ = ("message", "template", "fields", "level", "count", "first", "last", "last_message", "since")
+
+    def __init__(self, record):
+        self.message = record.message
+        self.fields = record.fields
+        self.template = None  # Gerekince hesaplanır
+        self.level = record.level
+        self.count = 0  # Son özetten beri bastırılan satır
+        self.first = None
+        self.last = None
+        self.last_message = None
+        self.since = record.time  # Son özetin (veya ilk satırın) zamanı
+
+
+class LogDeduplicator:
+    """Servis başına art arda tekrarlanan satırları bastırıp özet kayıt üreten sınıf
+
+    Dizinin ilk satırı olduğu gibi geçer; sonraki aynı veya yalnızca
+    sayıları farklı satırlar sayılır. Ayrıştırılmış alanları (yürütme,
+    iş akışı kimliği vb.) veya mesajdaki kimlik benzeri parçaları farklı
+    olan satırlar hiçbir zaman birleştirilmez; hata ayıklarken gereken
+    kimlikler görünümde kalır. Dizi bitince, dizi sürüyorsa da
+    summary_interval aralıklarla "N kez daha" özet kaydı (ilk/son zaman, son
+    örnek) üretilir. Böylece fırtına sırasında görünüme saniyede en fazla
+    bir özet satırı gider; tam satırlar günlük dosyasında kalır. Yalnızca
+    G/Ç thread'inde kullanılır.
+    """
+
+    def __init__(self, summary_interval=None):
+        self.summary_interval = summary_interval or config.LOG_DEDUP_SUMMARY_INTERVAL_S
+        self._runs = {}
+
+    def process(self, record):
+        """Kaydı işle; görünüme gidecek kayıtları (0, 1 veya 2) döndür"""
+        service = record.service
+        message = record.message
+        run = self._runs.get(service)
+        template = None
+        if run is not None and record.fields == run.fields:
+            if message != run.message:
+                if run.template is None:
+                    run.template = template_of(run.message)
+                template = template_of(message)
+            if template is None or template == run.template:
+                if run.count == 0:
+                    run.first = record.time
+                run.count += 1
+                run.last = record.time
+                run.last_message = message
+                return []
+
+        new_run = self._runs[service] = _Run(record)
+        new_run.template = template
+        summary = self._summary(service, run) if run is not None else None
+        return [summary, record] if summary is not None else [record]
+
+    @property
+    def pending(self):
+        """Özeti henüz yazılmamış tekrar var mı?"""
+        return any(run.count for run in self._runs.values())
+
+    def flush(self, now, service=None):
+        """Aralığı dolan (service verilirse o servisin) bekleyen özetlerini döndür"""
+        summaries = []
+        for name, run in list(self._runs.items()):
+            if service is not None:
+                if name != service:
+                    continue
+                self._runs.pop(name)
+            elif not run.count or now - run.since < self.summary_interval:
+                continue
+            summary = self._summary(name, run)
+            if summary is not None:
+                summaries.append(summary)
+            run.since = now
+        return summaries
+
+    def _summary(self, service, run):
+        if not run.count:
+            return None
+        count = run.count
+        first = datetime.fromtimestamp(run.first).strftime("%H:%M:%S")
+        last = datetime.fromtimestamp(run.last).strftime("%H:%M:%S")
+        text = f"[{service}] ↑ önceki satır {count} kez daha tekrarlandı ({first} - {last})"
+        if run.last_message != run.message:
+            text += f", son: {run.last_message}"
+        fields = {"repeat": count, "first": run.first, "last": run.last}
+        run.count = 0
+        return LogRecord(text, service, run.level, run.last, len(service) + 3, None, fields)
@@ -0,0 +1,174 @@
+"""
+n8n Tray - Log Dışa Aktarma
+Bu modül log satırlarını arka plan thread'inde parça parça dosyaya yazar (düz metin veya JSON satırları, isteğe bağlı gzip).
+"""
+
+import gzip
+import json
+import os
+import threading
+from PyQt5 import QtCore
+
+import config
+from log_search import classify_line
+
+
+EXPORT_FORMATS = ("text", "jsonl")
+
+
+class ExportSelection:
+    """Dışa aktarılacak satırları servis ve zaman aralığına göre seçen süzgeç"""
+
+    def __init__(self, service=None, start_ts=None, end_ts=None):
+        self.service = service
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+
+    def is_empty(self):
+        return self.service is None and self.start_ts is None and self.end_ts is None
+
+    def matches(self, service, ts):
+        if self.service is not None and service != self.service:
+            return False
+        if self.start_ts is None and self.end_ts is None:
+            return True
+        # Zamanı bilinmeyen satır (ilk kayıttan önceki düz satırlar) aralığa dahil edilmez
+        if ts is None:
+            return False
+        return (self.start_ts is None or ts >= self.start_ts) and (self.end_ts is None or ts <= self.end_ts)
+
+
+def describe(line, last_time=None):
+    """Satırın (zaman, servis, seviye, mesaj, alanlar) sözlüğü
+
+    Alımda (veya geçmiş penceresinde günlükten okunurken) ayrıştırılmış
+    kayıtlar bilgiyi zaten taşır. Zamanı olmayan satırlar önceki satırın
+    zamanını alır (satırlar zaman sırasındadır).
+    """
+    if getattr(line, "service", None) is not None:
+        record = line.to_dict()
+        if record["time"] is None:
+            record["time"] = last_time
+        return record
+
+    service, level = classify_line(line)
+    return {"time": last_time, "service": service, "level": level, "message": str(line), "fields": {}}
+
+
+def open_output(path, compress):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=config.EXPORT_GZIP_LEVEL)
+    return open(path, "w", encoding="utf-8")
+
+
+class LogExporter(QtCore.QObject):
+    """Modeldeki satırları arka plan thread'inde parça parça dosyaya yazan sınıf
+
+    Satırlar halka tampondan sıra numarasıyla, parça başına kısa süre kilit
+    tutularak okunur; GUI thread'i belgeyi kopyalamaz ve beklemez. Dosya
+    önce ".part" uzantısıyla yazılır, tamamlanınca yerine taşınır; iptal
+    veya hatada yarım dosya silinir. İptal LogSearchWorker gibi nesil
+    numarasıyla yapılır.
+
+    Thread biteceği ana kadar sinyal yayımlar; bu yüzden nesne kısa ömürlü
+    bir pencereye ebeveyn olarak bağlanmamalıdır (thread kendi referansını
+    tuttuğu için ebeveynsiz nesne iş bitene kadar yaşar).
+    """
+    progress = QtCore.pyqtSignal(int, int, int)  # nesil, işlenen satır, toplam satır
+    finished = QtCore.pyqtSignal(int, str, int, int)  # nesil, dosya yolu, yazılan satır, tampondan düşen satır
+    failed = QtCore.pyqtSignal(int, str)  # nesil, hata
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.generation = 0
+        self.running = False
+        self._thread = None
+        self.finished.connect(self._on_done)
+        self.failed.connect(self._on_done)
+
+    def start(self, path, fmt="text", compress=None, selection=None):
+        """Dışa aktarmayı başlat, öncekini iptal et; nesil numarasını döndür
+
+        compress verilmezse dosya adı ".gz" ile bitiyorsa sıkıştırılır.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"bilinmeyen biçim: {fmt}")
+        if compress is None:
+            compress = path.endswith(".gz")
+        self.generation += 1
+        self.running = True
+        generation = self.generation
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(generation, path, fmt, compress, selection or ExportSelection()),
+            daemon=True,
+        )
+        self._thread.start()
+        return generation
+
+    def cancel(self):
+        self.generation += 1
+        self.running = False
+
+    def wait(self, timeout=None):
+        """Süren thread'in bitmesini bekle; bittiyse True"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _on_done(self, generation, *args):
+        if generation == self.generation:
+            self.running = False
+
+    def _run(self, generation, path, fmt, compress, selection):
+        temp = path + ".part"
+        try:
+            with self.model.lock:
+                first = self.model.buffer.first_seq
+                last = self.model.buffer.next_seq
+            total = last - first
+            plain = fmt == "text" and selection.is_empty()
+            last_time = None
+            done = written = missed = 0
+            chunk_size = config.EXPORT_CHUNK_LINES
+
+            with open_output(temp, compress) as out:
+                for start in range(first, last, chunk_size):
+                    if generation != self.generation:
+                        break
+                    with self.model.lock:
+                        lines = self.model.lines_by_seq(range(start, min(start + chunk_size, last)))
+                    done += len(lines)
+
+                    output = []
+                    for line in lines:
+                        if line is None:
+                            # Dışa aktarma sürerken halka tampondan atıldı
+                            missed += 1
+                            continue
+                        if plain:
+                            output.append(line)
+                            continue
+                        record = describe(line, last_time)
+                        last_time = record["time"]
+                        if not selection.matches(record["service"], record["time"]):
+                            continue
+                        output.append(line if fmt == "text" else json.dumps(record, ensure_ascii=False))
+                    if output:
+                        out.write("\n".join(output) + "\n")
+                        written += len(output)
+                    self.progress.emit(generation, done, total)
+
+            if generation != self.generation:
+                os.remove(temp)
+                return
+            os.replace(temp, path)
+            self.finished.emit(generation, path, written, missed)
+        except Exception as e:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            self.failed.emit(generation, str(e))
@@ -0,0 +1,323 @@
+"""
+n8n Tray - Log Günlük Dosyaları
+Bu modül her servisin çıktısını boyuta göre döndürülen dosyalara arka planda yazar.
+"""
+
+import bisect
+import calendar
+import collections
+import os
+import threading
+import time
+from datetime import datetime
+
+import config
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP_LEN = 23  # "YYYY-MM-DD HH:MM:SS.mmm"
+
+
+def format_timestamp(ts):
+    """Epoch zamanını UTC günlük satırı önekine çevir (sözlük sırası = zaman sırası)
+
+    Yerel saat yaz saati geri alındığında bir saati tekrarlar; önek UTC
+    olduğu için bayt karşılaştırması her zaman zaman sırasını verir.
+    """
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(ts)) + f".{int(ts * 1000) % 1000:03d}"
+
+
+def parse_timestamp(text):
+    """UTC günlük satırı önekini epoch zamanına çevir"""
+    parsed = datetime.strptime(text[:TIMESTAMP_LEN], TIMESTAMP_FORMAT + ".%f")
+    return calendar.timegm(parsed.timetuple()) + parsed.microsecond / 1e6
+
+
+def display_timestamp(ts):
+    """Epoch zamanını gösterim için yerel saate çevir (günlük önekiyle aynı biçim)"""
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime(ts)) + f".{int(ts * 1000) % 1000:03d}"
+
+
+def split_line(line):
+    """Günlük satırını (epoch zamanı, metin) olarak ayır"""
+    return parse_timestamp(line), line[TIMESTAMP_LEN + 1:]
+
+
+class LogJournal:
+    """Tek bir servisin döndürülen günlük dosyası ve seyrek zaman dizini
+
+    Dosya satırları "YYYY-MM-DD HH:MM:SS.mmm metin" biçimindedir (UTC). Her
+    index_every bayt yazıldığında (zaman, dosya ofseti) çifti .idx dosyasına
+    eklenir; böylece bir zaman aralığı tüm dosya okunmadan bulunabilir.
+    Yazma işlemleri yalnızca JournalWriter thread'inde yapılır.
+
+    Dizin yazılamazken (disk dolu, izin) kuyruk max_pending satırda durur;
+    daha eski satırlar atılır ve on_drop("journal", sayı) ile bildirilir.
+    """
+
+    def __init__(self, directory, name, max_bytes=None, max_files=None, index_every=None,
+                 max_pending=None, on_drop=None):
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes or config.JOURNAL_MAX_BYTES
+        self.max_files = max_files or config.JOURNAL_MAX_FILES
+        self.index_every = index_every or config.JOURNAL_INDEX_EVERY_BYTES
+
+        self.on_drop = on_drop
+        self._pending = collections.deque(maxlen=max_pending or config.JOURNAL_MAX_PENDING_LINES)
+        self._file = None
+        self._index_file = None
+        self._size = 0
+        self._last_indexed = None
+        # Aktif dosyanın bellekteki dizini: sıralı zamanlar ve ofsetler
+        self._index_times = []
+        self._index_offsets = []
+        # Okuma ile döndürme aynı anda olmasın
+        self.lock = threading.Lock()
+
+    def path(self, generation=0):
+        """Dosya yolunu döndür (0 = aktif dosya, 1.. = eski dosyalar)"""
+        suffix = "" if generation == 0 else f".{generation}"
+        return os.path.join(self.directory, f"{self.name}{suffix}.log")
+
+    def append(self, text, ts=None):
+        """Satırı yazma kuyruğuna ekle (herhangi bir thread'den, bloklamaz)"""
+        pending = self._pending
+        full = len(pending) == pending.maxlen
+        # Dolu deque en eski satırı kendisi atar
+        pending.append((ts or time.time(), text))
+        if full and self.on_drop is not None:
+            self.on_drop("journal", 1)
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def _open(self):
+        """Aktif dosyayı aç ve dizinini yükle (çağıran self.lock'u tutar)
+
+        Dizin listeleri read_range ile aynı kilit altında değişir; aksi halde
+        okuyucu yeni zamanları eski ofsetlerle eşleyebilirdi.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path()
+        self._file = open(path, "ab", buffering=64 * 1024)
+        self._size = self._file.tell()
+        self._index_file = open(path + ".idx", "a", encoding="utf-8")
+        self._index_times, self._index_offsets = self._read_index(path)
+        self._last_indexed = self._index_offsets[-1] if self._index_offsets else None
+
+    @staticmethod
+    def _read_index(path):
+        times, offsets = [], []
+        try:
+            with open(path + ".idx", "r", encoding="utf-8") as f:
+                for entry in f:
+                    ts, _, offset = entry.rstrip("\n").partition("\t")
+                    if offset:
+                        times.append(float(ts))
+                        offsets.append(int(offset))
+        except OSError:
+            pass
+        return times, offsets
+
+    def _rotate(self):
+        """Aktif dosyayı .1'e kaydır, en eskisinin üzerine yaz"""
+        self._close_files()
+        with self.lock:
+            for generation in range(self.max_files, 0, -1):
+                src = self.path(generation - 1)
+                dst = self.path(generation)
+                for ext in ("", ".idx"):
+                    if os.path.exists(src + ext):
+                        os.replace(src + ext, dst + ext)
+            self._open()
+
+    def write_pending(self):
+        """Kuyruktaki satırları diske yaz (yalnızca yazıcı thread'inde)"""
+        if not self._pending:
+            return 0
+        if self._file is None:
+            with self.lock:
+                self._open()
+
+        written = 0
+        index_entries = []
+        while self._pending:
+            item = self._pending.popleft()
+            ts, text = item
+            data = f"{format_timestamp(ts)} {text}\n".encode("utf-8", "replace")
+
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._flush_index(index_entries)
+                index_entries = []
+                self._file.flush()
+                self._rotate()
+
+            if self._last_indexed is None or self._size - self._last_indexed >= self.index_every:
+                index_entries.append((ts, self._size))
+                self._last_indexed = self._size
+
+            try:
+                self._file.write(data)
+            except Exception:
+                # Yazılamayan satır bir sonraki denemeye kalsın
+                self._requeue(item)
+                raise
+            self._size += len(data)
+            written += 1
+
+        self._flush_index(index_entries)
+        self._file.flush()
+        return written
+
+    def _requeue(self, item):
+        if len(self._pending) == self._pending.maxlen and self.on_drop is not None:
+            # Dolu kuyrukta başa eklemek en yeni satırı atar
+            self.on_drop("journal", 1)
+        self._pending.appendleft(item)
+
+    def _flush_index(self, entries):
+        if not entries:
+            return
+        with self.lock:
+            for ts, offset in entries:
+                self._index_times.append(ts)
+                self._index_offsets.append(offset)
+        self._index_file.write("".join(f"{ts:.3f}\t{offset}\n" for ts, offset in entries))
+        self._index_file.flush()
+
+    def _close_files(self):
+        for f in (self._file, self._index_file):
+            if f:
+                try:
+                    f.close()
+                except OSError:
+                    pass
+        self._file = None
+        self._index_file = None
+
+    def close(self):
+        """Kalan satırları yaz ve dosyaları kapat"""
+        self.write_pending()
+        self._close_files()
+
+    def _segments(self):
+        """Mevcut dosyaları eskiden yeniye sırala"""
+        for generation in range(self.max_files, -1, -1):
+            path = self.path(generation)
+            if os.path.exists(path):
+                yield generation, path
+
+    def read_range(self, start_ts, end_ts, limit=None):
+        """[start_ts, end_ts] aralığındaki satırları seyrek dizinle okuyarak döndür
+
+        Her dosya için dizinden başlangıç zamanından önceki en yakın ofsete
+        atlanır; aralığın sonu geçildiğinde okuma durur.
+        """
+        start_key = format_timestamp(start_ts).encode("ascii")
+        end_key = format_timestamp(end_ts).encode("ascii")
+        result = []
+
+        # Okuma süresince döndürme bekler (Windows açık dosyayı taşıyamaz)
+        with self.lock:
+            for generation, path in self._segments():
+                if generation == 0 and self._index_times:
+                    times, offsets = self._index_times, self._index_offsets
+                else:
+                    times, offsets = self._read_index(path)
+
+                if times and times[0] > end_ts:
+                    continue
+                pos = bisect.bisect_right(times, start_ts) - 1
+                offset = offsets[pos] if pos >= 0 else 0
+
+                try:
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        for raw in f:
+                            key = raw[:TIMESTAMP_LEN]
+                            if key < start_key:
+                                continue
+                            if key > end_key:
+                                break
+                            result.append(raw.rstrip(b"\r\n").decode("utf-8", "replace"))
+                            if limit and len(result) >= limit:
+                                return result
+                except OSError:
+                    continue
+
+        return result
+
+
+class JournalWriter:
+    """Tüm servis günlüklerini tek arka plan thread'inden diske yazan sınıf
+
+    Yazamayan günlük için hata bir kez bildirilir ve yeniden deneme aralığı
+    her hatada iki katına çıkar (en fazla JOURNAL_RETRY_MAX_S); bu sürede
+    satırlar sınırlı kuyrukta bekler. Yazma yeniden başarılı olunca durum
+    bildirilir.
+    """
+
+    def __init__(self, directory=None, flush_interval=None, on_drop=None):
+        self.directory = directory or config.JOURNAL_DIR
+        self.flush_interval = flush_interval or config.JOURNAL_FLUSH_INTERVAL_S
+        self.on_drop = on_drop
+        self.journals = {}
+        self._failures = {}  # günlük adı -> (ardışık hata sayısı, yeniden deneme zamanı)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def journal(self, name):
+        """İsme ait günlüğü döndür (yoksa oluştur)"""
+        journal = self.journals.get(name)
+        if journal is None:
+            journal = self.journals.setdefault(name, LogJournal(self.directory, name, on_drop=self.on_drop))
+        return journal
+
+    def append(self, name, text, ts=None):
+        """Satırı servis günlüğüne ekle (bloklamaz)"""
+        self.journal(name).append(text, ts)
+
+    def flush(self):
+        """Yazıcı thread'ini hemen uyandır"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            for journal in list(self.journals.values()):
+                self._write(journal)
+
+    def _write(self, journal):
+        failure = self._failures.get(journal.name)
+        if failure is not None and time.monotonic() < failure[1]:
+            return
+        try:
+            journal.write_pending()
+        except Exception as e:
+            # Yarım kalan dosyalar bir sonraki denemede yeniden açılır
+            journal._close_files()
+            count = failure[0] + 1 if failure is not None else 1
+            delay = min(config.JOURNAL_RETRY_MAX_S, self.flush_interval * 2 ** count)
+            self._failures[journal.name] = (count, time.monotonic() + delay)
+            if count == 1:
+                print(f"Günlük dosyası yazma hatası ({journal.name}): {e}; "
+                      f"yeniden denenecek, bekleyen satırlar {journal._pending.maxlen} satırla sınırlı")
+            return
+        if failure is not None:
+            del self._failures[journal.name]
+            print(f"Günlük dosyası yeniden yazılabiliyor ({journal.name}), {failure[0]} hatadan sonra")
+
+    def close(self):
+        """Thread'i durdur ve tüm günlükleri kapat"""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout=2)
+        for journal in list(self.journals.values()):
+            try:
+                journal.close()
+            except Exception as e:
+                print(f"Günlük dosyası kapatma hatası ({journal.name}): {e}")
@@ -0,0 +1,221 @@
+"""
+n8n Tray - Log Modeli
+Bu modül sabit kapasiteli log halka tamponunu ve ona bağlı liste modelini içerir.
+"""
+
+import threading
+from PyQt5 import QtCore
+
+import config
+import styles
+from log_parser import record_size
+from log_search import LogIndex
+
+
+class LogRingBuffer:
+    """Satır sayısı ve bayt bütçesi ile sınırlı halka tampon
+
+    Her satır artan bir sıra numarası (seq) alır; en eski satırlar kapasite
+    veya bayt bütçesi aşıldığında baştan atılır. Bütçe metin uzunluğunu
+    değil kaydın bellekteki boyutunu (record_size) sayar. Satırlara erişim
+    O(1)'dir.
+    """
+
+    def __init__(self, max_lines=None, max_bytes=None):
+        self.max_lines = max_lines or config.LOG_MAX_LINES
+        self.max_bytes = max_bytes or config.LOG_MAX_BYTES
+        self._items = [None] * self.max_lines
+        self._sizes = [0] * self.max_lines
+        self._start = 0
+        self._count = 0
+        self._bytes = 0
+        self.first_seq = 0  # Tampondaki en eski satırın sıra numarası
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._items[(self._start + index) % self.max_lines]
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._items[(self._start + i) % self.max_lines]
+
+    def get_seq(self, seq):
+        """Sıra numarasıyla satırı döndür; atılmışsa None"""
+        index = seq - self.first_seq
+        if not 0 <= index < self._count:
+            return None
+        return self._items[(self._start + index) % self.max_lines]
+
+    @property
+    def next_seq(self):
+        """Bir sonraki eklenecek satırın sıra numarası"""
+        return self.first_seq + self._count
+
+    @property
+    def byte_size(self):
+        return self._bytes
+
+    def evictions_for(self, lines):
+        """Verilen satırlar eklenirse baştan atılacak satır sayısını hesapla
+
+        (atılacak, satır boyutları, tutulacak) üçlüsü döndürür. Bütçeyi tek
+        başına aşan bir partiden yalnızca sığan kuyruk tutulur.
+        """
+        sizes = [record_size(line) for line in lines]
+        keep = 0
+        total = 0
+        for size in reversed(sizes):
+            if keep >= self.max_lines or total + size > self.max_bytes:
+                break
+            total += size
+            keep += 1
+
+        if keep < len(lines):
+            # Atlanan satırlardan eski hiçbir satır tamponda kalmamalı
+            return self._count, sizes, keep
+
+        evict = 0
+        used = self._bytes
+        while evict < self._count and (
+            self._count - evict + keep > self.max_lines or used + total > self.max_bytes
+        ):
+            used -= self._sizes[(self._start + evict) % self.max_lines]
+            evict += 1
+        return evict, sizes, keep
+
+    def extend(self, lines, plan=None):
+        """Satırları ekle; (atılan satır sayısı, eklenen satır sayısı) döndür"""
+        evict, sizes, keep = plan or self.evictions_for(lines)
+        skipped = len(lines) - keep
+        self.drop_front(evict)
+
+        # Tampona hiç girmeyen satırlar da sıra numarası tüketir
+        self.first_seq += skipped
+        for line, size in zip(lines[skipped:], sizes[skipped:]):
+            pos = (self._start + self._count) % self.max_lines
+            self._items[pos] = line
+            self._sizes[pos] = size
+            self._bytes += size
+            self._count += 1
+        return evict, keep
+
+    def drop_front(self, count):
+        """Baştan count satırı at"""
+        for _ in range(min(count, self._count)):
+            pos = self._start
+            self._bytes -= self._sizes[pos]
+            self._items[pos] = None
+            self._sizes[pos] = 0
+            self._start = (self._start + 1) % self.max_lines
+            self._count -= 1
+            self.first_seq += 1
+
+    def clear(self):
+        """Tamponu boşalt (sıra numaraları devam eder)"""
+        self.first_seq += self._count
+        self._items = [None] * self.max_lines
+        self._sizes = [0] * self.max_lines
+        self._start = 0
+        self._count = 0
+        self._bytes = 0
+
+
+class LogListModel(QtCore.QAbstractListModel):
+    """Halka tamponu sanal liste görünümüne açan model
+
+    Görünüm yalnızca görünen satırlar için data() çağırır; bu sayede çizim
+    maliyeti toplam geçmişe değil ekrandaki satır sayısına bağlıdır.
+    """
+
+    def __init__(self, max_lines=None, max_bytes=None, parent=None, indexed=False):
+        super().__init__(parent)
+        self.buffer = LogRingBuffer(max_lines, max_bytes)
+        # Arama dizini isteğe bağlıdır; tampon ile birlikte kilit altında güncellenir
+        self.index = LogIndex() if indexed else None
+        self.lock = threading.Lock()
+        # QtGui yalnızca görünüm modeli oluşturulunca yüklenir (daemon modu tamponu kullanır)
+        from PyQt5 import QtGui
+        self._level_colors = {
+            level: QtGui.QColor(color) for level, color in styles.LOG_LEVEL_COLORS.items()
+        }
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.buffer)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self.buffer[index.row()]
+        if role == QtCore.Qt.ForegroundRole:
+            # Alımda ayrıştırılmış seviye; geçmişten yüklenen düz satırlarda yok
+            return self._level_colors.get(getattr(self.buffer[index.row()], "level", None))
+        if role == QtCore.Qt.ToolTipRole:
+            line = self.buffer[index.row()]
+            fields = getattr(line, "fields", None)
+            if fields:
+                return line + "\n\n" + "\n".join(f"{key}: {value}" for key, value in fields.items())
+            return line
+        return None
+
+    def append_lines(self, lines):
+        """Satırları toplu ekle (GUI thread'inde çağrılmalı); sığmayıp atlanan satır sayısını döndür"""
+        if not lines:
+            return 0
+        plan = self.buffer.evictions_for(lines)
+        evict, _, keep = plan
+
+        if evict:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, evict - 1)
+            with self.lock:
+                self.buffer.drop_front(evict)
+            self.endRemoveRows()
+            plan = (0, plan[1], keep)
+
+        first = len(self.buffer)
+        if keep:
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + keep - 1)
+        with self.lock:
+            self.buffer.extend(lines, plan)
+            if self.index is not None:
+                self.index.evict_to(self.buffer.first_seq)
+                base = self.buffer.next_seq - keep
+                for offset, line in enumerate(lines[len(lines) - keep:]):
+                    self.index.add(base + offset, line)
+        if keep:
+            self.endInsertRows()
+        return len(lines) - keep
+
+    def append(self, line):
+        """Tek satır ekle"""
+        self.append_lines([line])
+
+    def clear(self):
+        """Tüm satırları temizle"""
+        self.beginResetModel()
+        with self.lock:
+            self.buffer.clear()
+            if self.index is not None:
+                self.index.clear(self.buffer.first_seq)
+        self.endResetModel()
+
+    def lines_by_seq(self, seqs):
+        """Sıra numaralarına karşılık gelen satırlar (kilit çağıran tarafından tutulmalı)"""
+        get = self.buffer.get_seq
+        return [get(seq) for seq in seqs]
+
+    def lines(self):
+        """Tampondaki satırları sırayla döndür"""
+        return list(self.buffer)
+
+    def to_plain_text(self):
+        """Tüm içeriği düz metin olarak döndür"""
+        return "\n".join(self.buffer)
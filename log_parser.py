@@ -0,0 +1,281 @@
+"""
+n8n Tray - Log Ayrıştırıcı
+Bu modül süreç çıktısını alım anında bir kez ayrıştırıp yapılandırılmış log kayıtlarına dönüştürür.
+
+Ayrıştırma maliyetini ölçmek için:
+    python log_parser.py --lines 200000
+"""
+
+import json
+import re
+import sys
+import time
+
+from log_search import LEVEL_ALIASES, detect_level
+
+
+# cloudflared: "2024-01-15T10:00:00Z INF Registered tunnel connection connIndex=0 ..."
+CLOUDFLARED_RE = re.compile(r"\d{4}-\d\d-\d\dT[\d:.]+Z (INF|ERR|WRN|DBG|FTL|TRC) ")
+CLOUDFLARED_LEVELS = {
+    "INF": "INFO", "ERR": "ERROR", "WRN": "WARN", "DBG": "DEBUG", "FTL": "ERROR", "TRC": "DEBUG",
+}
+# cloudflared anahtar=değer alanları (tırnaklı değerler boşluk içerebilir)
+KEY_VALUE_RE = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|\S+)')
+CLOUDFLARED_KEYS = frozenset(("connIndex", "location", "ip", "protocol", "error", "event"))
+TUNNEL_EVENTS = (
+    ("Registered tunnel connection", "connected"),
+    ("Unregistered tunnel connection", "disconnected"),
+    ("Connection terminated", "disconnected"),
+    ("Lost connection", "disconnected"),
+)
+
+# n8n metin biçimi: "2024-01-15T10:00:00.000Z | info | mesaj" (ayraçlar isteğe bağlı)
+# (küçük harfe çevrilmiş metinde eşleştirilir)
+N8N_TEXT_RE = re.compile(r"\d{4}-\d\d-\d\dt[\d:.]+z?\s+(?:\|\s*)?(error|warn|info|debug|verbose)\s*(?:\|\s*)?")
+# n8n mesajlarındaki iş akışı ve yürütme kimlikleri ("Execution 12", "workflowId: 'abc'");
+# anahtar kelimenin bulunduğu konumda match() ile denenir, satır baştan taranmaz
+WORKFLOW_RE = re.compile(r"(?:Id|_id|\s+ID)?[\"']?\s*[:=]\s*[\"']?([\w-]+)", re.IGNORECASE)
+EXECUTION_RE = re.compile(r"(?:Id|_id|\s+ID)?[\"']?\s*[:=]?\s*[\"']?(\d+)", re.IGNORECASE)
+N8N_KEY_FIELDS = (("workflow", WORKFLOW_RE), ("execution", EXECUTION_RE))
+
+
+class LogRecord(str):
+    """Görüntü metnini ve ayrıştırılmış alanları birlikte taşıyan log satırı
+
+    str alt sınıfı olduğu için halka tampon, görünüm, arama ve kontrol
+    kanalı metni olduğu gibi kullanır; ayrıştırılmış alanlar ise
+    classify_line, görünüm renkleri ve metrikler tarafından tekrar
+    ayrıştırmadan okunur. message metnin [start:end] dilimidir (ayrıca
+    saklanmaz). fields yalnızca anahtar alan bulunduysa sözlüktür.
+
+    CPython str alt sınıflarında __slots__ desteklemez; alanlar örnek
+    sözlüğünde durur. Bellek bütçeleri bu yüzden record_size() kullanır.
+    """
+
+    def __new__(cls, text, service, level, ts, start=0, end=None, fields=None):
+        record = str.__new__(cls, text)
+        record.service = service
+        record.level = level
+        record.time = ts
+        record.start = start
+        record.end = end
+        record.fields = fields
+        return record
+
+    @property
+    def message(self):
+        return self[self.start:self.end]
+
+    def to_dict(self):
+        return {
+            "time": self.time,
+            "service": self.service,
+            "level": self.level,
+            "message": self.message,
+            "fields": self.fields or {},
+        }
+
+
+# Kayıtların örnek sözlüğü hep aynı anahtarları taşır; boyutu bir kez ölçülür
+RECORD_DICT_SIZE = sys.getsizeof(LogRecord("", "", "INFO", 0.0).__dict__)
+
+
+def record_size(line):
+    """Satırın bellekteki yaklaşık boyutu: nesne, örnek sözlüğü ve alanlar"""
+    if type(line) is not LogRecord:
+        return sys.getsizeof(line)
+    fields = line.fields
+    return sys.getsizeof(line) + RECORD_DICT_SIZE + (sys.getsizeof(fields) if fields else 0)
+
+
+def parse_cloudflared(message):
+    """(seviye, mesaj başlangıcı, mesaj sonu, alanlar)"""
+    match = CLOUDFLARED_RE.match(message)
+    if match is None:
+        return detect_level(message.lower()), 0, None, None
+    start = match.end()
+    fields = None
+    if "=" in message:
+        if '"' in message:
+            pairs = KEY_VALUE_RE.findall(message, start)
+        else:
+            # Tırnaksız satırlarda regex yerine bölme yeterli (ve çok daha hızlı)
+            pairs = [token.partition("=")[::2] for token in message[start:].split(" ") if "=" in token]
+        fields = {key: value.strip('"') for key, value in pairs if key in CLOUDFLARED_KEYS} or None
+    for prefix, event in TUNNEL_EVENTS:
+        if message.startswith(prefix, start):
+            fields = {**(fields or {}), "tunnel": event}
+            break
+    return CLOUDFLARED_LEVELS[match.group(1)], start, None, fields
+
+
+def parse_n8n(message):
+    """(seviye, mesaj başlangıcı, mesaj sonu, alanlar); JSON (N8N_LOG_FORMAT=json) ve metin biçimleri"""
+    first = message[:1]
+    if first == "{":
+        try:
+            data = json.loads(message)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            level = LEVEL_ALIASES.get(str(data.get("level", "")).lower(), "INFO")
+            metadata = data.get("metadata") if isinstance(data.get("metadata"), dict) else data
+            fields = {}
+            for key, name in (("workflowId", "workflow"), ("executionId", "execution")):
+                if metadata.get(key) is not None:
+                    fields[name] = str(metadata[key])
+            # Kaçış karakteri içermeyen mesaj ham satırda aynen geçer
+            text = data.get("message")
+            start = message.find(text) if isinstance(text, str) and text else -1
+            if start < 0:
+                return level, 0, None, fields or None
+            return level, start, start + len(text), fields or None
+
+    lowered = message.lower()
+    level, start = None, 0
+    if first.isdigit():
+        match = N8N_TEXT_RE.match(lowered)
+        if match is not None:
+            level, start = LEVEL_ALIASES[match.group(1)], match.end()
+    if level is None:
+        level = detect_level(lowered)
+
+    fields = None
+    for name, pattern in N8N_KEY_FIELDS:
+        position = lowered.find(name, start)
+        while position >= 0:
+            match = pattern.match(message, position + len(name))
+            if match is not None and (position == 0 or not lowered[position - 1].isalnum()):
+                fields = {**(fields or {}), name: match.group(1)}
+                break
+            position = lowered.find(name, position + len(name))
+    return level, start, None, fields
+
+
+def parse_generic(message):
+    return detect_level(message.lower()), 0, None, None
+
+
+class LogParser:
+    """Servis etiketine göre uygun ayrıştırıcıyı seçip kayıt üreten sınıf
+
+    G/Ç thread'inde çalışır. Tünel bağlantı olaylarından güncel bağlantı
+    sayısını da izler (metrikler için).
+    """
+
+    def __init__(self):
+        self._parsers = {}
+        self.tunnel_connections = {}  # servis -> bağlı connIndex kümesi
+
+    def parser_for(self, service):
+        parser = self._parsers.get(service)
+        if parser is None:
+            if service == "CF":
+                parser = parse_cloudflared
+            elif service.startswith("n8n"):
+                parser = parse_n8n
+            else:
+                parser = parse_generic
+            self._parsers[service] = parser
+        return parser
+
+    def parse(self, service, message, ts=None):
+        """Süreç satırını "[servis] mesaj" metinli kayda dönüştür"""
+        level, start, end, fields = self.parser_for(service)(message)
+        prefix = len(service) + 3
+        if fields is not None and "tunnel" in fields:
+            self._track_tunnel(service, fields)
+        return LogRecord(
+            f"[{service}] {message}", service, level, ts,
+            start + prefix, None if end is None else end + prefix, fields,
+        )
+
+    def journal_record(self, service, message, ts, stamp):
+        """Günlük dosyasından okunan satır: "zaman mesaj" metinli, servis ayrıştırıcısıyla çözülmüş kayıt
+
+        stamp gösterilecek (yerel) zaman önekidir; tünel durumu izlenmez.
+        """
+        level, start, end, fields = self.parser_for(service)(message)
+        prefix = len(stamp) + 1
+        return LogRecord(
+            f"{stamp} {message}", service, level, ts,
+            start + prefix, None if end is None else end + prefix, fields,
+        )
+
+    def event_record(self, service, message, level, ts):
+        """Uygulamanın servis adına ürettiği olay (ör. çökme): "[servis] mesaj" metinli kayıt"""
+        return LogRecord(f"[{service}] {message}", service, level, ts, len(service) + 3)
+
+    def tray_record(self, text, ts):
+        """Uygulama mesajı: "[SS:DD:ss] mesaj" metinli kayıt"""
+        from datetime import datetime
+        timestamp = datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+        return LogRecord(f"[{timestamp}] {text}", "tray", detect_level(text.lower()), ts, 11)
+
+    def _track_tunnel(self, service, fields):
+        connections = self.tunnel_connections.setdefault(service, set())
+        index = fields.get("connIndex", "")
+        if fields["tunnel"] == "connected":
+            connections.add(index)
+        else:
+            connections.discard(index)
+
+    def reset(self, service):
+        """Süreç kapandığında servisin bağlantı durumunu sıfırla"""
+        self.tunnel_connections.pop(service, None)
+
+
+SAMPLE_LINES = {
+    "CF": [
+        "2024-01-15T10:00:00Z INF Registered tunnel connection connIndex=0 "
+        "connection=5f2c1a9e-0000-4000-8000-000000000000 event=0 ip=198.41.200.13 location=fra08 protocol=quic",
+        '2024-01-15T10:00:05Z ERR Failed to serve quic connection error="timeout: no recent network activity" '
+        "connIndex=1 event=0 ip=198.41.192.7",
+        "2024-01-15T10:00:06Z WRN Retrying connection in up to 2s connIndex=1 event=0 ip=198.41.192.7",
+    ],
+    "n8n": [
+        "Editor is now accessible via:",
+        "Execution 4821 of workflow \"Daily report\" finished",
+        "2024-01-15T10:00:00.000Z | error | Problem with execution 4822: Request failed "
+        "{ workflowId: 'Q2mF1b8RzX', executionId: '4822' }",
+        '{"level":"info","message":"Workflow execution finished","timestamp":"2024-01-15T10:00:00.000Z",'
+        '"metadata":{"workflowId":"Q2mF1b8RzX","executionId":"4823"}}',
+    ],
+}
+
+
+def benchmark(lines=200000):
+    """Satır başına ayrıştırma maliyetini ölç: {servis: (ns/satır, satır/sn)}"""
+    parser = LogParser()
+    results = {}
+    for service, samples in SAMPLE_LINES.items():
+        batch = (samples * (lines // len(samples) + 1))[:lines]
+        now = time.time()
+        started = time.perf_counter()
+        for line in batch:
+            parser.parse(service, line, now)
+        elapsed = time.perf_counter() - started
+        results[service] = (elapsed / lines * 1e9, lines / elapsed)
+
+    # Karşılaştırma: yalnızca mevcut metin önekini oluşturmak
+    batch = SAMPLE_LINES["n8n"] * (lines // len(SAMPLE_LINES["n8n"]))
+    started = time.perf_counter()
+    for line in batch:
+        f"[n8n] {line}"
+    elapsed = time.perf_counter() - started
+    results["önek (temel)"] = (elapsed / len(batch) * 1e9, len(batch) / elapsed)
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Log ayrıştırma mikro ölçümü")
+    parser.add_argument("--lines", type=int, default=200000)
+    args = parser.parse_args(argv)
+    for service, (ns_per_line, per_second) in benchmark(args.lines).items():
+        print(f"{service:<14} {ns_per_line:8.0f} ns/satır {per_second:12,.0f} satır/sn")
+
+
+if __name__ == "__main__":
+    main()
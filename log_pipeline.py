@@ -0,0 +1,200 @@
+"""
+n8n Tray - Log Hattı
+Bu modül okuyucu thread'lerden gelen log satırlarını sınırlı bir kuyrukta tamponlayıp GUI'ye toplu halde iletir.
+"""
+
+import collections
+import json
+import tempfile
+import threading
+from PyQt5 import QtCore
+
+import config
+from tracing import tracer
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "sample", "spill")
+
+
+class SpillFile:
+    """Kuyruk dolduğunda taşan satırları sırayla tutan geçici dosya
+
+    Satırlar kayıt alanlarıyla birlikte JSON satırı olarak yazılır ve geri
+    okunurken kayda dönüştürülür. Yazmalar bellekte toplanıp parça parça
+    diske aktarılır. Dosya kapanınca işletim sistemi tarafından silinir.
+    Çağıran kilidi tutmalıdır.
+    """
+
+    WRITE_CHUNK = 1000
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes or config.LOG_SPILL_MAX_BYTES
+        self._file = None
+        self._pending = []
+        self._read_pos = 0
+        self._write_pos = 0
+        self.count = 0  # Dosyada (veya yazılmayı bekleyen) satır sayısı
+
+    def __len__(self):
+        return self.count
+
+    def write(self, line):
+        """Satırı ekle; bayt sınırı aşıldıysa False döndür"""
+        if self._write_pos - self._read_pos > self.max_bytes:
+            return False
+        if getattr(line, "service", None) is not None:
+            item = [str(line), line.service, line.level, line.time, line.start, line.end, line.fields]
+        else:
+            item = [str(line)]
+        self._pending.append(json.dumps(item, ensure_ascii=False))
+        self.count += 1
+        if len(self._pending) >= self.WRITE_CHUNK:
+            self._write_pending()
+        return True
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="n8n-tray-spill-")
+        data = ("\n".join(self._pending) + "\n").encode("utf-8")
+        self._file.seek(self._write_pos)
+        self._file.write(data)
+        self._write_pos += len(data)
+        self._pending = []
+
+    def read(self, count):
+        """En eski count satırı sırayla geri oku"""
+        from log_parser import LogRecord
+        self._write_pending()
+        lines = []
+        if self._file is None:
+            return lines
+        self._file.seek(self._read_pos)
+        while len(lines) < count and self._read_pos < self._write_pos:
+            raw = self._file.readline()
+            self._read_pos += len(raw)
+            item = json.loads(raw)
+            lines.append(LogRecord(*item) if len(item) > 1 else item[0])
+        self.count -= len(lines)
+        if not self.count:
+            # Boşaldı: dosyayı baştan kullan
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_pos = self._write_pos = 0
+        return lines
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LogBatcher(QtCore.QObject):
+    """Log satırlarını sınırlı kuyrukta biriktirip zamanlayıcı ile toplu teslim eden sınıf
+
+    push() herhangi bir thread'den çağrılabilir ve hiçbir zaman beklemez;
+    böylece G/Ç thread'i alt süreçlerin borularını her koşulda boşaltır.
+    Tampon boşken gelen ilk satır GUI thread'ine tek bir uyandırma sinyali
+    gönderir; sonraki satırlar sinyal üretmeden tampona eklenir. GUI
+    thread'i flush aralığı dolunca en fazla max_batch satırı tek listede
+    batch_ready ile yayımlar.
+
+    GUI takılırsa kuyruk max_pending satırda durur ve taşma politikası
+    uygulanır: "drop_oldest" en eski satırı atar, "sample" dolu kaldıkça
+    her sample_every satırdan birini tutar, "spill" taşan satırları geçici
+    dosyaya yazar ve GUI yetiştikçe sırayla geri okur. Atılan satırlar
+    on_drop(aşama, sayı) ile bildirilir.
+    """
+    batch_ready = QtCore.pyqtSignal(list)
+    _wake = QtCore.pyqtSignal()
+
+    def __init__(self, flush_interval_ms=None, max_batch=None, max_pending=None,
+                 overflow_policy=None, sample_every=None, on_drop=None, parent=None):
+        super().__init__(parent)
+        self.flush_interval_ms = flush_interval_ms or config.LOG_FLUSH_INTERVAL_MS
+        self.max_batch = max_batch or config.LOG_MAX_BATCH
+        self.max_pending = max_pending or config.LOG_QUEUE_MAX_LINES
+        self.overflow_policy = overflow_policy or config.LOG_OVERFLOW_POLICY
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"bilinmeyen taşma politikası: {self.overflow_policy}")
+        self.sample_every = sample_every or config.LOG_OVERFLOW_SAMPLE_EVERY
+        self.on_drop = on_drop
+
+        self._buffer = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._overflow_seen = 0
+        self._spill = SpillFile() if self.overflow_policy == "spill" else None
+
+        # Zamanlayıcı bu nesnenin thread'inde (GUI) çalışır
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self._schedule, QtCore.Qt.QueuedConnection)
+
+    @property
+    def pending(self):
+        """Teslim bekleyen satırlar (bellek + taşma dosyası)"""
+        with self._lock:
+            return len(self._buffer) + (len(self._spill) if self._spill is not None else 0)
+
+    def push(self, line):
+        """Satırı tampona ekle (thread güvenli, beklemez)"""
+        dropped = None
+        with self._lock:
+            if len(self._buffer) < self.max_pending and not self._spill:
+                self._buffer.append(line)
+            else:
+                dropped = self._overflow(line)
+            if not self._scheduled:
+                self._scheduled = True
+                wake = True
+            else:
+                wake = False
+        if dropped and self.on_drop is not None:
+            self.on_drop(dropped, 1)
+        if wake:
+            self._wake.emit()
+
+    def _overflow(self, line):
+        """Kuyruk doluyken politikayı uygula; atıldıysa aşama adını döndür (kilit tutulur)"""
+        if self._spill is not None:
+            # Sıra korunsun diye dosya boşalana kadar tüm satırlar dosyaya gider
+            return None if self._spill.write(line) else "spill"
+        if self.overflow_policy == "sample":
+            self._overflow_seen += 1
+            if self._overflow_seen % self.sample_every:
+                return "queue"
+        self._buffer.popleft()
+        self._buffer.append(line)
+        return "queue"
+
+    def _schedule(self):
+        """Flush zamanlayıcısını kur (GUI thread'inde)"""
+        if not self._timer.isActive():
+            self._timer.start(self.flush_interval_ms)
+
+    def flush(self):
+        """Tampondaki satırları tek parti halinde yayımla"""
+        with self._lock:
+            count = min(len(self._buffer), self.max_batch)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            if self._spill and len(self._buffer) < self.max_pending // 2:
+                # GUI yetişiyor: taşma dosyasından sırayla geri al
+                self._buffer.extend(self._spill.read(self.max_batch))
+            if self._buffer:
+                # Kalan satırlar bir sonraki tura kalır
+                self._timer.start(self.flush_interval_ms)
+            else:
+                self._scheduled = False
+                self._overflow_seen = 0
+
+        if batch:
+            with tracer.span("log_flush", "gui", lines=len(batch)):
+                self.batch_ready.emit(batch)
+
+    def close(self):
+        if self._spill is not None:
+            with self._lock:
+                self._spill.close()
@@ -0,0 +1,317 @@
+"""
+n8n Tray - Log Arama
+Bu modül log satırları için artımlı dizini ve arka plan filtreleme işçisini içerir.
+"""
+
+import bisect
+import re
+import threading
+from array import array
+from PyQt5 import QtCore
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+WORD_RE = re.compile(r"\w\w+")
+# Küçük harfe çevrilmiş metinde aranır (IGNORECASE'li aramadan belirgin şekilde hızlı)
+LEVEL_RE = re.compile(r"\b(fatal|error|err|warning|warn|wrn|info|inf|debug|dbg|verbose)\b")
+LEVEL_ALIASES = {
+    "fatal": "ERROR", "error": "ERROR", "err": "ERROR",
+    "warning": "WARN", "warn": "WARN", "wrn": "WARN",
+    "info": "INFO", "inf": "INFO",
+    "debug": "DEBUG", "dbg": "DEBUG", "verbose": "DEBUG",
+}
+LEVELS = ("ERROR", "WARN", "INFO", "DEBUG")
+
+# Bu kadar satır atıldıktan sonra dizin listeleri budanır
+COMPACT_EVERY = 10000
+
+
+def detect_level(lowered):
+    """Küçük harfli metindeki ilk seviye kelimesi; yoksa INFO"""
+    match = LEVEL_RE.search(lowered)
+    return LEVEL_ALIASES[match.group(1)] if match else "INFO"
+
+
+def classify_line(line):
+    """Satırın etiketini ve seviyesini çıkar: (servis adı | "tray", seviye)
+
+    Süreç satırları "[servis] ..." biçimindedir; uygulama satırları
+    "[SS:DD:ss] ..." zaman damgası ile başlar. Alımda ayrıştırılmış
+    kayıtlar (log_parser.LogRecord) bu bilgiyi zaten taşır.
+    """
+    service = getattr(line, "service", None)
+    if service is not None:
+        return service, line.level
+    tag = "tray"
+    if line.startswith("["):
+        end = line.find("]", 1, 64)
+        if end > 1 and not line[1].isdigit():
+            tag = line[1:end]
+    return tag, detect_level(line.lower())
+
+
+def index_words(text):
+    """Dizine girecek kelimeler (tek karakterlik ve yalnızca rakamdan oluşanlar hariç)"""
+    return {w for w in WORD_RE.findall(text.lower()) if not w.isdigit()}
+
+
+def required_literals(pattern, flags=0):
+    """Regex'in her eşleşmesinde mutlaka geçen düz metin parçalarını bul
+
+    Yalnızca en üst seviyedeki ardışık LITERAL düğümleri dikkate alınır;
+    dallanma veya tekrar içeren kısımlar parçayı böler. Sonuç boş olabilir.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return []
+
+    literals, current = [], []
+    for op, value in parsed:
+        if op == sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        if current:
+            literals.append("".join(current))
+            current = []
+    if current:
+        literals.append("".join(current))
+    return literals
+
+
+class LogQuery:
+    """Kullanıcı filtresi: metin (alt dize veya regex), etiket ve seviye"""
+
+    def __init__(self, text="", regex=False, tag=None, level=None):
+        self.text = text
+        self.regex = regex
+        self.tag = tag
+        self.level = level
+        self.pattern = None
+        if text and regex:
+            self.pattern = re.compile(text, re.IGNORECASE)
+        self._needle = text.lower()
+
+    def is_empty(self):
+        return not self.text and not self.tag and not self.level
+
+    def tokens(self):
+        """Dizin ile aday satır bulmak için kullanılacak kelimeler"""
+        if not self.text:
+            return []
+        if self.regex:
+            source = " ".join(required_literals(self.text))
+        else:
+            source = self.text
+        return sorted(index_words(source))
+
+    def matches(self, line):
+        """Satır filtreye uyuyor mu?"""
+        if self.tag or self.level:
+            tag, level = classify_line(line)
+            if self.tag and tag != self.tag:
+                return False
+            if self.level and level != self.level:
+                return False
+        if not self.text:
+            return True
+        if self.pattern is not None:
+            return self.pattern.search(line) is not None
+        return self._needle in line.lower()
+
+
+class LogIndex:
+    """Satırlar eklendikçe güncellenen ters dizin
+
+    Kelime, etiket ve seviye başına artan sıra numarası (seq) listeleri
+    tutulur. Alt dize aramalarında sorgu kelimelerini içeren sözlük
+    kelimelerinin listeleri birleştirilir; böylece metin yeniden taranmadan
+    aday satırlar bulunur ve yalnızca adaylar doğrulanır. Sorgular model
+    kilidi dışında, view() ile alınan görünüm üzerinden çözülür.
+    """
+
+    def __init__(self):
+        self._words = {}
+        self._vocab = []  # Sözlük kelimeleri eklenme sırasıyla (yalnızca sona eklenir)
+        self._tags = {}
+        self._levels = {}
+        self.first_seq = 0
+        self._evicted = 0
+
+    def add(self, seq, line):
+        """Satırı dizine ekle"""
+        tag, level = classify_line(line)
+        self._tags.setdefault(tag, array("q")).append(seq)
+        self._levels.setdefault(level, array("q")).append(seq)
+        words = self._words
+        for word in index_words(line):
+            postings = words.get(word)
+            if postings is None:
+                postings = words[word] = array("q")
+                self._vocab.append(word)
+            postings.append(seq)
+
+    def evict_to(self, first_seq):
+        """first_seq'ten eski satırları geçersiz say; ara sıra listeleri buda"""
+        self._evicted += first_seq - self.first_seq
+        self.first_seq = first_seq
+        if self._evicted >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Atılmış satırlara ait kayıtları sil"""
+        for table in (self._words, self._tags, self._levels):
+            for key in list(table):
+                postings = table[key]
+                cut = bisect.bisect_left(postings, self.first_seq)
+                if cut >= len(postings):
+                    del table[key]
+                elif cut:
+                    del postings[:cut]
+        # Yeni liste: süren aramaların görünümündeki eski liste değişmez
+        self._vocab = list(self._words)
+        self._evicted = 0
+
+    def clear(self, first_seq):
+        self._words = {}
+        self._vocab = []
+        self._tags = {}
+        self._levels = {}
+        self.first_seq = first_seq
+        self._evicted = 0
+
+    def view(self):
+        """Kilitsiz sorgulanabilen görünüm (model kilidi altında çağrılır, O(1))"""
+        return LogIndexView(self)
+
+    def candidates(self, query):
+        """Sorguya uyabilecek satırların sıralı seq listesi; None = tüm satırlar"""
+        return self.view().candidates(query)
+
+
+class LogIndexView:
+    """LogIndex'in o anki tablolarına referans tutan, kilit dışında sorgulanan görünüm
+
+    Alım thread'i tablolara yalnızca ekleme yapar; budama listeleri baştan
+    kısaltır ve kelime listesini yenisiyle değiştirir, clear() tüm tabloları
+    yenileriyle değiştirir. Görünüm listeleri kullanmadan önce tek dilimleme
+    ile kopyalar (GIL altında bölünmez), kelime listesinin de yalnızca
+    görünüm alındığı andaki uzunluğunu okur. Böylece sözlük taraması ve
+    küme işlemleri kilit tutulmadan yapılır; sonradan eklenen veya atılan
+    satırlar çağıranın seq aralığı ve satır doğrulaması ile elenir.
+    """
+
+    def __init__(self, index):
+        self.first_seq = index.first_seq
+        self._words = index._words
+        self._vocab = index._vocab
+        self._vocab_len = len(index._vocab)
+        self._tags = index._tags
+        self._levels = index._levels
+
+    def _live(self, postings):
+        postings = postings[:]
+        return postings[bisect.bisect_left(postings, self.first_seq):]
+
+    def _postings(self, table, key):
+        postings = table.get(key)
+        return self._live(postings) if postings is not None else ()
+
+    def candidates(self, query):
+        """Sorguya uyabilecek satırların sıralı seq listesi; None = tüm satırlar"""
+        groups = []
+        if query.tag:
+            groups.append(set(self._postings(self._tags, query.tag)))
+        if query.level:
+            groups.append(set(self._postings(self._levels, query.level)))
+
+        tokens = query.tokens()
+        vocab = self._vocab[:self._vocab_len] if tokens else ()
+        for token in tokens:
+            matched = set()
+            for word in vocab:
+                if token in word:
+                    matched.update(self._postings(self._words, word))
+            groups.append(matched)
+
+        if not groups:
+            return None
+        groups.sort(key=len)
+        result = groups[0]
+        for group in groups[1:]:
+            if not result:
+                break
+            result = result.intersection(group)
+        return sorted(result)
+
+
+class LogSearchWorker(QtCore.QObject):
+    """Filtreyi arka plan thread'inde çalıştırıp sonuçları parça parça yayımlayan sınıf
+
+    Her start() çağrısı yeni bir nesil numarası alır; eski nesle ait
+    thread'ler bir sonraki parçada bunu görüp durur.
+    """
+    results = QtCore.pyqtSignal(int, list)  # nesil, eşleşen satırlar
+    finished = QtCore.pyqtSignal(int, int)  # nesil, toplam eşleşme
+
+    CHUNK = 2000
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.generation = 0
+        self.running = False
+        self.finished.connect(self._on_finished)
+
+    def start(self, query, end_seq=None):
+        """Yeni aramayı başlat, öncekini iptal et; nesil numarasını döndür
+
+        end_seq verilirse yalnızca ondan önceki satırlar taranır; sonrakiler
+        çağıran tarafından canlı olarak filtrelenir.
+        """
+        self.generation += 1
+        self.running = True
+        generation = self.generation
+        threading.Thread(target=self._run, args=(generation, query, end_seq), daemon=True).start()
+        return generation
+
+    def cancel(self):
+        self.generation += 1
+        self.running = False
+
+    def _on_finished(self, generation, total):
+        if generation == self.generation:
+            self.running = False
+
+    def _run(self, generation, query, end_seq):
+        try:
+            with self.model.lock:
+                # Kilit yalnızca görünüm alınırken tutulur; sözlük taraması kilit dışında
+                view = self.model.index.view()
+                first = self.model.buffer.first_seq
+                last = self.model.buffer.next_seq if end_seq is None else end_seq
+            candidates = view.candidates(query)
+            if candidates is None:
+                seqs = range(first, last)
+            else:
+                seqs = candidates[bisect.bisect_left(candidates, first):bisect.bisect_left(candidates, last)]
+
+            total = 0
+            for start in range(0, len(seqs), self.CHUNK):
+                if generation != self.generation:
+                    return
+                chunk = seqs[start:start + self.CHUNK]
+                with self.model.lock:
+                    lines = self.model.lines_by_seq(chunk)
+                matched = [line for line in lines if line is not None and query.matches(line)]
+                if matched:
+                    total += len(matched)
+                    self.results.emit(generation, matched)
+            self.finished.emit(generation, total)
+        except Exception as e:
+            print(f"Log arama hatası: {e}")
+            self.finished.emit(generation, 0)
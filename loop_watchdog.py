@@ -0,0 +1,211 @@
+"""
+n8n Tray - Olay Döngüsü Bekçisi
+Bu modül GUI olay döngüsünün yanıt verme süresini ölçer ve takılmalarda ana thread'in Python yığınını kaydeder.
+"""
+
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+from PyQt5 import QtCore
+
+import config
+from tracing import tracer
+
+
+class LagHistogram:
+    """Olay döngüsü gecikmelerinin kümülatif olmayan kova sayaçları (saniye)
+
+    Yalnızca GUI thread'i yazar; diğer thread'ler snapshot() ile okur.
+    """
+
+    def __init__(self, buckets_ms=None):
+        self.bounds = tuple(ms / 1000 for ms in (buckets_ms or config.WATCHDOG_LAG_BUCKETS_MS))
+        self.counts = [0] * (len(self.bounds) + 1)  # Son kova: en büyük sınırın üstü
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, lag):
+        index = 0
+        for bound in self.bounds:
+            if lag <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.total += lag
+        self.count += 1
+        if lag > self.max:
+            self.max = lag
+
+    def snapshot(self):
+        """{"buckets": [(üst sınır, kümülatif sayı)], "sum", "count", "max"}; son sınır inf"""
+        counts = list(self.counts)
+        cumulative, running = [], 0
+        for bound, count in zip(self.bounds + (float("inf"),), counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "sum": self.total, "count": running, "max": self.max}
+
+
+class Stall:
+    """Eşiği aşan tek takılma: başlangıç, süre ve eşik aşıldığı andaki yığın
+
+    kind "stall" (olay döngüsü yanıt vermedi) veya "modal" (kalıcı diyaloğun
+    iç olay döngüsü; arayüz yanıt verir ama çağıran kod diyalog kapanana
+    kadar bekler) olabilir.
+    """
+
+    __slots__ = ("started", "duration", "stack", "kind")
+
+    def __init__(self, started, duration, stack, kind="stall"):
+        self.started = started  # Duvar saati (time.time)
+        self.duration = duration
+        self.stack = stack  # traceback.FrameSummary listesi, en içteki sonda
+        self.kind = kind
+
+    def location(self):
+        """Takılmanın görüldüğü en içteki uygulama çerçevesi ("dosya:satır fonksiyon")"""
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        frames = [f for f in self.stack if os.path.dirname(os.path.abspath(f.filename)) == app_dir]
+        frame = (frames or self.stack or [None])[-1]
+        if frame is None:
+            return "bilinmiyor"
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "started": self.started,
+            "duration": self.duration,
+            "location": self.location(),
+            "stack": traceback.format_list(self.stack),
+        }
+
+
+class LoopWatchdog(QtCore.QObject):
+    """GUI thread'inde kalp atışı, ayrı thread'de bekçi
+
+    Kalp atışı zamanlayıcısı her tetiklemede beklenenden ne kadar geç
+    kaldığını histograma yazar. Bekçi thread'i son kalp atışının
+    üzerinden eşikten fazla süre geçtiğini görürse ana thread'in o anki
+    Python yığınını sys._current_frames() ile alır; döngü yeniden
+    döndüğünde takılmanın süresi yığınla birlikte kaydedilir, günlüğe bir
+    satır yazılır ve izleme açıksa aralık olarak eklenir.
+
+    Kalıcı diyaloglar (QMessageBox.exec_) kendi olay döngülerini döndürür;
+    kalp atışı sürdüğü için takılma görünmezler ama çağıran kod (ör. acil
+    durdurma onayı) diyalog kapanana kadar bekler. Kalp atışı iç içe döngü
+    düzeyini izler; iç döngüde eşikten uzun kalınırsa süre, döngüye giren
+    çağrının yığınıyla "modal" kaydı olarak eklenir.
+    """
+
+    def __init__(self, on_stall=None, interval_ms=None, threshold_ms=None, parent=None):
+        super().__init__(parent)
+        self.interval = (interval_ms or config.WATCHDOG_HEARTBEAT_MS) / 1000
+        self.threshold = (threshold_ms or config.WATCHDOG_STALL_THRESHOLD_MS) / 1000
+        self.on_stall = on_stall
+        self.histogram = LagHistogram()
+        self.stalls = collections.deque(maxlen=config.WATCHDOG_MAX_STALLS)
+        self.stall_count = 0
+
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._captured = None  # (yakalanan kalp atışı, yığın); bekçi yazar, GUI okur
+        self._base_level = None  # Ana olay döngüsünün QThread.loopLevel() değeri
+        self._modal = None  # (giriş zamanı, yığın): iç içe döngüde geçen süre
+        self.modal_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(int(self.interval * 1000))
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        self._last_beat = time.monotonic()
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="LoopWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+
+    def _beat(self):
+        """Kalp atışı (GUI thread'i)"""
+        now = time.monotonic()
+        previous = self._last_beat
+        self._last_beat = now
+        lag = max(0.0, now - previous - self.interval)
+        self.histogram.observe(lag)
+        self._track_modal(now)
+
+        captured = self._captured
+        if captured is not None and captured[0] == previous:
+            self._captured = None
+            stall = Stall(time.time() - (now - previous), lag, captured[1])
+            self.stalls.append(stall)
+            self.stall_count += 1
+            if tracer.enabled:
+                start_ns = time.perf_counter_ns() - int((now - previous) * 1e9)
+                tracer.complete("event_loop_stall", "watchdog", start_ns, int(lag * 1e9),
+                                {"location": stall.location(), "stack": "".join(traceback.format_list(stall.stack))})
+            if self.on_stall is not None:
+                self.on_stall(stall)
+
+    def _track_modal(self, now):
+        """İç içe olay döngüsüne giriş/çıkışı izle (GUI thread'i, kalp atışı çözünürlüğünde)"""
+        level = QtCore.QThread.currentThread().loopLevel()
+        if self._base_level is None or level < self._base_level:
+            self._base_level = level
+        if level > self._base_level:
+            if self._modal is None:
+                # Bu çerçevenin altında exec_() çağıran kod var
+                self._modal = (now, traceback.extract_stack()[-config.WATCHDOG_STACK_DEPTH - 2:-2])
+            return
+        if self._modal is None:
+            return
+        entered, stack = self._modal
+        self._modal = None
+        duration = now - entered
+        if duration < self.threshold:
+            return
+        stall = Stall(time.time() - duration, duration, stack, "modal")
+        self.stalls.append(stall)
+        self.modal_count += 1
+        if tracer.enabled:
+            tracer.complete("modal_loop", "watchdog", time.perf_counter_ns() - int(duration * 1e9),
+                            int(duration * 1e9), {"location": stall.location()})
+        if self.on_stall is not None:
+            self.on_stall(stall)
+
+    def _watch(self):
+        """Bekçi thread'i: kalp atışı gecikirse ana thread'in yığınını bir kez yakala"""
+        check = min(self.threshold / 4, self.interval)
+        while not self._stop.wait(check):
+            beat = self._last_beat
+            if time.monotonic() - beat - self.interval < self.threshold:
+                continue
+            if self._captured is not None and self._captured[0] == beat:
+                continue  # Bu takılma için yığın zaten alındı
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)[-config.WATCHDOG_STACK_DEPTH:]
+            del frame
+            self._captured = (beat, stack)
+
+    def snapshot(self):
+        """Kontrol kanalı ve metrikler için histogram ve son takılmalar"""
+        return {
+            "interval": self.interval,
+            "threshold": self.threshold,
+            "histogram": self.histogram.snapshot(),
+            "stall_count": self.stall_count,
+            "modal_count": self.modal_count,
+            "stalls": [stall.to_dict() for stall in list(self.stalls)],
+        }
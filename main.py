@@ -19,43 +19,87 @@ def resource_path(relative_path):
 # __pycache__ oluşturulmasını engelle
 sys.dont_write_bytecode = True
 
-from PyQt5 import QtWidgets, QtGui, QtCore, QtNetwork
+import time
 
-# Kendi modüllerimiz
-from process_manager import ProcessManager
-from gui import MainWindow
-from tray_manager import create_tray
+# Qt ve uygulama modülleri tek örnek kontrolünden sonra yüklenir (ikinci örnek hiç yüklemez)
+from instance_client import SERVER_NAME, send_to_running_instance
+
+
+class StartupTimer:
+    """Açılış adımlarının sürelerini ölçen küçük yardımcı
+
+    --startup-timing argümanı veya N8N_TRAY_STARTUP_TIMING=1 ile sonuç
+    konsola yazdırılır.
+    """
+    
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.steps = []
+    
+    def mark(self, name):
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+    
+    def report(self):
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self.started
+        print("Açılış süreleri:")
+        for name, elapsed in self.steps:
+            print(f"  {name:<24} {elapsed * 1000:8.1f} ms")
+        print(f"  {'toplam':<24} {total * 1000:8.1f} ms", flush=True)
 
 
 def main():
     """Ana uygulama"""
+    timer = StartupTimer(
+        "--startup-timing" in sys.argv or os.environ.get("N8N_TRAY_STARTUP_TIMING") == "1"
+    )
+    headless = "--headless" in sys.argv or os.environ.get("N8N_TRAY_HEADLESS") == "1"
+    
+    # Tek Örnek kontrolü - Sadece bir örnek çalışabilir
+    # Başka bir örnek varsa, Qt yüklenmeden ona sinyal gönder ve çık
+    if send_to_running_instance({"cmd": "show"}):
+        timer.mark("tek örnek kontrolü")
+        timer.report()
+        if headless:
+            print("n8n Tray zaten çalışıyor; kontrol için: python instance_client.py status", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+    timer.mark("tek örnek kontrolü")
+    
+    # Daemon modu - QtWidgets, pencere ve tepsi yüklenmez, kontrol yerel soketten
+    if headless:
+        import daemon
+        timer.mark("modül yükleme")
+        sys.exit(daemon.run(sys.argv, autostart="--start" in sys.argv, echo="--quiet" not in sys.argv, timer=timer))
+    
+    from PyQt5 import QtWidgets, QtGui
+    
+    # Kendi modüllerimiz
+    from control_server import ControlServer, create_local_server
+    from process_manager import ProcessManager
+    from gui import MainWindow
+    from tray_manager import create_tray
+    timer.mark("modül yükleme")
     
     # Qt Uygulaması
     app = QtWidgets.QApplication(sys.argv)
     app.setApplicationName("n8n-tray")
     
-    # Tek Örnek kontrolü - Sadece bir örnek çalışabilir
-    server_name = "n8n_tray_single_instance"
-    socket = QtNetwork.QLocalSocket()
-    socket.connectToServer(server_name)
-    
-    # Başka bir örnek varsa, ona sinyal gönder ve çık
-    if socket.waitForConnected(500):
-        # Diğer örneğe mesaj gönder (pencereyi göster)
-        socket.write(b"show")
-        socket.flush()
-        socket.waitForBytesWritten(1000)
-        socket.disconnectFromServer()
-        sys.exit(0)
-    
     # İlk örnek - Sunucu oluştur
-    local_server = QtNetwork.QLocalServer()
-    local_server.removeServer(server_name)  # Varsa eski sunucuyu temizle
-    local_server.listen(server_name)
+    local_server = create_local_server(SERVER_NAME)
+    timer.mark("QApplication ve sunucu")
     
     # Sistem tepsisi desteklenmiyorsa uyar (Opsiyonel ama iyi bir kontrol)
     if not QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
-        QtWidgets.QMessageBox.critical(None, "Hata", "Bu sistemde sistem tepsisi desteklenmiyor.")
+        QtWidgets.QMessageBox.critical(
+            None, "Hata", "Bu sistemde sistem tepsisi desteklenmiyor.\n"
+            "Arayüzsüz çalıştırmak için --headless kullanın."
+        )
         sys.exit(1)
 
     app.setQuitOnLastWindowClosed(False) # Pencere kapandığında uygulamanın kapanmasını engelle (Tepsi için önemli)
@@ -76,18 +120,20 @@ def main():
     icon_path = resource_path("icon.ico")
     icon = QtGui.QIcon(icon_path)
     app.setWindowIcon(icon) # Uygulama ikonu
+    timer.mark("stil ve palet")
     
     # Süreç yöneticisi örneğini oluştur
     process_manager = ProcessManager()
+    timer.mark("süreç yöneticisi")
     
-    # Ana pencereyi oluştur
+    # Ana pencereyi oluştur (uygulama stil sayfası burada uygulanır)
     window = MainWindow(icon, process_manager)
+    timer.mark("pencere")
     
     # Süreç yöneticisine GUI referanslarını ver
     process_manager.set_gui_references(
-        window.log_text,
-        None,  # Tepsi henüz oluşturulmadı
-        window.update_status
+        window.log_model,
+        None  # Tepsi henüz oluşturulmadı
     )
     
     # Sistem tepsisini oluştur
@@ -95,20 +141,19 @@ def main():
     
     # Süreç yöneticisine tepsi referansını ver
     process_manager.tray = tray
+    timer.mark("sistem tepsisi")
     
-    # Diğer örneklerden gelen istekleri dinle
-    def on_new_connection():
-        client = local_server.nextPendingConnection()
-        if client and client.waitForReadyRead(1000):
-            message = client.readAll().data()
-            if message == b"show":
-                # Pencereyi göster
-                window.show_window()
+    # Kapanışta günlük dosyalarını boşalt
+    app.aboutToQuit.connect(process_manager.shutdown)
     
-    local_server.newConnection.connect(on_new_connection)
+    # Diğer örneklerden ve betiklerden gelen komutları olay döngüsünü bloklamadan işle
+    control_server = ControlServer(local_server, process_manager)
+    control_server.show_requested.connect(window.show_window)
     
     # Uygulama başlatıldığında pencereyi göster
     window.show_window()
+    timer.mark("pencereyi gösterme")
+    timer.report()
     
     # Uygulamayı başlat
     sys.exit(app.exec_())
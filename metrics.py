@@ -0,0 +1,290 @@
+"""
+n8n Tray - Metrikler
+Bu modül ProcessManager'ın bildiklerini Prometheus metin biçiminde yerel HTTP üzerinden sunar.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+
+import config
+from service import ServiceState
+
+
+class ShardedCounter:
+    """Etiket başına sayaç; her thread yalnızca kendi sözlüğünü günceller
+
+    add() kilit almaz: thread'in ilk çağrısında kendi parçası oluşturulur,
+    sonrasında yalnızca o thread yazar. totals() tüm parçaları toplar.
+    Parça thread'e zayıf referansla bağlıdır; thread bitince (durdurma,
+    dışa aktarma, arama gibi kısa ömürlü thread'ler) parçası ortak toplama
+    katılıp listeden çıkarılır, böylece parça sayısı canlı thread sayısıyla
+    sınırlı kalır.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []  # (thread zayıf referansı, parça)
+        self._retired = {}  # Biten thread'lerin toplamı
+        self._lock = threading.Lock()  # Yalnızca parça ekleme/katlama/toplama için
+
+    def add(self, label, count=1):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._reap()
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        shard[label] = shard.get(label, 0) + count
+
+    def _reap(self):
+        """Biten thread'lerin parçalarını ortak toplama kat (kilit tutulur)"""
+        live = []
+        for ref, shard in self._shards:
+            thread = ref()
+            if thread is not None and thread.is_alive():
+                live.append((ref, shard))
+                continue
+            # Thread bitti: parçasına artık yazılmaz
+            for label, value in shard.items():
+                self._retired[label] = self._retired.get(label, 0) + value
+        self._shards = live
+
+    def totals(self):
+        with self._lock:
+            self._reap()
+            totals = dict(self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for label, value in list(shard.items()):
+                totals[label] = totals.get(label, 0) + value
+        return totals
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsWriter:
+    """Prometheus metin biçimi (0.0.4) üreten küçük yardımcı"""
+
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, help_text, samples):
+        """samples: [(etiket sözlüğü, değer)]; boşsa metrik yazılmaz"""
+        if not samples:
+            return
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                self.lines.append(f"{name}{{{label_text}}} {value}")
+            else:
+                self.lines.append(f"{name} {value}")
+
+    def histogram(self, name, help_text, snapshot):
+        """snapshot: LagHistogram.snapshot() biçiminde kümülatif kovalar"""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for bound, count in snapshot["buckets"]:
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            self.lines.append(f'{name}_bucket{{le="{le}"}} {count}')
+        self.lines.append(f"{name}_sum {snapshot['sum']:.6f}")
+        self.lines.append(f"{name}_count {snapshot['count']}")
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+class MetricsCollector:
+    """Servis, denetçi, log ve kaynak değerlerini okuyup metin çıktısı üreten sınıf
+
+    G/Ç thread'inde çalışır; GUI nesnelerine dokunmaz, yalnızca düz
+    özellikleri okur. Saniyelik log hızı tick() ile periyodik hesaplanır.
+    """
+
+    def __init__(self, process_manager):
+        self.process_manager = process_manager
+        self._last_totals = {}
+        self._last_tick = time.monotonic()
+        self.line_rates = {}
+
+    def tick(self):
+        """Son aralıktaki satır sayılarından saniyelik hızı güncelle"""
+        now = time.monotonic()
+        elapsed = now - self._last_tick
+        if elapsed <= 0:
+            return
+        totals = self.process_manager.log_lines.totals()
+        self.line_rates = {
+            tag: (total - self._last_totals.get(tag, 0)) / elapsed
+            for tag, total in totals.items()
+        }
+        self._last_totals = totals
+        self._last_tick = now
+
+    def render(self):
+        pm = self.process_manager
+        now = time.monotonic()
+        out = MetricsWriter()
+
+        up, states, restarts, ttr, uptime, downtime = [], [], [], [], [], []
+        for name, service in pm.services.items():
+            label = {"service": name}
+            state = service.state
+            up.append((label, int(state == service.ready_state)))
+            for candidate in ServiceState.LABELS:
+                states.append(({"service": name, "state": candidate}, int(candidate == state)))
+            stats = pm.supervisor.stats(name)
+            restarts.append((label, stats["restarts"]))
+            downtime.append((label, f"{stats['downtime']:.3f}"))
+            if service.time_to_ready is not None:
+                ttr.append((label, f"{service.time_to_ready:.3f}"))
+            running = state in (ServiceState.RUNNING, ServiceState.READY) and service.started_at is not None
+            uptime.append((label, f"{now - service.started_at:.3f}" if running else 0))
+
+        out.metric("n8n_tray_service_up", "gauge",
+                   "Servis ayakta mı (hazırlık kontrolü olanlarda hazır)", up)
+        out.metric("n8n_tray_service_state", "gauge", "Servisin güncel durumu", states)
+        out.metric("n8n_tray_service_restarts_total", "counter",
+                   "Denetçinin yaptığı yeniden başlatmalar", restarts)
+        out.metric("n8n_tray_service_downtime_seconds_total", "counter",
+                   "Çökmelerden kaynaklanan toplam kesinti", downtime)
+        out.metric("n8n_tray_service_time_to_ready_seconds", "gauge",
+                   "Son başlatmada hazır olma süresi", ttr)
+        out.metric("n8n_tray_service_uptime_seconds", "gauge",
+                   "Son başlatmadan beri geçen süre (çalışmıyorsa 0)", uptime)
+
+        totals = pm.log_lines.totals()
+        out.metric("n8n_tray_log_lines_total", "counter", "Alınan log satırları",
+                   [({"tag": tag}, value) for tag, value in sorted(totals.items())])
+        out.metric("n8n_tray_log_lines_per_second", "gauge", "Son aralıktaki log satırı hızı",
+                   [({"tag": tag}, f"{rate:.2f}") for tag, rate in sorted(self.line_rates.items())])
+        out.metric("n8n_tray_log_records_total", "counter", "Alımda ayrıştırılan log kayıtları (seviyeye göre)",
+                   [({"service": service, "level": level}, value)
+                    for (service, level), value in sorted(pm.log_levels.totals().items())])
+        out.metric("n8n_tray_tunnel_connections", "gauge", "cloudflared'in kayıtlı tünel bağlantıları",
+                   [({"service": service}, len(connections))
+                    for service, connections in sorted(pm.log_parser.tunnel_connections.items())])
+        out.metric("n8n_tray_log_lines_collapsed_total", "counter",
+                   "Tekrar olduğu için görünüme özet olarak giden log satırları",
+                   [({"tag": tag}, value) for tag, value in sorted(pm.log_collapsed.totals().items())])
+        dropped = pm.log_dropped.totals()
+        out.metric("n8n_tray_log_lines_dropped_total", "counter",
+                   "Görünüme veya günlüğe ulaşamadan düşürülen log satırları",
+                   [({"stage": stage}, value) for stage, value in sorted(dropped.items())]
+                   or [({"stage": "view"}, 0)])
+
+        out.metric("n8n_tray_log_queue_pending", "gauge", "Görünüme teslim bekleyen log satırları",
+                   [({}, pm.log_batcher.pending)])
+
+        watchdog = getattr(pm, "loop_watchdog", None)
+        if watchdog is not None:
+            lag = watchdog.histogram.snapshot()
+            out.histogram("n8n_tray_event_loop_lag_seconds",
+                          "Qt olay döngüsü kalp atışının gecikmesi", lag)
+            out.metric("n8n_tray_event_loop_stalls_total", "counter",
+                       "Eşiği aşan olay döngüsü takılmaları", [({}, watchdog.stall_count)])
+            out.metric("n8n_tray_event_loop_modal_waits_total", "counter",
+                       "Eşikten uzun süren kalıcı diyalog (iç içe olay döngüsü) beklemeleri",
+                       [({}, watchdog.modal_count)])
+
+        sampler = getattr(pm, "resource_sampler", None)
+        if sampler is not None:
+            cpu, rss, processes = [], [], []
+            for name, service in pm.services.items():
+                sample = sampler.latest(name)
+                if sample is None or service.process is None:
+                    continue
+                label = {"service": name}
+                cpu.append((label, f"{sample.cpu_percent:.2f}"))
+                rss.append((label, sample.rss))
+                processes.append((label, sample.processes))
+            out.metric("n8n_tray_service_cpu_percent", "gauge",
+                       "Servis süreç ağacının CPU kullanımı (tek çekirdeğe göre)", cpu)
+            out.metric("n8n_tray_service_rss_bytes", "gauge",
+                       "Servis süreç ağacının toplam RSS değeri", rss)
+            out.metric("n8n_tray_service_processes", "gauge",
+                       "Servis süreç ağacındaki süreç sayısı", processes)
+
+        return out.render()
+
+
+class MetricsServer:
+    """G/Ç motorunun döngüsünde çalışan küçük HTTP sunucusu
+
+    Yalnızca GET /metrics isteğine yanıt verir; kazıma işlemi GUI
+    thread'ine hiç uğramaz.
+    """
+
+    MAX_REQUEST_BYTES = 8 * 1024
+    REQUEST_TIMEOUT_S = 5.0
+
+    def __init__(self, engine, collector, host=None, port=None, rate_interval=None):
+        self.engine = engine
+        self.collector = collector
+        self.host = host or config.METRICS_HOST
+        self.port = config.METRICS_PORT if port is None else port
+        self.rate_interval = rate_interval or config.METRICS_RATE_INTERVAL_S
+        self._server = None
+        self._tick_handle = None
+
+    def start(self, timeout=5):
+        """Dinlemeye başla; port açılamazsa OSError yükselir"""
+        self.engine.submit(self._start()).result(timeout)
+
+    def stop(self):
+        if self._server is not None:
+            self.engine.call_soon(self._close)
+
+    async def _start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 verildiyse işletim sisteminin seçtiği port
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        self.collector.tick()
+        self._tick_handle = self.engine.loop.call_later(self.rate_interval, self._schedule_tick)
+
+    def _close(self):
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+        self._server.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), self.REQUEST_TIMEOUT_S
+            )
+            parts = head.split(b"\r\n", 1)[0].split()
+            if len(parts) < 2 or len(head) > self.MAX_REQUEST_BYTES:
+                status, body = "400 Bad Request", "bad request\n"
+            elif parts[0] not in (b"GET", b"HEAD"):
+                status, body = "405 Method Not Allowed", "method not allowed\n"
+            elif parts[1].split(b"?", 1)[0] not in (b"/metrics", b"/"):
+                status, body = "404 Not Found", "not found\n"
+            else:
+                status, body = "200 OK", self.collector.render()
+
+            payload = body.encode("utf-8")
+            writer.write(
+                (
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("ascii")
+            )
+            if parts and parts[0] != b"HEAD":
+                writer.write(payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            pass
+        except Exception as e:
+            print(f"Metrik isteği hatası: {e}")
+        finally:
+            writer.close()
@@ -0,0 +1,87 @@
+"""
+n8n Tray - n8n Rolleri
+Bu modül n8n'in ana, webhook ve worker rollerini ve her kopyanın port/ortam ayarlarını tanımlar.
+"""
+
+import os
+
+import config
+
+
+def available_cores():
+    """Bu sürecin kullanabileceği çekirdek sayısı"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+class N8nRole:
+    """Bir n8n rolünün komutu, port aralığı ve kopya sınırları"""
+
+    def __init__(self, name, display_name, command, base_port, replicas, scalable=True,
+                 max_replicas=None):
+        self.name = name
+        self.display_name = display_name
+        self.command = command
+        self.base_port = base_port
+        self.replicas = replicas
+        self.scalable = scalable
+        self.max_replicas = max_replicas or config.N8N_MAX_REPLICAS
+
+    def instance_name(self, index):
+        """Servis adı; ana süreç geriye uyumluluk için "n8n" adını korur"""
+        if not self.scalable:
+            return "n8n"
+        return f"n8n-{self.name}-{index}"
+
+    def port(self, index):
+        # Her kopya iki port kullanır (HTTP ve görev çalıştırıcı aracısı)
+        return self.base_port + (index - 1) * 2
+
+
+class N8nInstance:
+    """Bir rolün tek kopyası"""
+
+    def __init__(self, role, index):
+        self.role = role
+        self.index = index
+        self.name = role.instance_name(index)
+        self.port = role.port(index)
+        self.retired = False  # Ölçek küçültmede durdurulup kaldırılacak
+
+    @property
+    def display_name(self):
+        if not self.role.scalable:
+            return "n8n"
+        return f"n8n {self.role.display_name} #{self.index}"
+
+    def env(self):
+        """Kopyanın ortam değişkenleri"""
+        env = dict(**os.environ)
+        env["N8N_SECURE_COOKIE"] = "false"
+        env["N8N_RUNNERS_ENABLED"] = "true"
+        env["N8N_PORT"] = str(self.port)
+        env["N8N_RUNNERS_BROKER_PORT"] = str(self.port + 1)
+        if config.N8N_QUEUE_MODE:
+            env["EXECUTIONS_MODE"] = "queue"
+        if self.role.name == "worker":
+            # Worker'lar HTTP sunmaz; sağlık uç noktası ayrıca açılır
+            env["QUEUE_HEALTH_CHECK_ACTIVE"] = "true"
+            env["QUEUE_HEALTH_CHECK_PORT"] = str(self.port)
+        return env
+
+
+def default_roles():
+    """Ayarlardan rol tanımlarını oluştur (kuyruk modu kapalıysa yalnızca ana süreç)"""
+    queue = config.N8N_QUEUE_MODE
+    return {
+        "main": N8nRole("main", "Ana", "n8n", config.N8N_PORT, 1, scalable=False),
+        "webhook": N8nRole(
+            "webhook", "Webhook", "n8n webhook", config.N8N_WEBHOOK_BASE_PORT,
+            config.N8N_WEBHOOK_REPLICAS if queue else 0,
+        ),
+        "worker": N8nRole(
+            "worker", "Worker", "n8n worker", config.N8N_WORKER_BASE_PORT,
+            (config.N8N_WORKER_REPLICAS or available_cores()) if queue else 0,
+        ),
+    }
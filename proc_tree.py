@@ -0,0 +1,233 @@
+"""
+n8n Tray - Süreç Ağacı
+Bu modül yardımcı süreç başlatmadan süreç ağacını bulur ve sonlandırır.
+"""
+
+import os
+import signal
+import sys
+
+
+class ProcessSnapshot:
+    """Tek geçişte alınan süreç listesi: pid -> (ebeveyn pid, ad)
+
+    usage, istenirse pid -> (toplam CPU süresi sn, RSS bayt) değerlerini
+    tutar; Linux'ta aynı /proc geçişinde doldurulur.
+    """
+
+    def __init__(self, processes, usage=None):
+        self.processes = processes
+        self.usage = usage or {}
+        self.children = {}
+        for pid, (ppid, _) in processes.items():
+            self.children.setdefault(ppid, []).append(pid)
+
+    def name(self, pid):
+        info = self.processes.get(pid)
+        return info[1] if info else None
+
+    def descendants(self, roots):
+        """Köklerle birlikte tüm alt süreçleri (önce kökler) döndür"""
+        result = []
+        seen = set()
+        stack = [pid for pid in roots if pid in self.processes]
+        while stack:
+            pid = stack.pop()
+            if pid in seen:
+                continue
+            seen.add(pid)
+            result.append(pid)
+            stack.extend(self.children.get(pid, ()))
+        return result
+
+    def tree_usage(self, roots):
+        """Ağacın toplam CPU süresi (sn), RSS (bayt) ve süreç sayısı"""
+        pids = self.descendants(roots)
+        missing = [pid for pid in pids if pid not in self.usage]
+        if missing:
+            self.usage.update(_read_usage(missing))
+        cpu = 0.0
+        rss = 0
+        for pid in pids:
+            cpu_time, rss_bytes = self.usage.get(pid, (0.0, 0))
+            cpu += cpu_time
+            rss += rss_bytes
+        return cpu, rss, len(pids)
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    TH32CS_SNAPPROCESS = 0x00000002
+    PROCESS_TERMINATE = 0x0001
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_void_p),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", wintypes.LONG),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * 260),
+        ]
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    _kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    _kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    _kernel32.GetProcessTimes.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+    _kernel32.K32GetProcessMemoryInfo.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD
+    ]
+
+    def _read_processes():
+        """Toolhelp32 anlık görüntüsünden süreç listesini oku"""
+        processes = {}
+        handle = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+        if handle == INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            entry = PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+            ok = _kernel32.Process32FirstW(handle, ctypes.byref(entry))
+            while ok:
+                processes[entry.th32ProcessID] = (entry.th32ParentProcessID, entry.szExeFile)
+                ok = _kernel32.Process32NextW(handle, ctypes.byref(entry))
+        finally:
+            _kernel32.CloseHandle(handle)
+        return processes
+
+    def _read_usage(pids):
+        """Verilen süreçlerin CPU süresi ve çalışma kümesi boyutu"""
+        usage = {}
+        for pid in pids:
+            handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            if not handle:
+                continue
+            try:
+                creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+                if not _kernel32.GetProcessTimes(
+                    handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                    ctypes.byref(kernel), ctypes.byref(user)
+                ):
+                    continue
+                # FILETIME 100 ns birimindedir
+                ticks = sum(
+                    (t.dwHighDateTime << 32) | t.dwLowDateTime for t in (kernel, user)
+                )
+                counters = PROCESS_MEMORY_COUNTERS()
+                counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+                _kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb)
+                usage[pid] = (ticks / 1e7, counters.WorkingSetSize)
+            finally:
+                _kernel32.CloseHandle(handle)
+        return usage
+
+    def _read_snapshot(with_usage):
+        # Windows'ta kullanım yalnızca istenen ağaç için sorgulanır (tree_usage)
+        return _read_processes(), None
+
+    def _kill(pid):
+        handle = _kernel32.OpenProcess(PROCESS_TERMINATE, False, pid)
+        if not handle:
+            return False
+        try:
+            return bool(_kernel32.TerminateProcess(handle, 1))
+        finally:
+            _kernel32.CloseHandle(handle)
+
+else:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+    def _read_snapshot(with_usage):
+        """/proc üzerinden tek geçişte süreç listesini (ve istenirse kullanımı) oku"""
+        processes = {}
+        usage = {} if with_usage else None
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as f:
+                    stat = f.read()
+            except OSError:
+                continue  # Süreç bu arada kapanmış
+            # Ad parantez içinde ve boşluk içerebilir; alanlar son ')' sonrasından başlar
+            open_paren = stat.find(b"(")
+            close_paren = stat.rfind(b")")
+            name = stat[open_paren + 1:close_paren].decode("utf-8", "replace")
+            fields = stat[close_paren + 2:].split()
+            pid = int(entry)
+            processes[pid] = (int(fields[1]), name)
+            if with_usage:
+                # utime, stime (saat tıkı) ve rss (sayfa): stat alanları 14, 15 ve 24
+                cpu = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+                usage[pid] = (cpu, int(fields[21]) * _PAGE_SIZE)
+        return processes, usage
+
+    def _read_processes():
+        return _read_snapshot(False)[0]
+
+    def _read_usage(pids):
+        return {}
+
+    def _kill(pid):
+        try:
+            os.kill(pid, signal.SIGKILL)
+            return True
+        except (ProcessLookupError, PermissionError):
+            return False
+
+
+def snapshot(with_usage=False):
+    """Sistemdeki süreçlerin anlık görüntüsünü al"""
+    processes, usage = _read_snapshot(with_usage)
+    return ProcessSnapshot(processes, usage)
+
+
+def tree_pids(roots, snap=None):
+    """Verilen köklerin kendileri ve tüm alt süreçleri"""
+    snap = snap or snapshot()
+    return snap.descendants(roots)
+
+
+def kill_pids(pids):
+    """Süreçleri zorla sonlandır; sonlandırılan sayısını döndür"""
+    killed = 0
+    for pid in pids:
+        if _kill(pid):
+            killed += 1
+    return killed
+
+
+def kill_tree(roots):
+    """Köklerin tüm ağacını tek anlık görüntü ile bul ve sonlandır; (bulunan, sonlandırılan) döndür"""
+    pids = tree_pids(roots)
+    return len(pids), kill_pids(pids)
@@ -0,0 +1,96 @@
+"""
+n8n Tray - Süreç Kontrolü
+Bu modül süreçleri önce nazikçe, süre aşılırsa zorla durduran adımları içerir.
+"""
+
+import os
+import signal
+import sys
+import time
+
+import config
+import proc_tree
+from tracing import tracer
+
+
+def send_graceful_signal(process):
+    """Sürece (ve grubuna) kapanma isteği gönder
+
+    POSIX'te süreç kendi oturumunda başlatıldığı için SIGTERM tüm gruba
+    gider. Windows'ta süreç ayrı bir süreç grubunda başlatılır ve
+    CTRL_BREAK_EVENT gönderilir.
+    """
+    if sys.platform == "win32":
+        os.kill(process.pid, signal.CTRL_BREAK_EVENT)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+def kill_tree(process):
+    """Sürecin tüm ağacını yardımcı süreç başlatmadan zorla sonlandır"""
+    proc_tree.kill_tree([process.pid])
+    if sys.platform != "win32":
+        # Ebeveyni ölünce init'e geçen grup üyeleri için
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class StopResult:
+    """Durdurma adımlarının süreleri ve sonucu"""
+
+    def __init__(self):
+        self.signal_time = 0.0
+        self.drain_time = 0.0
+        self.kill_time = None  # Zorla sonlandırmaya gerek kalmadıysa None
+        self.total_time = 0.0
+        self.exited = False
+        self.returncode = None
+
+    def summary(self):
+        parts = [f"sinyal {self.signal_time:.2f} sn", f"boşaltma {self.drain_time:.2f} sn"]
+        if self.kill_time is not None:
+            parts.append(f"zorla sonlandırma {self.kill_time:.2f} sn")
+        parts.append(f"toplam {self.total_time:.2f} sn")
+        return ", ".join(parts)
+
+
+def stop_process(process, drain_timeout=None, kill_timeout=None):
+    """Süreci sınırlı sürede durdur: nazik sinyal, boşaltma beklemesi, gerekirse ağaç sonlandırma
+
+    Çağıran thread'i bloklar; GUI thread'inden çağrılmamalıdır.
+    """
+    drain_timeout = config.STOP_DRAIN_TIMEOUT_S if drain_timeout is None else drain_timeout
+    kill_timeout = config.STOP_KILL_TIMEOUT_S if kill_timeout is None else kill_timeout
+    result = StopResult()
+    started = time.monotonic()
+
+    # 1. Nazik kapanma isteği
+    with tracer.span("stop.signal", "process", pid=process.pid):
+        try:
+            send_graceful_signal(process)
+        except OSError as e:
+            print(f"Kapanma sinyali gönderilemedi: {e}")
+    result.signal_time = time.monotonic() - started
+
+    # 2. Devam eden işlerin bitmesini bekle
+    phase = time.monotonic()
+    with tracer.span("stop.drain", "process", pid=process.pid):
+        result.returncode = process.wait(drain_timeout)
+    result.drain_time = time.monotonic() - phase
+
+    # 3. Süre aşıldıysa ağacı zorla sonlandır
+    if process.poll() is None:
+        phase = time.monotonic()
+        with tracer.span("stop.kill_tree", "process", pid=process.pid):
+            kill_tree(process)
+            result.returncode = process.wait(kill_timeout)
+        result.kill_time = time.monotonic() - phase
+
+    result.exited = process.poll() is not None
+    result.total_time = time.monotonic() - started
+    return result
@@ -3,289 +3,670 @@ n8n Tray - Süreç Yönetimi
 Bu modül n8n ve Cloudflare süreçlerini yönetir.
 """
 
-import subprocess
-import os
 import threading
-from PyQt5 import QtCore, QtWidgets
+import time
 
+import config
 
-class LogSignalEmitter(QtCore.QObject):
-    """Thread güvenli log sinyalleri için yardımcı sınıf"""
-    log_message = QtCore.pyqtSignal(str)
+import proc_tree
+from io_engine import IOEngine
+from log_journal import JournalWriter
+from log_dedup import LogDeduplicator
+from log_model import LogRingBuffer
+from log_parser import LogParser
+from log_pipeline import LogBatcher
+from loop_watchdog import LoopWatchdog
+from metrics import MetricsCollector, MetricsServer, ShardedCounter
+from n8n_instances import N8nInstance, default_roles
+from process_control import stop_process
+from readiness import ReadinessProbe
+from resource_sampler import ResourceSampler
+from service import Service, ServiceState, ServiceStateBus
+from startup import StackStarter
+from supervisor import Supervisor
+from tracing import default_trace_path, traced, tracer
 
 
 class ProcessManager:
     """Süreç yönetimi sınıfı"""
     
     def __init__(self):
-        self.n8n_process = None
-        self.cloudflare_process = None
+        # Servis durumları tek sinyal üzerinden yayımlanır
+        self.state_bus = ServiceStateBus()
+        # Servis sözlüğü yerinde değiştirilmez, kopyalanıp yeniden atanır;
+        # böylece diğer thread'ler üzerinde güvenle dolaşabilir
+        self.services = {}
         
-        # Sinyal yayıcısı oluştur
-        self.log_emitter = LogSignalEmitter()
+        # n8n rolleri (ana, webhook, worker) ve çalışan kopyaları
+        self.n8n_roles = default_roles()
+        self.n8n_instances = {}
+        self._scale_lock = threading.Lock()
+        for role in self.n8n_roles.values():
+            for index in range(1, role.replicas + 1):
+                self._add_n8n_instance(role, index)
+        self._add_service(Service("CF", "Cloudflare", self.state_bus))
         
-        # GUI referansları
-        self.log_text = None
+        # Çöken servisleri geri çekilme ile yeniden başlatan denetçi
+        self.supervisor = Supervisor(self)
+        
+        # Bağımlılık grafiğine göre paralel toplu başlatma
+        self.stack_starter = StackStarter(self)
+        
+        # Log hızı, seviye ve kayıp sayaçları (sıcak yolda kilitsiz güncellenir)
+        self.log_lines = ShardedCounter()
+        self.log_levels = ShardedCounter()  # (servis, seviye) -> satır
+        self.log_collapsed = ShardedCounter()  # Özet kayda indirgenen satırlar
+        self.log_dropped = ShardedCounter()  # Aşama (queue, spill, view, journal) -> satır
+        
+        # Tüm alt süreçlerin çıktısını tek thread'de okuyan G/Ç motoru
+        self.io_engine = IOEngine()
+        
+        # Log satırlarını GUI'ye toplu ileten sınırlı kuyruk (dolarsa taşma politikası uygulanır)
+        self.log_batcher = LogBatcher(on_drop=self.log_dropped.add)
+        
+        # Servis başına döndürülen günlük dosyaları (arka plan thread'inde yazılır)
+        self.journal_writer = JournalWriter(on_drop=self.log_dropped.add)
+        
+        # Servis ağaçlarının CPU/RSS ölçümü
+        self.resource_sampler = ResourceSampler(self.service_roots)
+        self.resource_sampler.start()
+        
+        # Alım anında satırları bir kez ayrıştırıp kayda dönüştüren ayrıştırıcı
+        self.log_parser = LogParser()
+        # Log fırtınalarında tekrarlanan satırları özet kayda indirger (G/Ç thread'i)
+        self.log_dedup = LogDeduplicator() if config.LOG_DEDUP_ENABLED else None
+        self._dedup_timer = None
+        
+        # GUI/Qt olay döngüsünün yanıt süresi; takılmada ana thread yığını kaydedilir
+        self.loop_watchdog = None
+        if config.WATCHDOG_ENABLED:
+            self.loop_watchdog = LoopWatchdog(self._on_loop_stall)
+            self.loop_watchdog.start()
+        
+        # İsteğe bağlı Prometheus uç noktası (G/Ç thread'inde sunulur)
+        self.metrics_server = None
+        if config.METRICS_ENABLED:
+            self.start_metrics_server()
+        
+        # GUI referansları (daemon modunda yok)
+        self.log_model = None
         self.tray = None
-        self.update_status_callback = None
+        # GUI yokken son log satırlarını tutan tampon
+        self.log_buffer = None
+        self.log_buffer_lock = threading.Lock()
+    
+    def _add_service(self, service):
+        self.services = {**self.services, service.name: service}
+    
+    def _remove_service(self, name):
+        services = dict(self.services)
+        if services.pop(name, None) is not None:
+            self.services = services
+            self.n8n_instances.pop(name, None)
+            self.state_bus.services_changed.emit()
+    
+    def _add_n8n_instance(self, role, index):
+        instance = N8nInstance(role, index)
+        self.n8n_instances = {**self.n8n_instances, instance.name: instance}
+        self._add_service(
+            Service(instance.name, instance.display_name, self.state_bus, ready_state=ServiceState.READY)
+        )
+        return instance
     
-    def set_gui_references(self, log_widget, tray_icon, status_callback):
+    def role_instances(self, role_name):
+        """Rolün (kaldırılmakta olanlar hariç) kopyaları, sıra numarasına göre"""
+        return sorted(
+            (i for i in self.n8n_instances.values() if i.role.name == role_name and not i.retired),
+            key=lambda i: i.index,
+        )
+    
+    @property
+    def n8n_process(self):
+        return self.services["n8n"].process
+    
+    @property
+    def cloudflare_process(self):
+        return self.services["CF"].process
+    
+    def service_roots(self):
+        """Servis adı -> kök süreç pid'i (çalışmıyorsa None)"""
+        roots = {}
+        for name, service in self.services.items():
+            process = service.process
+            roots[name] = process.pid if process is not None and process.poll() is None else None
+        return roots
+    
+    def start_metrics_server(self, host=None, port=None):
+        """Metrik uç noktasını başlat; port açılamazsa None döndür"""
+        server = MetricsServer(self.io_engine, MetricsCollector(self), host, port)
+        try:
+            server.start()
+        except Exception as e:
+            print(f"Metrik sunucusu başlatılamadı ({server.host}:{server.port}): {e}")
+            return None
+        self.metrics_server = server
+        return server
+    
+    def set_gui_references(self, log_model, tray_icon):
         """GUI referanslarını ayarla"""
-        self.log_text = log_widget
+        self.log_model = log_model
         self.tray = tray_icon
-        self.update_status_callback = status_callback
         
-        # Log sinyal bağlantısını kur
-        self.log_emitter.log_message.connect(self._append_to_log)
+        # Toplu log teslimatını bağla
+        self.log_batcher.batch_ready.connect(self._append_to_log)
+    
+    def attach_log_buffer(self, max_lines=None, max_bytes=None):
+        """GUI olmadan (daemon modu) son log satırlarını bellekte tut"""
+        self.log_buffer = LogRingBuffer(max_lines, max_bytes)
+        self.log_batcher.batch_ready.connect(self._append_to_buffer)
+        return self.log_buffer
+    
+    @traced()
+    def notify(self, title, message, level="Information"):
+        """Tepsi bildirimi göster; tepsi yoksa (daemon modu) hiçbir şey yapma
+
+        level: QSystemTrayIcon simge adı ("Information", "Warning", "Critical").
+        """
+        if self.tray is None:
+            return
+        from PyQt5 import QtWidgets
+        self.tray.showMessage(title, message, getattr(QtWidgets.QSystemTrayIcon, level))
     
     def log_append(self, text):
         """Log mesajı ekle (zaman damgası ile)"""
-        if self.log_text:
+        try:
+            now = time.time()
+            record = self.log_parser.tray_record(text, now)
+            self.log_batcher.push(record)
+            self.journal_writer.append("tray", text, now)
+            self.log_lines.add("tray")
+            self.log_levels.add(("tray", record.level))
+        except Exception as e:
+            print(f"Log ekleme hatası: {e}")
+    
+    def _append_to_log(self, lines):
+        """Toplu log ekleme (ana thread'de çalışır, parti başına tek ekleme)"""
+        if self.log_model is not None:
             try:
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                self.log_emitter.log_message.emit(f"[{timestamp}] {text}")
+                with tracer.span("append_to_log", "gui", lines=len(lines)):
+                    skipped = self.log_model.append_lines(lines)
+                if skipped:
+                    self.log_dropped.add("view", skipped)
             except Exception as e:
                 print(f"Log ekleme hatası: {e}")
     
-    def _append_to_log(self, text):
-        """Thread güvenli log ekleme (ana thread'de çalışır)"""
-        if self.log_text:
+    def _append_to_buffer(self, lines):
+        """Toplu log ekleme, GUI'siz mod (ana thread'de çalışır)"""
+        with self.log_buffer_lock:
+            _, keep = self.log_buffer.extend(lines)
+        if keep < len(lines):
+            self.log_dropped.add("view", len(lines) - keep)
+    
+    def _on_process_lines(self, tag, lines):
+        """Süreç çıktısını tampona bırak (G/Ç thread'inde çalışır)"""
+        with tracer.span("process_lines", "io", tag=tag, lines=len(lines)):
             try:
-                self.log_text.append(text)
-                self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
+                self.log_lines.add(tag, len(lines))
+                now = time.time()
+                parse = self.log_parser.parse
+                dedup = self.log_dedup
+                collapsed = 0
+                for line in lines:
+                    line = line.strip()
+                    # Satır burada bir kez ayrıştırılır; görünüm, filtreler ve metrikler kaydı kullanır
+                    record = parse(tag, line, now)
+                    self.log_levels.add((tag, record.level))
+                    # Günlük dosyası her satırı arka planda yazar; görünüme tekrarlar özet olarak gider
+                    self.journal_writer.append(tag, line, now)
+                    if dedup is None:
+                        self.log_batcher.push(record)
+                        continue
+                    records = dedup.process(record)
+                    if not records:
+                        collapsed += 1
+                    for record in records:
+                        self.log_batcher.push(record)
+                if collapsed:
+                    self.log_collapsed.add(tag, collapsed)
+                    self._schedule_dedup_flush()
             except Exception as e:
-                print(f"Log ekleme hatası: {e}")
+                print(f"Süreç izleme hatası: {e}")
+    
+    def _schedule_dedup_flush(self):
+        """Süren tekrar dizilerinin özetini aralıklarla yayımla (G/Ç thread'inde)"""
+        if self._dedup_timer is None:
+            self._dedup_timer = self.io_engine.loop.call_later(
+                self.log_dedup.summary_interval, self._flush_dedup
+            )
+    
+    @traced("io")
+    def _flush_dedup(self, service=None):
+        if service is None:
+            self._dedup_timer = None
+        for record in self.log_dedup.flush(time.time(), service):
+            self.log_batcher.push(record)
+        if service is None and self.log_dedup.pending:
+            self._schedule_dedup_flush()
+    
+    def _on_loop_stall(self, stall):
+        """Olay döngüsü eşikten uzun takıldı (GUI thread'inde, döngü yeniden dönünce)"""
+        if stall.kind == "modal":
+            self.log_append(
+                f"Kalıcı diyalog {stall.duration:.1f} sn boyunca çağıranı bekletti ({stall.location()})"
+            )
+            return
+        self.log_append(
+            f"Olay döngüsü {stall.duration * 1000:.0f} ms yanıt vermedi ({stall.location()}); "
+            f"yığın için: python instance_client.py stalls"
+        )
     
-    def poll_process(self, proc, tag):
-        """Süreç çıktısını izle"""
+    @traced("io")
+    def _on_process_exit(self, handle):
+        """Süreç çıkış olayını servis durumuna yansıt (G/Ç thread'inde çalışır)"""
         try:
-            while proc and proc.poll() is None:
-                line = proc.stdout.readline()
-                if line:
-                    # Thread güvenli sinyal yayımı
-                    self.log_emitter.log_message.emit(f"[{tag}] {line.strip()}")
-            
-            # Süreç doğal olarak kapandıysa bildir
-            if tag == "n8n":
-                if self.n8n_process and self.n8n_process.poll() is not None:
-                    self.n8n_process = None
-                    self.log_emitter.log_message.emit("[n8n] Süreç beklenmedik şekilde kapandı")
-            elif tag == "CF":
-                if self.cloudflare_process and self.cloudflare_process.poll() is not None:
-                    self.cloudflare_process = None
-                    self.log_emitter.log_message.emit("[CF] Süreç beklenmedik şekilde kapandı")
-            
-            if self.update_status_callback:
-                self.update_status_callback()
+            service = self.services.get(handle.tag)
+            if service is None:
+                return
+            new_state = service.process_exited(handle)
+            if new_state is None:
+                return
+            self.log_parser.reset(handle.tag)
+            instance = self.n8n_instances.get(handle.tag)
+            retired = instance is not None and instance.retired
+            if retired:
+                self._remove_service(handle.tag)
+            # Tekrar durumu yalnızca G/Ç thread'inde değişir; özet ve çıkış mesajı
+            # her iki yolda da aynı sırayla (önce özet) orada yazılır
+            if self.io_engine.in_loop_thread():
+                self._report_exit(service, handle, new_state, retired)
+            else:
+                self.io_engine.call_soon(self._report_exit, service, handle, new_state, retired)
         except Exception as e:
             self.log_append(f"Süreç izleme hatası: {e}")
     
-    def start_n8n(self):
-        """n8n'i başlat"""
+    def _service_event(self, tag, text, level):
+        """Servis adına olay satırı: süreç satırları gibi günlüğe, sayaçlara ve görünüme gider"""
+        now = time.time()
+        self.journal_writer.append(tag, text, now)
+        self.log_lines.add(tag)
+        self.log_levels.add((tag, level))
+        self.log_batcher.push(self.log_parser.event_record(tag, text, level, now))
+    
+    def _report_exit(self, service, handle, new_state, retired):
+        """Bekleyen tekrar özetini ve çıkış mesajını yaz (G/Ç thread'inde)"""
+        if self.log_dedup is not None:
+            self._flush_dedup(handle.tag)
+        if retired:
+            self.log_append(f"{service.display_name} kaldırıldı")
+        elif new_state == ServiceState.CRASHED:
+            self._service_event(handle.tag, f"Süreç beklenmedik şekilde kapandı (çıkış kodu {handle.returncode})", "ERROR")
+        elif new_state == ServiceState.STOPPED:
+            self.log_append(f"{service.display_name} durduruldu")
+    
+    @traced(arg="name")
+    def _start_service(self, name, command, shell=False, env=None):
+        """Servisi STARTING durumuna al ve sürecini G/Ç motoru üzerinden başlat"""
+        service = self.services[name]
+        if not service.begin_start():
+            return False
         try:
-            if self.n8n_process is None:
-                env = dict(**os.environ)
-                env["N8N_SECURE_COOKIE"] = "false"
-                env["N8N_RUNNERS_ENABLED"] = "true"
-                
-                # PowerShell yerine n8n komutunu doğrudan çağırıyoruz
-                # CREATE_NO_WINDOW bayrağı ile konsol penceresinin açılmasını engelle
-                self.n8n_process = subprocess.Popen(
-                    "n8n",
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    env=env,
-                    creationflags=subprocess.CREATE_NO_WINDOW
+            handle = self.io_engine.spawn(
+                name, command, self._on_process_lines, self._on_process_exit, shell=shell, env=env
+            )
+        except Exception:
+            service.transition(ServiceState.STOPPED)
+            raise
+        service.attach(handle)
+        
+        # Çok hızlı kapanan süreç, bağlanmadan önce çıkış bildirmiş olabilir
+        if handle.poll() is not None:
+            self._on_process_exit(handle)
+        return True
+    
+    def _probe_readiness(self, name, probe):
+        """Servis trafik kabul edene kadar G/Ç döngüsünde yokla, sonra READY'ye geçir"""
+        service = self.services[name]
+        handle = service.process
+        if handle is None:
+            return
+        
+        async def run():
+            try:
+                # Süreç kapanır veya durdurma istenirse yoklama biter
+                elapsed = await probe.wait_ready(
+                    lambda: service.process is handle and service.state == ServiceState.RUNNING
                 )
-                
-                if self.tray:
-                    self.tray.showMessage("n8n", "n8n başlatıldı", QtWidgets.QSystemTrayIcon.Information)
-                
-                self.log_append("n8n başlatıldı")
-                threading.Thread(target=self.poll_process, args=(self.n8n_process, "n8n"), daemon=True).start()
-                
-                if self.update_status_callback:
-                    self.update_status_callback()
+                if elapsed is None:
+                    if service.process is handle and service.state == ServiceState.RUNNING:
+                        self.log_append(
+                            f"{service.display_name} hazırlık kontrolü {probe.timeout:.0f} sn içinde geçmedi; "
+                            f"süreç çalışıyor, servis hazır olmadan izlenmeye devam ediyor"
+                        )
+                    return
+                time_to_ready = service.mark_ready()
+                if time_to_ready is not None:
+                    self.log_append(
+                        f"{service.display_name} hazır: {time_to_ready:.2f} sn "
+                        f"({probe.attempts} deneme, port {probe.port})"
+                    )
+            except Exception as e:
+                self.log_append(f"{service.display_name} hazırlık kontrolü hatası: {e}")
+        
+        self.io_engine.submit(run())
+    
+    @traced(arg="name")
+    def _stop_service(self, name, worker):
+        """Servisi STOPPING durumuna al ve durdurma işini thread'de yap"""
+        service = self.services[name]
+        process = service.process
+        if process is None or not service.transition(
+            ServiceState.STOPPING, expected={ServiceState.STARTING, ServiceState.RUNNING, ServiceState.READY}
+        ):
+            return False
+        # GUI donmasını engellemek için thread'de durdur
+        threading.Thread(target=worker, args=(process,), daemon=True).start()
+        return True
+    
+    def shutdown(self):
+        """Uygulama kapanırken G/Ç motorunu durdur ve bekleyen günlük satırlarını diske yaz"""
+        self.resource_sampler.stop()
+        if self.loop_watchdog is not None:
+            self.loop_watchdog.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.io_engine.stop()
+        self.log_batcher.close()
+        self.journal_writer.close()
+    
+    @traced()
+    def start_all(self):
+        """Tüm servisleri bağımlılık sırasıyla, birbirini beklemeyenleri paralel başlat"""
+        if not self.stack_starter.start():
+            self.log_append("Toplu başlatma zaten sürüyor")
+    
+    @traced()
+    def stop_all(self):
+        """Etkin tüm servisleri durdur; STOPPING durumuna alınanların adlarını döndür"""
+        stopped = []
+        for name in list(self.services):
+            if name in self.n8n_instances:
+                if self._stop_n8n_instance(name):
+                    stopped.append(name)
+            elif name == "CF":
+                if self._stop_service(name, self._stop_cloudflare_worker):
+                    stopped.append(name)
+        return stopped
+    
+    def target_services(self, target):
+        """Kontrol hedefinin kapsadığı servisler: "all", "n8n" (tüm kopyalar) veya servis adı"""
+        if target == "all":
+            return list(self.services)
+        if target == "n8n":
+            return list(self.n8n_instances)
+        return [target] if target in self.services else []
+    
+    def start_target(self, target):
+        if target == "all":
+            self.start_all()
+        elif target == "n8n":
+            self.start_n8n()
+        else:
+            self.start_service(target)
+    
+    def stop_target(self, target):
+        """Hedefi durdur; gerçekten STOPPING durumuna alınan servislerin adlarını döndür
+        
+        Süreci henüz oluşmamış (STARTING) servisler durdurulamaz ve listede yer almaz.
+        """
+        if target == "all":
+            return self.stop_all()
+        if target == "n8n":
+            return self.stop_n8n()
+        if target == "CF":
+            return ["CF"] if self.stop_cloudflare() else []
+        if target in self.n8n_instances and self._stop_n8n_instance(target):
+            return [target]
+        return []
+    
+    def recent_log_lines(self, count=None):
+        """Bellekteki son log satırları (count None ise tamamı)"""
+        if self.log_model is not None:
+            buffer, lock = self.log_model.buffer, self.log_model.lock
+        elif self.log_buffer is not None:
+            buffer, lock = self.log_buffer, self.log_buffer_lock
+        else:
+            return []
+        with lock:
+            total = len(buffer)
+            first = 0 if count is None else max(0, total - count)
+            return [buffer[i] for i in range(first, total)]
+    
+    @traced()
+    def start_n8n(self):
+        """n8n'i (ve kuyruk modundaki tüm kopyaları) başlat"""
+        try:
+            started = [name for name in list(self.n8n_instances) if self._start_n8n_instance(name)]
+            if started:
+                self.notify("n8n", "n8n başlatıldı", "Information")
             else:
-                if self.tray:
-                    self.tray.showMessage("n8n", "Zaten çalışıyor.", QtWidgets.QSystemTrayIcon.Warning)
+                self.notify("n8n", "Zaten çalışıyor.", "Warning")
                 self.log_append("n8n zaten çalışıyor")
         except Exception as e:
             self.log_append(f"n8n başlatma hatası: {e}")
-            if self.tray:
-                self.tray.showMessage("Hata", f"n8n başlatılamadı: {e}", QtWidgets.QSystemTrayIcon.Critical)
+            self.notify("Hata", f"n8n başlatılamadı: {e}", "Critical")
     
+    @traced(arg="name")
+    def _start_n8n_instance(self, name):
+        """Tek bir n8n kopyasını kendi port ve ortamıyla başlat; zaten etkinse False"""
+        instance = self.n8n_instances.get(name)
+        if instance is None or instance.retired:
+            return False
+        
+        # PowerShell yerine n8n komutunu doğrudan çağırıyoruz
+        # G/Ç motoru CREATE_NO_WINDOW ile konsol penceresinin açılmasını engeller
+        if not self._start_service(name, instance.role.command, shell=True, env=instance.env()):
+            return False
+        
+        self.log_append(f"{instance.display_name} başlatıldı (port {instance.port}), hazır olması bekleniyor")
+        
+        # Editör, webhook dinleyicisi veya worker sağlık ucu cevap verene kadar RUNNING'de kalır
+        self._probe_readiness(name, ReadinessProbe(config.N8N_HOST, instance.port))
+        return True
+    
+    @traced()
     def stop_n8n(self):
-        """n8n'i durdur"""
-        if self.n8n_process:
-            # GUI donmasını engellemek için thread'de durdur
-            threading.Thread(target=self._stop_n8n_worker, daemon=True).start()
-        else:
-            if self.tray:
-                self.tray.showMessage("n8n", "n8n zaten durduruldu.", QtWidgets.QSystemTrayIcon.Warning)
+        """n8n'i (ve tüm kopyalarını) durdur"""
+        stopped = [name for name in list(self.n8n_instances) if self._stop_n8n_instance(name)]
+        if not stopped:
+            self.notify("n8n", "n8n zaten durduruldu.", "Warning")
             self.log_append("n8n zaten durduruldu")
+        return stopped
     
-    def _stop_n8n_worker(self):
-        """n8n'i durduran worker thread"""
-        try:
-            if self.n8n_process:
-                try:
-                    # /F: Zorla kapat, /T: Alt süreçleri de kapat (Tree kill)
-                    # CREATE_NO_WINDOW bayrağı ekle
-                    subprocess.call(
-                        ['taskkill', '/F', '/T', '/PID', str(self.n8n_process.pid)],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    self.n8n_process = None
-                    self.log_append("n8n durduruldu (süreç ağacı temizlendi)")
-                    
-                    if self.update_status_callback:
-                        self.update_status_callback()
-                except Exception as e:
-                    self.log_append(f"n8n durdurma hatası: {e}")
-        except Exception as e:
-            self.log_append(f"n8n durdurma hatası: {e}")
+    @traced(arg="name")
+    def _stop_n8n_instance(self, name):
+        # n8n SIGTERM/CTRL_BREAK ile devam eden yürütmeleri bitirip kapanır
+        return self._stop_service(
+            name, lambda process: self._stop_worker(name, process, config.N8N_STOP_DRAIN_TIMEOUT_S)
+        )
     
+    @traced(arg="role_name")
+    def scale_role(self, role_name, count):
+        """Rolün kopya sayısını değiştir; yeni sayıyı döndür
+        
+        Yeni kopyalar, ana n8n çalışıyorsa hemen başlatılır. Fazla kopyalar
+        en yüksek sıra numarasından başlayarak durdurulur ve çıkınca kaldırılır.
+        """
+        role = self.n8n_roles[role_name]
+        if not role.scalable:
+            return role.replicas
+        count = max(0, min(int(count), role.max_replicas))
+        
+        with self._scale_lock:
+            current = self.role_instances(role_name)
+            old_count = len(current)
+            added, retired = [], []
+            if count > old_count:
+                used = {i.index for i in self.n8n_instances.values() if i.role is role}
+                index = 1
+                for _ in range(count - old_count):
+                    while index in used:
+                        index += 1
+                    used.add(index)
+                    added.append(self._add_n8n_instance(role, index))
+            else:
+                retired = current[count:]
+                for instance in retired:
+                    instance.retired = True
+            role.replicas = count
+        
+        if count != old_count:
+            self.log_append(f"n8n {role.display_name} kopya sayısı: {old_count} → {count}")
+            self.state_bus.services_changed.emit()
+        
+        main_active = self.services["n8n"].is_active()
+        for instance in added:
+            if main_active:
+                self._start_n8n_instance(instance.name)
+        for instance in retired:
+            if not self._stop_n8n_instance(instance.name):
+                service = self.services.get(instance.name)
+                if service is not None and service.state in (ServiceState.STOPPED, ServiceState.CRASHED):
+                    self._remove_service(instance.name)
+        return count
+    
+    @traced()
     def start_cloudflare(self):
         """Cloudflare tünelini başlat"""
         try:
-            if self.cloudflare_process is None:
-                # C:\Cloudflare dizininde config dosyasını ara
-                config_path = r"C:\Cloudflare\config.yml"
-                
-                # ÖNEMLİ: Aşağıdaki tunnel ID'yi kendi Cloudflare tunnel ID'niz ile değiştirin!
-                # Tunnel ID'nizi Cloudflare Zero Trust Dashboard'dan alabilirsiniz.
-                self.cloudflare_process = subprocess.Popen(
-                    [
-                        r"C:\Cloudflare\cloudflared.exe",
-                        "tunnel",
-                        "--config",
-                        config_path,
-                        "run",
-                        "a3dac910-040d-4f2e-95e9-169ebdb99649"  # BURAYA KENDİ TUNNEL ID'NİZİ YAZIN
-                    ],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
+            # C:\Cloudflare dizininde config dosyasını ara
+            config_path = r"C:\Cloudflare\config.yml"
+            
+            # ÖNEMLİ: Aşağıdaki tunnel ID'yi kendi Cloudflare tunnel ID'niz ile değiştirin!
+            # Tunnel ID'nizi Cloudflare Zero Trust Dashboard'dan alabilirsiniz.
+            started = self._start_service(
+                "CF",
+                [
+                    r"C:\Cloudflare\cloudflared.exe",
+                    "tunnel",
+                    "--config",
+                    config_path,
+                    "run",
+                    "a3dac910-040d-4f2e-95e9-169ebdb99649"  # BURAYA KENDİ TUNNEL ID'NİZİ YAZIN
+                ],
+            )
 
-                if self.tray:
-                    self.tray.showMessage(
-                        "Cloudflare",
-                        "Cloudflare Tüneli başlatıldı",
-                        QtWidgets.QSystemTrayIcon.Information
-                    )
+            if started:
+                self.notify("Cloudflare", "Cloudflare Tüneli başlatıldı", "Information")
 
                 self.log_append("Cloudflare Tüneli başlatıldı")
-                threading.Thread(
-                    target=self.poll_process,
-                    args=(self.cloudflare_process, "CF"),
-                    daemon=True
-                ).start()
-
-                if self.update_status_callback:
-                    self.update_status_callback()
 
             else:
-                if self.tray:
-                    self.tray.showMessage(
-                        "Cloudflare",
-                        "Cloudflare zaten çalışıyor",
-                        QtWidgets.QSystemTrayIcon.Warning
-                    )
+                self.notify("Cloudflare", "Cloudflare zaten çalışıyor", "Warning")
                 self.log_append("Cloudflare zaten çalışıyor")
 
         except Exception as e:
             self.log_append(f"Cloudflare başlatma hatası: {e}")
-            if self.tray:
-                self.tray.showMessage(
-                    "Hata",
-                    f"Cloudflare başlatılamadı: {e}",
-                    QtWidgets.QSystemTrayIcon.Critical
-                )
+            self.notify("Hata", f"Cloudflare başlatılamadı: {e}", "Critical")
 
     
+    @traced()
     def stop_cloudflare(self):
         """Cloudflare tünelini durdur"""
-        if self.cloudflare_process:
-            # GUI donmasını engellemek için thread'de durdur
-            threading.Thread(target=self._stop_cloudflare_worker, daemon=True).start()
-        else:
-            if self.tray:
-                self.tray.showMessage("Cloudflare", "Zaten durduruldu.", QtWidgets.QSystemTrayIcon.Warning)
+        if not self._stop_service("CF", self._stop_cloudflare_worker):
+            self.notify("Cloudflare", "Zaten durduruldu.", "Warning")
             self.log_append("Cloudflare zaten durduruldu")
+            return False
+        return True
     
-    def _stop_cloudflare_worker(self):
+    def _stop_cloudflare_worker(self, process):
         """Cloudflare'i durduran worker thread"""
+        self._stop_worker("CF", process, config.CF_STOP_DRAIN_TIMEOUT_S)
+    
+    @traced(arg="name")
+    def _stop_worker(self, name, process, drain_timeout):
+        """Nazik sinyal, boşaltma beklemesi ve gerekirse ağaç sonlandırma (worker thread'de)"""
+        service = self.services[name]
         try:
-            if self.cloudflare_process:
-                try:
-                    # Cloudflare için de süreç ağacını temizle
-                    # CREATE_NO_WINDOW bayrağı ekle
-                    subprocess.call(
-                        ['taskkill', '/F', '/T', '/PID', str(self.cloudflare_process.pid)],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    self.cloudflare_process = None
-                    self.log_append("Cloudflare durduruldu (süreç ağacı temizlendi)")
-                    
-                    if self.update_status_callback:
-                        self.update_status_callback()
-                except Exception as e:
-                    self.log_append(f"Cloudflare durdurma hatası: {e}")
+            result = stop_process(process, drain_timeout)
+            if not result.exited:
+                self.log_append(f"{service.display_name} durdurulamadı ({result.summary()})")
+            elif result.kill_time is not None:
+                self.log_append(
+                    f"{service.display_name} {drain_timeout:.0f} sn içinde kapanmadı, "
+                    f"süreç ağacı zorla sonlandırıldı ({result.summary()})"
+                )
+            else:
+                self.log_append(f"{service.display_name} nazikçe kapandı ({result.summary()})")
+            # STOPPED geçişi süreç çıkış olayı ile gelir
         except Exception as e:
-            self.log_append(f"Cloudflare durdurma hatası: {e}")
+            self.log_append(f"{service.display_name} durdurma hatası: {e}")
+    
+    def start_service(self, name):
+        """Servisi adıyla başlat"""
+        if name in self.n8n_instances:
+            self._start_n8n_instance(name)
+        elif name == "CF":
+            self.start_cloudflare()
+    
+    def service_state(self, name):
+        """Servisin güncel durumu"""
+        return self.services[name].state
     
     def is_n8n_running(self):
-        """n8n çalışıyor mu?"""
-        return self.n8n_process is not None
+        """n8n (ana süreç) çalışıyor mu?"""
+        return self.services["n8n"].is_active()
     
     def is_cloudflare_running(self):
         """Cloudflare çalışıyor mu?"""
-        return self.cloudflare_process is not None
+        return self.services["CF"].is_active()
+    
+    def export_trace(self, path=None):
+        """İzleme tamponunu Chrome trace JSON'u olarak arka plan thread'inde yaz"""
+        path = path or default_trace_path()
+        
+        def worker():
+            try:
+                count = tracer.export(path)
+                self.log_append(f"İz kaydı yazıldı: {path} ({count} olay)")
+            except Exception as e:
+                self.log_append(f"İz kaydı yazılamadı: {e}")
+        
+        threading.Thread(target=worker, daemon=True).start()
+        return path
     
+    @traced()
     def emergency_kill_all(self):
-        """ACİL: Tüm node.exe süreçlerini zorla sonlandır"""
+        """ACİL: Başlattığımız tüm n8n süreç ağaçlarını zorla sonlandır"""
         try:
-            # node.exe süreçlerini bul ve sonlandır
-            result = subprocess.run(
-                ['tasklist', '/FI', 'IMAGENAME eq node.exe', '/FO', 'CSV', '/NH'],
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+            targets = []
+            for name, service in self.services.items():
+                process = service.process
+                if name in self.n8n_instances and process is not None:
+                    targets.append((service, process))
             
-            if 'node.exe' in result.stdout:
-                subprocess.run(
-                    ['taskkill', '/F', '/IM', 'node.exe'], 
-                    stdout=subprocess.DEVNULL, 
-                    stderr=subprocess.DEVNULL,
-                    creationflags=subprocess.CREATE_NO_WINDOW
+            if targets:
+                started = time.perf_counter()
+                roots = []
+                for service, process in targets:
+                    roots.append(process.pid)
+                    # Çıkış olayı n8n'i CRASHED yerine STOPPED'a taşısın
+                    service.transition(
+                        ServiceState.STOPPING,
+                        expected={ServiceState.STARTING, ServiceState.RUNNING, ServiceState.READY},
+                    )
+                # Yalnızca bizim başlattığımız süreçlerin alt ağaçları hedeflenir (tek anlık görüntü)
+                found, killed = proc_tree.kill_tree(roots)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.log_append(
+                    f"ACİL: {len(targets)} n8n süreç ağacı zorla sonlandırıldı "
+                    f"({killed}/{found} süreç, {elapsed_ms:.1f} ms)"
                 )
-                self.log_append("ACİL: Tüm node.exe süreçleri zorla sonlandırıldı")
-                
-                # Global değişkeni temizle
-                self.n8n_process = None
-                
-                if self.update_status_callback:
-                    self.update_status_callback()
                 
-                if self.tray:
-                    self.tray.showMessage("Acil Durdurma", "Tüm node.exe süreçleri sonlandırıldı", QtWidgets.QSystemTrayIcon.Warning)
+                self.notify("Acil Durdurma", "n8n süreç ağacı sonlandırıldı", "Warning")
             else:
-                self.log_append("Aktif node.exe süreç bulunamadı")
-                if self.tray:
-                    self.tray.showMessage("Acil Durdurma", "Aktif node.exe bulunamadı", QtWidgets.QSystemTrayIcon.Information)
+                self.log_append("Aktif n8n süreci bulunamadı")
+                self.notify("Acil Durdurma", "Aktif n8n süreci bulunamadı", "Information")
         
         except Exception as e:
             self.log_append(f"Acil durdurma hatası: {e}")
-            if self.tray:
-                self.tray.showMessage("Hata", f"Acil durdurma hatası: {e}", QtWidgets.QSystemTrayIcon.Critical)
+            self.notify("Hata", f"Acil durdurma hatası: {e}", "Critical")
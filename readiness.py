@@ -0,0 +1,89 @@
+"""
+n8n Tray - Hazırlık Kontrolü
+Bu modül bir servisin trafik kabul etmeye başladığını TCP ve HTTP ile doğrular.
+"""
+
+import asyncio
+import time
+
+import config
+
+
+class ReadinessProbe:
+    """Uyarlamalı geri çekilme ile TCP bağlantısı ve HTTP sağlık kontrolü
+
+    Önce porta TCP bağlantısı denenir; bağlantı kurulursa aynı bağlantı
+    üzerinden sağlık yoluna GET isteği yapılır ve 2xx yanıt beklenir.
+    Başarısız her denemeden sonra bekleme süresi çarpanla büyür; ilk TCP
+    bağlantısı kurulduğunda ise süreç neredeyse hazır olduğundan bekleme
+    başlangıç değerine döner.
+    """
+
+    def __init__(self, host, port, path=None, initial_delay=None, max_delay=None,
+                 timeout=None, request_timeout=None):
+        self.host = host
+        self.port = port
+        self.path = path or config.N8N_HEALTH_PATH
+        self.initial_delay = initial_delay or config.READY_PROBE_INITIAL_DELAY_S
+        self.max_delay = max_delay or config.READY_PROBE_MAX_DELAY_S
+        self.timeout = timeout or config.READY_PROBE_TIMEOUT_S
+        self.request_timeout = request_timeout or config.READY_PROBE_REQUEST_TIMEOUT_S
+        self.attempts = 0
+
+    async def check(self):
+        """Tek deneme: ("down" | "tcp" | "ready") döndür"""
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.request_timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return "down"
+
+        try:
+            request = (
+                f"GET {self.path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(request.encode("ascii"))
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.request_timeout)
+            parts = status_line.split()
+            if len(parts) >= 2 and parts[1][:1] == b"2":
+                return "ready"
+            return "tcp"
+        except (OSError, asyncio.TimeoutError, ValueError):
+            return "tcp"
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def wait_ready(self, is_alive=lambda: True):
+        """Hazır olana kadar dene; geçen süreyi (sn) veya başarısızlıkta None döndür
+
+        is_alive False döndürürse (süreç kapandıysa) hemen vazgeçilir.
+        """
+        started = time.monotonic()
+        delay = self.initial_delay
+        tcp_seen = False
+
+        while is_alive():
+            self.attempts += 1
+            result = await self.check()
+            if result == "ready":
+                return time.monotonic() - started
+
+            if result == "tcp" and not tcp_seen:
+                tcp_seen = True
+                delay = self.initial_delay
+            else:
+                delay = min(delay * 1.5, self.max_delay)
+
+            if time.monotonic() - started + delay > self.timeout:
+                return None
+            await asyncio.sleep(delay)
+
+        return None
@@ -0,0 +1,112 @@
+"""
+n8n Tray - Kaynak Örnekleyici
+Bu modül izlenen süreç ağaçlarının CPU ve bellek kullanımını arka planda örnekler.
+"""
+
+import collections
+import threading
+import time
+from PyQt5 import QtCore
+
+import config
+import proc_tree
+
+
+class ResourceSample:
+    """Bir servis ağacının tek ölçümü"""
+    __slots__ = ("ts", "cpu_percent", "rss", "processes")
+
+    def __init__(self, ts, cpu_percent, rss, processes):
+        self.ts = ts
+        self.cpu_percent = cpu_percent  # Tek çekirdeğe göre yüzde (çok çekirdekte 100'ü aşabilir)
+        self.rss = rss  # Bayt
+        self.processes = processes
+
+
+class ResourceSampler(QtCore.QObject):
+    """Her turda tek süreç anlık görüntüsüyle tüm servis ağaçlarını ölçen sınıf
+
+    roots_callback {servis adı: kök pid} döndürür. Ölçümler servis başına
+    sabit boyutlu halka tamponda tutulur ve her turun sonunda sampled
+    sinyali ile yayımlanır. Tampona ekleme ve kopyalama aynı kilitle
+    yapılır; series() GUI thread'inden güvenle çağrılabilir. Yardımcı
+    süreç başlatılmaz.
+    """
+    sampled = QtCore.pyqtSignal(dict)  # servis adı -> ResourceSample (kapalıysa None)
+
+    def __init__(self, roots_callback, interval=None, history=None, parent=None):
+        super().__init__(parent)
+        self.roots_callback = roots_callback
+        self.interval = interval or config.SAMPLER_INTERVAL_S
+        self.history_size = history or config.SAMPLER_HISTORY
+        self.history = {}
+        self._history_lock = threading.Lock()  # history sözlüğü ve tamponları için
+        self._last_cpu = {}  # servis adı -> (kök pid, CPU sn, monotonic)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def series(self, name):
+        """Servisin örnek geçmişi (eskiden yeniye)"""
+        with self._history_lock:
+            return list(self.history.get(name, ()))
+
+    def latest(self, name):
+        """Servisin son örneği (yoksa None)"""
+        with self._history_lock:
+            history = self.history.get(name)
+            return history[-1] if history else None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sample_once()
+            except Exception as e:
+                print(f"Kaynak örnekleme hatası: {e}")
+
+    def sample_once(self):
+        """Tek tur ölçüm yap ve yayımla"""
+        roots = self.roots_callback()
+        if not any(roots.values()):
+            # Hiçbir servis çalışmıyor: /proc taranmaz
+            self._last_cpu.clear()
+            samples = {name: None for name in roots}
+            self.sampled.emit(samples)
+            return samples
+
+        snap = proc_tree.snapshot(with_usage=True)
+        now = time.monotonic()
+        wall = time.time()
+        samples = {}
+
+        for name, pid in roots.items():
+            if pid is None or pid not in snap.processes:
+                self._last_cpu.pop(name, None)
+                samples[name] = None
+                continue
+
+            cpu, rss, count = snap.tree_usage([pid])
+            cpu_percent = 0.0
+            last = self._last_cpu.get(name)
+            if last and last[0] == pid and now > last[2]:
+                # Kapanan alt süreçlerin CPU süresi düşebilir; negatif değer gösterme
+                cpu_percent = max(0.0, (cpu - last[1]) / (now - last[2]) * 100)
+            self._last_cpu[name] = (pid, cpu, now)
+
+            sample = ResourceSample(wall, cpu_percent, rss, count)
+            with self._history_lock:
+                history = self.history.get(name)
+                if history is None:
+                    history = self.history[name] = collections.deque(maxlen=self.history_size)
+                history.append(sample)
+            samples[name] = sample
+
+        self.sampled.emit(samples)
+        return samples
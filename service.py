@@ -0,0 +1,133 @@
+"""
+n8n Tray - Servis Durumu
+Bu modül servis başına durum makinesini ve durum değişikliği sinyalini içerir.
+"""
+
+import threading
+import time
+from PyQt5 import QtCore
+
+from tracing import tracer
+
+
+class ServiceState:
+    """Servis durumları"""
+    STOPPED = "stopped"
+    STARTING = "starting"
+    RUNNING = "running"  # Süreç ayakta, henüz trafik kabul ettiği doğrulanmadı
+    READY = "ready"  # Hazırlık kontrolü geçti
+    STOPPING = "stopping"
+    CRASHED = "crashed"
+
+    # Kullanıcıya gösterilen adlar
+    LABELS = {
+        STOPPED: "Durduruldu",
+        STARTING: "Başlatılıyor",
+        RUNNING: "Çalışıyor",
+        READY: "Hazır",
+        STOPPING: "Durduruluyor",
+        CRASHED: "Çöktü",
+    }
+
+    # İzin verilen geçişler
+    TRANSITIONS = {
+        STOPPED: {STARTING},
+        CRASHED: {STARTING, STOPPED},
+        STARTING: {RUNNING, STOPPING, CRASHED, STOPPED},
+        RUNNING: {READY, STOPPING, CRASHED},
+        # Hazır servis RUNNING'e geri düşmez (sürekli sağlık kontrolü yok); yalnızca durur veya çöker
+        READY: {STOPPING, CRASHED},
+        STOPPING: {STOPPED, CRASHED},
+    }
+
+    # Süreci ayakta olan (veya ayağa kalkmakta olan) durumlar
+    ACTIVE = {STARTING, RUNNING, READY, STOPPING}
+
+
+class ServiceStateBus(QtCore.QObject):
+    """Tüm servislerin durum değişikliklerini yayımlayan tek sinyal
+
+    Herhangi bir thread'den yayımlanabilir; GUI ve tepsi gibi ana thread'deki
+    aboneler sinyali Qt kuyruğu üzerinden alır.
+    """
+    state_changed = QtCore.pyqtSignal(str, str, str)  # servis, eski durum, yeni durum
+    services_changed = QtCore.pyqtSignal()  # Servis eklendi veya kaldırıldı (ölçekleme)
+
+
+class Service:
+    """Tek bir yönetilen servisin durumu ve süreç tutamacı"""
+
+    def __init__(self, name, display_name, bus, ready_state=ServiceState.RUNNING):
+        self.name = name
+        self.display_name = display_name
+        self.bus = bus
+        # Servisin "ayakta" sayıldığı durum (hazırlık kontrolü olanlarda READY)
+        self.ready_state = ready_state
+        self.state = ServiceState.STOPPED
+        self.process = None
+        self.changed_at = time.monotonic()
+        self.started_at = None  # Son başlatma isteğinin zamanı (monotonic)
+        self.time_to_ready = None  # Son başlatmada hazır olma süresi (sn)
+        self._lock = threading.Lock()
+
+    def is_active(self):
+        return self.state in ServiceState.ACTIVE
+
+    def label(self):
+        return ServiceState.LABELS[self.state]
+
+    def transition(self, new_state, expected=None):
+        """Durumu değiştir ve yayımla; geçiş geçersizse False döndür
+
+        expected verilirse yalnızca mevcut durum bunlardan biriyse geçilir.
+        """
+        with self._lock:
+            old_state = self.state
+            if expected is not None and old_state not in expected:
+                return False
+            if new_state not in ServiceState.TRANSITIONS[old_state]:
+                return False
+            self.state = new_state
+            self.changed_at = time.monotonic()
+            if new_state in (ServiceState.STOPPED, ServiceState.CRASHED):
+                self.process = None
+
+        tracer.instant("state", "service", service=self.name, old=old_state, new=new_state)
+        self.bus.state_changed.emit(self.name, old_state, new_state)
+        return True
+
+    def begin_start(self):
+        """Başlatmayı rezerve et; servis zaten etkinse False döndür"""
+        if not self.transition(ServiceState.STARTING):
+            return False
+        self.started_at = self.changed_at
+        self.time_to_ready = None
+        return True
+
+    def mark_ready(self):
+        """Hazırlık kontrolü geçti: READY'ye geç ve hazır olma süresini kaydet"""
+        # Abonelerin sinyalde süreyi görebilmesi için geçişten önce yazılır
+        self.time_to_ready = time.monotonic() - self.started_at
+        if not self.transition(ServiceState.READY, expected={ServiceState.RUNNING}):
+            self.time_to_ready = None
+            return None
+        return self.time_to_ready
+
+    def attach(self, process):
+        """Başlatılan süreci bağla ve RUNNING'e geç"""
+        with self._lock:
+            self.process = process
+        return self.transition(ServiceState.RUNNING, expected={ServiceState.STARTING})
+
+    def process_exited(self, process):
+        """Süreç çıkış olayı: STOPPING'deyse STOPPED, değilse CRASHED
+
+        Bu servise ait olmayan (eski) bir tutamaç için None döndürür.
+        """
+        with self._lock:
+            if self.process is not process:
+                return None
+            stopping = self.state == ServiceState.STOPPING
+        new_state = ServiceState.STOPPED if stopping else ServiceState.CRASHED
+        self.transition(new_state)
+        return new_state
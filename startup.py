@@ -0,0 +1,190 @@
+"""
+n8n Tray - Toplu Başlatma
+Bu modül servisleri bağımlılık grafiğine göre, birbirini beklemeyenleri paralel olarak başlatır.
+"""
+
+import time
+from PyQt5 import QtCore
+
+import config
+from service import ServiceState
+
+
+class StartupStep:
+    """Toplu başlatmadaki tek servisin zaman çizelgesi (plan başlangıcına göre sn)"""
+
+    def __init__(self, name, depends_on):
+        self.name = name
+        self.depends_on = depends_on
+        self.started = None
+        self.ready = None
+        self.failed = None  # Başarısızlık nedeni
+
+    @property
+    def duration(self):
+        if self.started is None or self.ready is None:
+            return None
+        return self.ready - self.started
+
+
+class StackStarter(QtCore.QObject):
+    """Bağımlılıkları hazır olan servisleri başlatıp tüm yığının hazır olma süresini ölçen sınıf
+
+    Bağımlılığı olmayan servisler hemen, diğerleri bağımlılıklarının hepsi
+    hazır durumuna geçtiği anda başlatılır; bu yüzden toplam süre adımların
+    toplamı değil, en uzun yolun süresidir. Durum değişiklikleri ana
+    thread'de alınır. Çöken servisi denetçi yeniden başlatır; plan yalnızca
+    servis durdurulursa, çökme döngüsüne girerse veya süre aşılırsa o
+    servisi ve ona bağlı olanları başarısız sayar.
+    """
+    finished = QtCore.pyqtSignal(float, dict)  # toplam süre, servis adı -> StartupStep
+
+    def __init__(self, process_manager, dependencies=None, timeout=None, parent=None):
+        super().__init__(parent)
+        self.process_manager = process_manager
+        self.dependencies = config.STARTUP_DEPENDENCIES if dependencies is None else dependencies
+        self.timeout = timeout or config.STARTUP_TIMEOUT_S
+        self.steps = {}
+        self.started_at = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+        process_manager.state_bus.state_changed.connect(self.on_state_changed)
+        process_manager.supervisor.crash_loop.connect(self.on_crash_loop)
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def depends_on(self, name):
+        """Servisin bağımlılıkları (servis adına, yoksa n8n rol adına göre)"""
+        if name in self.dependencies:
+            return tuple(self.dependencies[name])
+        instance = self.process_manager.n8n_instances.get(name)
+        if instance is not None:
+            return tuple(self.dependencies.get(instance.role.name, ()))
+        return ()
+
+    def plan(self):
+        """Mevcut servisler için başlatma adımları; plan dışı bağımlılıklar yok sayılır"""
+        names = list(self.process_manager.services)
+        steps = {}
+        for name in names:
+            deps = tuple(dep for dep in self.depends_on(name) if dep in names and dep != name)
+            steps[name] = StartupStep(name, deps)
+        return steps
+
+    def start(self):
+        """Toplu başlatmayı başlat; zaten sürüyorsa False döndür"""
+        if self.running:
+            return False
+        self.steps = self.plan()
+        self.started_at = time.monotonic()
+        self._timer.start(int(self.timeout * 1000))
+        self.process_manager.log_append(f"Toplu başlatma: {len(self.steps)} servis")
+        self._advance()
+        return True
+
+    def _elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def _is_ready(self, name):
+        service = self.process_manager.services.get(name)
+        return service is not None and service.state == service.ready_state
+
+    def _advance(self):
+        """Hazır olanları işaretle, bağımlılıkları tamamlananları başlat, bitti mi bak"""
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps.values():
+                if step.ready is not None or step.failed:
+                    continue
+                if self._is_ready(step.name):
+                    step.ready = self._elapsed()
+                    if step.started is None:
+                        step.started = step.ready  # Zaten çalışıyordu
+                    changed = True
+                    continue
+                if step.started is not None:
+                    continue
+                failed_dep = next((d for d in step.depends_on if self.steps[d].failed), None)
+                if failed_dep is not None:
+                    step.failed = f"{failed_dep} başarısız"
+                    changed = True
+                elif all(self.steps[d].ready is not None for d in step.depends_on):
+                    self._start_step(step)
+                    changed = True
+
+        if all(step.ready is not None or step.failed for step in self.steps.values()):
+            self._finish()
+
+    def _start_step(self, step):
+        step.started = self._elapsed()
+        service = self.process_manager.services.get(step.name)
+        if service is None:
+            step.failed = "kaldırıldı"
+            return
+        if service.is_active():
+            return  # Başlıyor veya hazır olmayı bekliyor
+        try:
+            self.process_manager.start_service(step.name)
+        except Exception as e:
+            step.failed = str(e)
+            return
+        if not service.is_active():
+            step.failed = "başlatılamadı"
+
+    def on_state_changed(self, name, old_state, new_state):
+        if not self.running or name not in self.steps:
+            return
+        step = self.steps[name]
+        if new_state == ServiceState.STOPPING and step.ready is None and not step.failed:
+            step.failed = "durduruldu"
+        self._advance()
+
+    def on_crash_loop(self, name, restarts):
+        if self.running and name in self.steps and self.steps[name].ready is None:
+            self.steps[name].failed = "çökme döngüsü"
+            self._advance()
+
+    def _on_timeout(self):
+        if not self.running:
+            return
+        for step in self.steps.values():
+            if step.ready is None and not step.failed:
+                step.failed = "zaman aşımı"
+        self._advance()
+
+    def critical_path(self):
+        """En son hazır olan servisten geriye, en geç hazır olan bağımlılıkları izleyen yol"""
+        ready = [step for step in self.steps.values() if step.ready is not None]
+        if not ready:
+            return []
+        step = max(ready, key=lambda s: s.ready)
+        path = [step]
+        while step.depends_on:
+            step = max((self.steps[d] for d in step.depends_on), key=lambda s: s.ready or 0)
+            path.append(step)
+        return list(reversed(path))
+
+    def _finish(self):
+        self._timer.stop()
+        total = self._elapsed()
+        steps = self.steps
+        self.started_at = None
+
+        failed = [step for step in steps.values() if step.failed]
+        sequential = sum(step.duration or 0 for step in steps.values())
+        path = " → ".join(
+            f"{step.name} {step.duration:.1f} sn" for step in self.critical_path()
+            if step.duration is not None
+        )
+        summary = f"Toplu başlatma {total:.2f} sn'de tamamlandı (sıralı başlatma {sequential:.1f} sn sürerdi"
+        if path:
+            summary += f"; en uzun yol: {path}"
+        summary += ")"
+        self.process_manager.log_append(summary)
+        for step in failed:
+            self.process_manager.log_append(f"Toplu başlatma: {step.name} başarısız ({step.failed})")
+        self.finished.emit(total, steps)
@@ -1,6 +1,10 @@
 """
 n8n Tray - Stil Tanımlamaları
-Bu modül tüm CSS stillerini ve renk paletini içerir.
+Bu modül renk paletini ve uygulama genelindeki tek stil sayfasını içerir.
+
+Bileşenler kendi stil sayfalarını almaz; "role" özelliği ile sınıflandırılır
+ve durum değişiklikleri yalnızca "state"/"invalid" gibi dinamik özellikleri
+değiştirir (bkz. gui.set_state). Böylece Qt stil sayfasını bir kez ayrıştırır.
 """
 
 # Renk Paleti - Modern & Sade (#121212 Bazlı)
@@ -15,6 +19,13 @@ COLORS = {
     'accent_red': '#fa003f',
 }
 
+# Log seviyelerine göre satır rengi (INFO varsayılan metin rengiyle çizilir)
+LOG_LEVEL_COLORS = {
+    'ERROR': COLORS['accent_red'],
+    'WARN': '#d7a54a',
+    'DEBUG': COLORS['text_secondary'],
+}
+
 # Ana Pencere Stili
 WINDOW_STYLE = """
     QWidget {
@@ -26,42 +37,84 @@ WINDOW_STYLE = """
 
 # Header Stili - Modern
 HEADER_STYLE = """
-    font-size: 18px;
-    font-weight: 600;
-    color: #e8e8e8;
-    padding: 12px 0;
-    border-bottom: 1px solid #1f1f1f;
-    letter-spacing: -0.3px;
+    QLabel[role="header"] {
+        font-size: 18px;
+        font-weight: 600;
+        color: #e8e8e8;
+        padding: 12px 0;
+        border-bottom: 1px solid #1f1f1f;
+        letter-spacing: -0.3px;
+    }
 """
 
-# Status Indicator - Çalışıyor (Yeşil) - Modern Card
-STATUS_RUNNING_STYLE = """
-    color: #2e6f40;
-    font-size: 13px;
-    font-weight: 500;
-    padding: 10px 14px;
-    background: #1a1a1a;
-    border: 1px solid #2e6f40;
-    border-radius: 6px;
+# Status Indicator - Modern Card; renk state özelliğine göre
+# (running: çalışıyor/hazır, pending: başlatılıyor/durduruluyor, stopped: kapalı/çöktü)
+STATUS_STYLE = """
+    QLabel[role="status"] {
+        color: #fa003f;
+        font-size: 13px;
+        font-weight: 500;
+        padding: 10px 14px;
+        background: #1a1a1a;
+        border: 1px solid #fa003f;
+        border-radius: 6px;
+    }
+    QLabel[role="status"][state="running"] {
+        color: #2e6f40;
+        border: 1px solid #2e6f40;
+    }
+    QLabel[role="status"][state="pending"] {
+        color: #a8a8a8;
+        border: 1px solid #a8a8a8;
+    }
 """
 
-# Status Indicator - Kapalı (Kırmızı) - Modern Card
-STATUS_STOPPED_STYLE = """
-    color: #fa003f;
-    font-size: 13px;
-    font-weight: 500;
-    padding: 10px 14px;
-    background: #1a1a1a;
-    border: 1px solid #fa003f;
-    border-radius: 6px;
+# Kaynak Kullanımı (CPU/RSS) Satırı
+USAGE_LABEL_STYLE = """
+    QLabel[role="usage"] {
+        color: #a8a8a8;
+        font-size: 11px;
+        padding: 0 2px;
+    }
 """
 
-# Status Indicator - Cloudflare Çalışıyor
-STATUS_CF_RUNNING_STYLE = STATUS_RUNNING_STYLE
+# Log kuyruğunda atlanan satır uyarısı
+LOG_DROP_STYLE = """
+    QLabel[role="log-drop"] {
+        color: #d7a54a;
+        font-size: 11px;
+    }
+"""
+
+# n8n Kopya Satırı (kuyruk modu)
+REPLICA_STYLE = """
+    QLabel[role="replica-role"] {
+        color: #a8a8a8;
+        font-size: 12px;
+    }
+    QSpinBox[role="replica-count"] {
+        background: #1a1a1a;
+        color: #e8e8e8;
+        border: 1px solid #2a2a2a;
+        border-radius: 4px;
+        padding: 2px 4px;
+        font-size: 12px;
+    }
+    QLabel[role="replica-dot"] {
+        color: #fa003f;
+        font-size: 14px;
+    }
+    QLabel[role="replica-dot"][state="running"] {
+        color: #2e6f40;
+    }
+    QLabel[role="replica-dot"][state="pending"] {
+        color: #a8a8a8;
+    }
+"""
 
-# Buton Stili - Modern Minimal
-BUTTON_STYLE_START = """
-    QPushButton {
+# Buton Stili - Modern Minimal (Başlat/Durdur)
+BUTTON_STYLE_ACTION = """
+    QPushButton[role="action"] {
         background: #1f1f1f;
         color: #e8e8e8;
         border: 1px solid #2a2a2a;
@@ -71,29 +124,29 @@ BUTTON_STYLE_START = """
         font-weight: 500;
         min-height: 34px;
     }
-    QPushButton:hover {
+    QPushButton[role="action"]:hover {
         background: #252525;
         border: 1px solid #333333;
     }
-    QPushButton:pressed {
+    QPushButton[role="action"]:pressed {
         background: #1a1a1a;
     }
 """
 
-BUTTON_STYLE_STOP = BUTTON_STYLE_START
-
 # Log Header Stili
 LOG_HEADER_STYLE = """
-    font-size: 13px;
-    font-weight: 600;
-    color: #a8a8a8;
-    padding: 6px 0;
-    letter-spacing: -0.2px;
+    QLabel[role="log-header"] {
+        font-size: 13px;
+        font-weight: 600;
+        color: #a8a8a8;
+        padding: 6px 0;
+        letter-spacing: -0.2px;
+    }
 """
 
 # Log Text Area Stili - Modern
 LOG_TEXT_STYLE = """
-    QTextEdit {
+    QListView[role="log"] {
         background-color: #181818;
         color: #d4d4d4;
         border: 1px solid #222222;
@@ -101,26 +154,61 @@ LOG_TEXT_STYLE = """
         padding: 10px;
         font-family: 'Cascadia Code', 'Consolas', 'Courier New', monospace;
         font-size: 11px;
-        line-height: 1.6;
+        outline: none;
     }
-    QScrollBar:vertical {
+    QListView[role="log"]::item {
+        padding: 1px 0;
+    }
+    QListView[role="log"]::item:selected {
+        background: #2a2a2a;
+        color: #e8e8e8;
+    }
+    QListView[role="log"] QScrollBar:vertical {
         background: #181818;
         width: 12px;
         border-radius: 6px;
     }
-    QScrollBar::handle:vertical {
+    QListView[role="log"] QScrollBar::handle:vertical {
         background: #2a2a2a;
         border-radius: 6px;
         min-height: 30px;
     }
-    QScrollBar::handle:vertical:hover {
+    QListView[role="log"] QScrollBar::handle:vertical:hover {
         background: #333333;
     }
 """
 
+# Log Arama/Filtre Satırı Stili; geçersiz regex invalid özelliği ile işaretlenir
+LOG_FILTER_STYLE = """
+    QLineEdit[role="filter"], QComboBox[role="filter"] {
+        background-color: #1f1f1f;
+        color: #e8e8e8;
+        border: 1px solid #2a2a2a;
+        border-radius: 4px;
+        padding: 3px 8px;
+        font-size: 11px;
+        min-height: 20px;
+    }
+    QLineEdit[role="filter"]:focus, QComboBox[role="filter"]:focus {
+        border: 1px solid #333333;
+    }
+    QLineEdit[role="filter"][invalid="true"] {
+        border: 1px solid #fa003f;
+    }
+    QComboBox[role="filter"] QAbstractItemView {
+        background-color: #1a1a1a;
+        color: #e8e8e8;
+        selection-background-color: #252525;
+    }
+    QCheckBox[role="filter"] {
+        color: #a8a8a8;
+        font-size: 11px;
+    }
+"""
+
 # Emergency Kill Button Stili
 BUTTON_STYLE_EMERGENCY = """
-    QPushButton {
+    QPushButton[role="emergency"] {
         background: #1f1f1f;
         color: #b0b0b0;
         border: 1px solid #2a2a2a;
@@ -128,18 +216,18 @@ BUTTON_STYLE_EMERGENCY = """
         padding: 6px 14px;
         font-size: 11px;
     }
-    QPushButton:hover {
+    QPushButton[role="emergency"]:hover {
         background: #252525;
         border: 1px solid #333333;
     }
-    QPushButton:pressed {
+    QPushButton[role="emergency"]:pressed {
         background: #181818;
     }
 """
 
 # Log Utility Button Stili (Clear, Save vb.)
 BUTTON_STYLE_LOG_UTILITY = """
-    QPushButton {
+    QPushButton[role="utility"] {
         background: #1f1f1f;
         color: #b0b0b0;
         border: 1px solid #2a2a2a;
@@ -147,7 +235,7 @@ BUTTON_STYLE_LOG_UTILITY = """
         padding: 4px 12px;
         font-size: 11px;
     }
-    QPushButton:hover {
+    QPushButton[role="utility"]:hover {
         background: #252525;
     }
 """
@@ -255,3 +343,21 @@ FILEDIALOG_STYLE = """
     }
 """
 
+# Uygulama genelinde tek stil sayfası (bir kez ayrıştırılır)
+APP_STYLESHEET = "".join((
+    WINDOW_STYLE,
+    HEADER_STYLE,
+    STATUS_STYLE,
+    USAGE_LABEL_STYLE,
+    LOG_DROP_STYLE,
+    REPLICA_STYLE,
+    BUTTON_STYLE_ACTION,
+    LOG_HEADER_STYLE,
+    LOG_TEXT_STYLE,
+    LOG_FILTER_STYLE,
+    BUTTON_STYLE_EMERGENCY,
+    BUTTON_STYLE_LOG_UTILITY,
+    MESSAGEBOX_STYLE,
+    MENU_STYLE,
+    FILEDIALOG_STYLE,
+))
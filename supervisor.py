@@ -0,0 +1,216 @@
+"""
+n8n Tray - Denetçi
+Bu modül çöken servisleri üstel geri çekilme ile yeniden başlatır ve kesintileri kaydeder.
+"""
+
+import collections
+import random
+import time
+from PyQt5 import QtCore
+
+import config
+from service import ServiceState
+
+
+class RestartPolicy:
+    """Yeniden başlatma kuralları"""
+
+    def __init__(self, enabled=None, base_delay=None, max_delay=None, factor=None, jitter=None,
+                 max_restarts=None, window=None, stable_after=None):
+        self.enabled = config.SUPERVISOR_AUTO_RESTART if enabled is None else enabled
+        self.base_delay = base_delay or config.RESTART_BASE_DELAY_S
+        self.max_delay = max_delay or config.RESTART_MAX_DELAY_S
+        self.factor = factor or config.RESTART_BACKOFF_FACTOR
+        self.jitter = config.RESTART_JITTER if jitter is None else jitter
+        self.max_restarts = max_restarts or config.RESTART_MAX_PER_WINDOW
+        self.window = window or config.RESTART_WINDOW_S
+        self.stable_after = stable_after or config.RESTART_STABLE_AFTER_S
+
+    def delay(self, failures):
+        """Ardışık hata sayısına göre titreşimli bekleme süresi (sn)"""
+        delay = min(self.base_delay * (self.factor ** max(failures - 1, 0)), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class Incident:
+    """Tek bir çökme olayı ve toparlanma süresi"""
+
+    def __init__(self, crashed_at):
+        self.crashed_at = crashed_at  # time.time()
+        self.recovered_at = None
+        self.restarts = 0
+
+    @property
+    def downtime(self):
+        end = self.recovered_at or time.time()
+        return end - self.crashed_at
+
+
+class ServiceRecord:
+    """Bir servisin denetim durumu ve istatistikleri"""
+
+    def __init__(self):
+        self.failures = 0  # Ardışık başarısız çalışma sayısı
+        self.restart_times = collections.deque()  # Penceredeki yeniden başlatmalar (monotonic)
+        self.restarts_total = 0
+        self.incidents = collections.deque(maxlen=100)
+        self.current_incident = None
+        self.up_since = None  # Son hazır olma zamanı (monotonic)
+        # Son RUNNING'e geçiş zamanı: hazırlık kontrolü hiç geçmezse kararlılık süresi buradan sayılır
+        self.running_since = None
+        self.pending = None  # Bekleyen yeniden başlatma zamanlayıcısı
+        self.restarting = False
+        self.gave_up = False
+        self.downtime_total = 0.0
+        self.supervised_since = time.time()
+
+
+class Supervisor(QtCore.QObject):
+    """Servis durum değişikliklerini izleyip çökenleri yeniden başlatan sınıf
+
+    Durum sinyalleri ana thread'de alınır; yeniden başlatmalar QTimer ile
+    zamanlanır. Pencere içinde izin verilenden fazla yeniden başlatma
+    gerekirse çökme döngüsü kabul edilir, denemeler durur ve crash_loop
+    sinyali yayımlanır.
+    """
+    crash_loop = QtCore.pyqtSignal(str, int)  # servis, penceredeki yeniden başlatma sayısı
+    restarted = QtCore.pyqtSignal(str, int)  # servis, toplam yeniden başlatma sayısı
+
+    def __init__(self, process_manager, policy=None, parent=None):
+        super().__init__(parent)
+        self.process_manager = process_manager
+        self.policy = policy or RestartPolicy()
+        self.records = {name: ServiceRecord() for name in process_manager.services}
+        process_manager.state_bus.state_changed.connect(self.on_state_changed)
+
+    def record(self, name):
+        return self.records.setdefault(name, ServiceRecord())
+
+    def on_state_changed(self, name, old_state, new_state):
+        """Durum geçişine göre kesinti kaydını ve yeniden başlatmayı yönet"""
+        service = self.process_manager.services.get(name)
+        if service is None:
+            return
+        record = self.record(name)
+
+        if new_state == service.ready_state:
+            self._on_up(service, record)
+        elif new_state == ServiceState.RUNNING:
+            record.running_since = time.monotonic()
+        elif new_state == ServiceState.CRASHED:
+            self._on_crash(service, record)
+        elif new_state == ServiceState.STARTING and not record.restarting:
+            # Kullanıcı elle başlattı: çökme döngüsü sayaçlarını sıfırla
+            record.failures = 0
+            record.restart_times.clear()
+            record.gave_up = False
+        elif new_state == ServiceState.STOPPING:
+            # Kullanıcı durdurdu: bekleyen yeniden başlatmayı iptal et
+            self._cancel_pending(record)
+            self._close_incident(record)
+        elif new_state == ServiceState.STOPPED and old_state == ServiceState.STARTING and record.restarting:
+            # Yeniden başlatma süreci hiç ayağa kalkamadı
+            record.restarting = False
+            self._on_crash(service, record)
+
+    def _on_up(self, service, record):
+        record.restarting = False
+        record.up_since = time.monotonic()
+        incident = record.current_incident
+        if incident is not None:
+            self._close_incident(record)
+            self.process_manager.log_append(
+                f"{service.display_name} toparlandı: kesinti {incident.downtime:.1f} sn, "
+                f"{incident.restarts} yeniden başlatma"
+            )
+
+    def _close_incident(self, record):
+        incident = record.current_incident
+        if incident is None:
+            return
+        incident.recovered_at = time.time()
+        record.downtime_total += incident.downtime
+        record.current_incident = None
+
+    def _on_crash(self, service, record):
+        name = service.name
+        now = time.monotonic()
+        record.restarting = False
+
+        # Yeterince uzun ayakta kaldıysa önceki hatalar unutulur. Hazırlık
+        # kontrolü zaman aşımına uğrayıp süreç çalışmaya devam ettiyse
+        # READY'ye hiç geçilmez; o zaman RUNNING'e geçiş zamanı esas alınır.
+        up_since = record.up_since if record.up_since is not None else record.running_since
+        if up_since is not None and now - up_since >= self.policy.stable_after:
+            record.failures = 0
+        record.up_since = None
+        record.running_since = None
+        record.failures += 1
+
+        if record.current_incident is None:
+            record.current_incident = Incident(time.time())
+            record.incidents.append(record.current_incident)
+
+        if not self.policy.enabled or record.gave_up:
+            return
+
+        while record.restart_times and now - record.restart_times[0] > self.policy.window:
+            record.restart_times.popleft()
+        if len(record.restart_times) >= self.policy.max_restarts:
+            record.gave_up = True
+            self.process_manager.log_append(
+                f"{service.display_name} çökme döngüsünde: {self.policy.window:.0f} sn içinde "
+                f"{len(record.restart_times)} yeniden başlatma, otomatik yeniden başlatma durduruldu"
+            )
+            self.crash_loop.emit(name, len(record.restart_times))
+            return
+
+        delay = self.policy.delay(record.failures)
+        self.process_manager.log_append(
+            f"{service.display_name} {delay:.1f} sn sonra yeniden başlatılacak "
+            f"(ardışık hata {record.failures})"
+        )
+        self._cancel_pending(record)
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._restart(name))
+        timer.start(int(delay * 1000))
+        record.pending = timer
+
+    def _cancel_pending(self, record):
+        if record.pending is not None:
+            record.pending.stop()
+            record.pending.deleteLater()
+            record.pending = None
+
+    def _restart(self, name):
+        record = self.record(name)
+        self._cancel_pending(record)
+        service = self.process_manager.services.get(name)
+        if service is None or service.state != ServiceState.CRASHED:
+            # Servis bu arada ölçek küçültme ile kaldırılmış olabilir
+            return
+
+        record.restarting = True
+        record.restart_times.append(time.monotonic())
+        record.restarts_total += 1
+        if record.current_incident is not None:
+            record.current_incident.restarts += 1
+        self.restarted.emit(name, record.restarts_total)
+        self.process_manager.start_service(name)
+
+    def stats(self, name):
+        """Servisin yeniden başlatma ve erişilebilirlik istatistikleri"""
+        record = self.record(name)
+        elapsed = max(time.time() - record.supervised_since, 1e-9)
+        downtime = record.downtime_total
+        if record.current_incident is not None:
+            downtime += record.current_incident.downtime
+        return {
+            "restarts": record.restarts_total,
+            "incidents": len(record.incidents),
+            "downtime": downtime,
+            "availability": max(0.0, 1.0 - downtime / elapsed),
+            "last_downtime": record.incidents[-1].downtime if record.incidents else None,
+            "crash_loop": record.gave_up,
+        }
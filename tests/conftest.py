@@ -0,0 +1,9 @@
+"""
+n8n Tray - Testler
+Modüller depo kökünde düz yerleşimli olduğu için kök dizin import yoluna eklenir.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+"""
+n8n Tray - Süreç Kontrolü Testleri
+stop_process, bench_child.py taklit alt süreci ile G/Ç motoru üzerinden denenir.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from io_engine import IOEngine
+from process_control import stop_process
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="süreç grubu sinyalleri POSIX'e özgü")
+
+BENCH_CHILD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_child.py")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = IOEngine()
+    yield engine
+    engine.stop()
+
+
+class Child:
+    """bench_child.py sürecini başlatıp satırlarını toplayan yardımcı"""
+
+    def __init__(self, engine, *args):
+        self.lines = []
+        self.ready = threading.Event()
+        self.process = engine.spawn(
+            "bench", [sys.executable, BENCH_CHILD, "--format", "plain", "--duration", "0", *args],
+            self._on_lines, lambda handle: None,
+        )
+        assert self.ready.wait(10), "alt süreç hazır olmadı"
+
+    def _on_lines(self, tag, lines):
+        self.lines.extend(lines)
+        if any(line.startswith("bench done") for line in lines):
+            self.ready.set()
+
+    def grandchild_pid(self):
+        for line in self.lines:
+            if line.startswith("bench grandchild pid="):
+                return int(line.split("=", 1)[1])
+        return None
+
+
+def is_alive(pid):
+    """Süreç var ve zombi değil mi?"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+def wait_gone(pid, timeout=2.0):
+    """Sonlandırılan torun sürecin kaybolmasını bekle (sinyal teslimi eşzamansızdır)"""
+    deadline = time.monotonic() + timeout
+    while is_alive(pid):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_child_ignoring_sigterm_is_killed_after_drain_timeout(engine):
+    child = Child(engine, "--ignore-term", "--grandchild")
+    grandchild = child.grandchild_pid()
+
+    result = stop_process(child.process, drain_timeout=0.5, kill_timeout=5)
+
+    # Nazik sinyal yok sayıldı: ağaç ancak boşaltma süresi dolduktan sonra sonlandırıldı
+    assert result.kill_time is not None and result.drain_time >= 0.5
+    assert result.exited
+    assert wait_gone(grandchild)
+
+
+def test_well_behaved_child_stops_gracefully_without_leftovers(engine):
+    child = Child(engine, "--grandchild")
+    grandchild = child.grandchild_pid()
+    assert grandchild is not None and is_alive(grandchild)
+
+    result = stop_process(child.process, drain_timeout=5, kill_timeout=5)
+
+    assert result.exited
+    assert result.kill_time is None
+    assert result.returncode == 0
+    assert wait_gone(grandchild)
@@ -0,0 +1,130 @@
+"""
+n8n Tray - Hazırlık Kontrolü Testleri
+ReadinessProbe yerel bir http.server /healthz taklidine karşı denenir.
+"""
+
+import asyncio
+import http.server
+import socket
+import threading
+import time
+
+import pytest
+
+from readiness import ReadinessProbe
+from service import Service, ServiceState, ServiceStateBus
+
+
+class HealthStub:
+    """/healthz için durum kodu ayarlanabilen yerel HTTP sunucusu"""
+
+    def __init__(self, status=503):
+        self.status = status
+        self.requests = 0
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                code = stub.status if self.path == "/healthz" else 404
+                self.send_response(code)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = HealthStub()
+    yield server
+    server.close()
+
+
+def free_port():
+    """Dinlenmeyen bir port (bağlantı reddedilir)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_probe(port, timeout=5.0):
+    return ReadinessProbe("127.0.0.1", port, "/healthz", initial_delay=0.02, max_delay=0.1,
+                          timeout=timeout, request_timeout=0.5)
+
+
+def running_service():
+    service = Service("n8n", "n8n", ServiceStateBus(), ready_state=ServiceState.READY)
+    assert service.begin_start()
+    assert service.attach(object())
+    return service
+
+
+def probe_service(service, probe):
+    """ProcessManager._probe_readiness ile aynı akış: RUNNING sürdükçe yokla, geçerse READY"""
+    async def run():
+        elapsed = await probe.wait_ready(lambda: service.state == ServiceState.RUNNING)
+        return None if elapsed is None else service.mark_ready()
+    return asyncio.run(run())
+
+
+def test_check_reports_down_tcp_and_ready(stub):
+    assert asyncio.run(make_probe(free_port()).check()) == "down"
+    stub.status = 503
+    assert asyncio.run(make_probe(stub.port).check()) == "tcp"
+    stub.status = 200
+    assert asyncio.run(make_probe(stub.port).check()) == "ready"
+
+
+def test_service_moves_to_ready_after_tcp_then_http(stub):
+    service = running_service()
+    probe = make_probe(stub.port)
+    # Port dinleniyor ama sağlık ucu henüz 503; kısa süre sonra 200 döner
+    threading.Timer(0.3, setattr, (stub, "status", 200)).start()
+
+    time_to_ready = probe_service(service, probe)
+
+    assert time_to_ready is not None
+    assert service.state == ServiceState.READY
+    assert service.time_to_ready == time_to_ready
+    assert probe.attempts > 1
+    assert stub.requests == probe.attempts
+
+
+def test_probe_gives_up_after_timeout():
+    service = running_service()
+    probe = make_probe(free_port(), timeout=0.5)
+
+    started = time.monotonic()
+    assert probe_service(service, probe) is None
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 2.0
+    assert service.state == ServiceState.RUNNING
+    assert service.time_to_ready is None
+
+
+def test_stop_while_probing_cancels_probe(stub):
+    service = running_service()
+    probe = make_probe(stub.port, timeout=30.0)
+    threading.Timer(0.2, service.transition, (ServiceState.STOPPING,)).start()
+
+    started = time.monotonic()
+    assert probe_service(service, probe) is None
+
+    assert time.monotonic() - started < 2.0
+    assert service.state == ServiceState.STOPPING
+    # Durdurma sırasında sağlık ucu hazır olsa da READY'ye geçilmez
+    stub.status = 200
+    assert service.mark_ready() is None
+    assert service.state == ServiceState.STOPPING
@@ -0,0 +1,151 @@
+"""
+n8n Tray - İzleme
+Bu modül süreç yöneticisi işlemlerini, G/Ç partilerini ve GUI teslimlerini aralık (span) olarak halka tamponda kaydeder ve Chrome trace-event JSON'u olarak dışa aktarır.
+
+Dışa aktarılan dosya chrome://tracing, Perfetto (ui.perfetto.dev) veya
+speedscope ile açılabilir.
+"""
+
+import collections
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+import config
+
+
+class _NullSpan:
+    """İzleme kapalıyken dönen, hiçbir şey yapmayan aralık"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.category, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Thread güvenli, sınırlı boyutlu aralık kaydedici
+
+    Olaylar deque'ye tek append ile eklenir (kilit yok); tampon dolunca en
+    eski olaylar düşer. Kapalıyken span() paylaşılan boş aralığı döndürür
+    ve traced() sarmalayıcısı yalnızca enabled bayrağını okur.
+    """
+
+    def __init__(self, capacity=None, enabled=None):
+        self.enabled = config.TRACE_ENABLED if enabled is None else enabled
+        self._events = collections.deque(maxlen=capacity or config.TRACE_BUFFER_EVENTS)
+        self._threads = {}  # thread kimliği -> ad
+        self._origin = time.perf_counter_ns()
+
+    def __len__(self):
+        return len(self._events)
+
+    def span(self, name, category="pm", **args):
+        """with bloğunu tek aralık olarak kaydet"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, category, args or None)
+
+    def complete(self, name, category, start_ns, duration_ns, args=None):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, category, start_ns, duration_ns, tid, args))
+
+    def instant(self, name, category="pm", **args):
+        """Süresiz olay (ör. durum geçişi)"""
+        if self.enabled:
+            self.complete(name, category, time.perf_counter_ns(), None, args or None)
+
+    def clear(self):
+        self._events.clear()
+
+    def trace_events(self):
+        """Tampondaki olaylar Chrome trace-event biçiminde (zamanlar mikrosaniye)"""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "n8n-tray"}}]
+        for tid, name in list(self._threads.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        for name, category, start, duration, tid, args in list(self._events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ts": (start - self._origin) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if duration is None:
+                event["ph"] = "i"
+                event["s"] = "t"
+            else:
+                event["ph"] = "X"
+                event["dur"] = duration / 1000
+            if args:
+                event["args"] = {key: value if isinstance(value, (int, float, bool)) else str(value)
+                                 for key, value in args.items()}
+            events.append(event)
+        return events
+
+    def export(self, path):
+        """Tamponu dosyaya yaz; yazılan olay sayısını döndür (çağıran thread'i bloklar)"""
+        events = self.trace_events()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+tracer = Tracer()
+
+
+def traced(category="pm", arg=None):
+    """Metodu aralık olarak kaydeden dekoratör; arg verilirse o parametrenin değeri de yazılır"""
+    def decorate(func):
+        label = func.__qualname__
+        position = list(inspect.signature(func).parameters).index(arg) if arg else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                details = None
+                if arg is not None:
+                    details = {arg: kwargs[arg] if arg in kwargs else args[position] if position < len(args) else None}
+                tracer.complete(label, category, start, time.perf_counter_ns() - start, details)
+        return wrapper
+    return decorate
+
+
+def default_trace_path():
+    return os.path.join(config.TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
@@ -5,6 +5,55 @@ Bu modül sistem tepsisi simgesini ve menüsünü yönetir.
 
 from PyQt5 import QtWidgets, QtGui
 
+import config
+from tracing import tracer
+
+
+def add_replica_menu(menu, process_manager):
+    """Ölçeklenebilir n8n rolleri için kopya ekleme/azaltma alt menüsü"""
+    replica_menu = menu.addMenu("n8n Kopyaları")
+    titles = {}
+    
+    for role in process_manager.n8n_roles.values():
+        if not role.scalable:
+            continue
+        titles[role.name] = replica_menu.addAction("")
+        titles[role.name].setEnabled(False)
+        replica_menu.addAction(
+            f"{role.display_name} Ekle",
+            lambda role=role: process_manager.scale_role(role.name, role.replicas + 1)
+        )
+        replica_menu.addAction(
+            f"{role.display_name} Azalt",
+            lambda role=role: process_manager.scale_role(role.name, role.replicas - 1)
+        )
+        replica_menu.addSeparator()
+    
+    def update_titles():
+        for name, action in titles.items():
+            role = process_manager.n8n_roles[name]
+            action.setText(f"{role.display_name}: {role.replicas} kopya")
+    
+    process_manager.state_bus.services_changed.connect(update_titles)
+    update_titles()
+
+
+def add_trace_menu(menu, process_manager):
+    """İşlem izlemeyi açıp kapatma ve tamponu Chrome trace JSON'u olarak dışa aktarma alt menüsü"""
+    trace_menu = menu.addMenu("İzleme")
+    
+    toggle_action = trace_menu.addAction("İzlemeyi Etkinleştir")
+    toggle_action.setCheckable(True)
+    toggle_action.setChecked(tracer.enabled)
+    
+    def on_toggled(enabled):
+        tracer.enabled = enabled
+        process_manager.log_append("İzleme açıldı" if enabled else f"İzleme kapatıldı ({len(tracer)} olay tamponda)")
+    
+    toggle_action.toggled.connect(on_toggled)
+    trace_menu.addAction("İz Kaydını Dışa Aktar", process_manager.export_trace)
+    trace_menu.addAction("İz Tamponunu Temizle", tracer.clear)
+
 
 def create_tray(app, icon, process_manager, show_window_callback):
     """Sistem tepsisi simgesi ve menüsünü oluştur"""
@@ -15,13 +64,19 @@ def create_tray(app, icon, process_manager, show_window_callback):
     menu = QtWidgets.QMenu()
     menu.addAction("Çağır", show_window_callback)
     menu.addSeparator()
+    menu.addAction("Tümünü Başlat", process_manager.start_all)
+    menu.addSeparator()
     menu.addAction("n8n Başlat", process_manager.start_n8n)
     menu.addAction("n8n Durdur", process_manager.stop_n8n)
+    if config.N8N_QUEUE_MODE:
+        add_replica_menu(menu, process_manager)
     menu.addSeparator()
     menu.addAction("Cloudflare Başlat", process_manager.start_cloudflare)
     menu.addAction("Cloudflare Durdur", process_manager.stop_cloudflare)
     menu.addSeparator()
-    emergency_action = menu.addAction("Tüm Node.js'leri Durdur", process_manager.emergency_kill_all)
+    emergency_action = menu.addAction("n8n'i Zorla Durdur", process_manager.emergency_kill_all)
+    menu.addSeparator()
+    add_trace_menu(menu, process_manager)
     menu.addSeparator()
     menu.addAction("Çıkış", app.quit)
     
@@ -30,5 +85,55 @@ def create_tray(app, icon, process_manager, show_window_callback):
         lambda reason: show_window_callback() if reason == QtWidgets.QSystemTrayIcon.DoubleClick else None
     )
     
+    # Araç ipucunda servis durumlarını göster
+    # Kopyalar rol başına özetlenir; tepsi ipucu kısa olmalı
+    def update_tooltip(*_):
+        services = process_manager.services
+        parts = [
+            f"{service.display_name}: {service.label()}"
+            for name, service in services.items()
+            if name not in process_manager.n8n_instances or not process_manager.n8n_instances[name].role.scalable
+        ]
+        for role in process_manager.n8n_roles.values():
+            instances = process_manager.role_instances(role.name) if role.scalable else []
+            if instances:
+                ready = sum(
+                    1 for i in instances
+                    if i.name in services and services[i.name].state == services[i.name].ready_state
+                )
+                parts.append(f"{role.display_name}: {ready}/{len(instances)} hazır")
+        tray.setToolTip(f"n8n Kontrol Paneli\n{', '.join(parts)}")
+    
+    process_manager.state_bus.state_changed.connect(update_tooltip)
+    process_manager.state_bus.services_changed.connect(update_tooltip)
+    update_tooltip()
+    
+    # Çökme döngüsü uyarısı
+    def on_crash_loop(name, restarts):
+        service = process_manager.services.get(name)
+        if service is None:
+            return
+        tray.showMessage(
+            f"{service.display_name} çökme döngüsünde",
+            f"{restarts} yeniden başlatma denendi; otomatik yeniden başlatma durduruldu.",
+            QtWidgets.QSystemTrayIcon.Critical
+        )
+    
+    process_manager.supervisor.crash_loop.connect(on_crash_loop)
+    
+    # Toplu başlatma sonucu
+    def on_stack_started(total, steps):
+        failed = [name for name, step in steps.items() if step.failed]
+        if failed:
+            tray.showMessage(
+                "Toplu başlatma tamamlanamadı",
+                f"Başarısız: {', '.join(failed)}",
+                QtWidgets.QSystemTrayIcon.Warning
+            )
+        else:
+            tray.showMessage("Servisler hazır", f"Tüm servisler {total:.1f} sn'de hazır", QtWidgets.QSystemTrayIcon.Information)
+    
+    process_manager.stack_starter.finished.connect(on_stack_started)
+    
     tray.show()
     return tray